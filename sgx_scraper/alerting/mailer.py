@@ -9,6 +9,7 @@ from sgx_scraper.config.settings import (
     AWS_REGION, SENDER_EMAIL, TO_EMAIL
 )
 from sgx_scraper.alerting.utils.send_alert_helper import attach_files
+from sgx_scraper.utils.run_mode import skip_offline
 
 import boto3
 import logging
@@ -21,10 +22,14 @@ def send_sgx_filings_alert(
     payload_alert: list[dict[str, any]],
     attachments_path: list[str] | None = None,
     to_emails: str | list[str] | None = None,
-):
+) -> bool:
+    """True once SES accepted the email."""
     if not payload_alert:
         LOGGER.info("No SGX filings alerts to send.")
-        return
+        return False
+
+    if skip_offline(f'alert email of {len(payload_alert)} filings'):
+        return False
 
     recipients = to_emails or TO_EMAIL
 
@@ -70,6 +75,8 @@ def send_sgx_filings_alert(
 
         LOGGER.info(f"Email sent! Message ID: {message_id}")
 
+        return True
+
     except ClientError as error:
         error_code = error.response["Error"].get("Code", "Unknown")
         error_message = error.response["Error"].get("Message", "No message provided")
@@ -81,3 +88,5 @@ def send_sgx_filings_alert(
     except Exception as error:
         LOGGER.error(f"[send_sgx_filings_alert] Unexpected error: {error}")
 
+    return False
+
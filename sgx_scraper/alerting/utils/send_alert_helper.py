@@ -3,8 +3,6 @@ from email.mime.application import MIMEApplication
 from sgx_scraper.utils.symbol_matching_helper import add_sgx_suffix
 
 import html 
-import yfinance as yf 
-import pandas as pd 
 import logging
 
 
@@ -30,6 +28,9 @@ def attach_files(file_path: str, msg):
 
 
 def get_price(symbol: str, date_str: str) -> float:
+    import yfinance as yf
+    import pandas as pd
+
     try:
         ticker_symbol = add_sgx_suffix(symbol)
         ticker = yf.Ticker(ticker_symbol)
@@ -1,11 +1,16 @@
 from dotenv import load_dotenv
-from supabase import create_client
 
 import os 
 
 load_dotenv(override=True)
 
 
+def env_list(name: str) -> list[str]:
+    # comma separated, blanks and repeats dropped
+    values = [value.strip() for value in os.getenv(name, '').split(',')]
+    return list(dict.fromkeys(value for value in values if value))
+
+
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 PROXY = os.getenv('PROXY')
@@ -16,5 +21,25 @@ SENDER_EMAIL = os.getenv('SENDER_EMAIL')
 TO_EMAIL = os.getenv('TO_EMAIL')
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
+# Key pools per provider, the single-key variables are kept as the first key
+GROQ_API_KEYS = list(dict.fromkeys(env_list('GROQ_API_KEY') + env_list('GROQ_API_KEYS')))
+OPENROUTER_API_KEYS = list(dict.fromkeys(env_list('OPENROUTER_API_KEY') + env_list('OPENROUTER_API_KEYS')))
+HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', '').lower() in ('1', 'true')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LLM_HEDGING = os.getenv('LLM_HEDGING', '').lower() in ('1', 'true')
+SHARE_TABLE_TARGETED = os.getenv('SHARE_TABLE_TARGETED', '').lower() in ('1', 'true')
+
+_SUPABASE_CLIENT = None
+
+
+def get_supabase_client():
+    # Built on first use so commands that never touch the db skip the
+    # supabase import and client setup
+    global _SUPABASE_CLIENT
+
+    if _SUPABASE_CLIENT is None:
+        from supabase import create_client
+
+        _SUPABASE_CLIENT = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-SUPABASE_CLIENT = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _SUPABASE_CLIENT
@@ -24,10 +24,11 @@ from sgx_scraper.utils.cli_helper import upsert_to_db
 from sgx_scraper.utils.symbol_matching_helper import add_sgx_suffix
 from sgx_scraper.utils.date_helper import to_iso_date
 from sgx_scraper.utils.json_helper import open_json, write_json
+from sgx_scraper.utils.history_store import HISTORY_STORE
+from sgx_scraper.utils.instrumentation import tracked_sleep
 
 import logging
 import random
-import time
 import typer
 
 
@@ -190,7 +191,7 @@ def run_agm_scraper(
                 LOGGER.info(f"[AGM] Reached limit of {limit} filings")
                 break
 
-            time.sleep(random.uniform(1, 3))
+            tracked_sleep(random.uniform(1, 3), stage='agm.throttle')
 
         if limit and processed >= limit:
             break
@@ -200,6 +201,7 @@ def run_agm_scraper(
     LOGGER.info(f"[AGM] Scraping completed. Total records: {len(payload)}")
 
     write_json(AGM_PATH_TODAY, payload)
+    HISTORY_STORE.append('agm', payload)
     write_json(AGM_PATH_SEEN, sorted(seen_refs))
 
     if not is_push_db:
@@ -53,3 +53,20 @@ SIAS_ANSWER_PATTERNS = (
 )
 
 MAX_DOCUMENT_CHARS = 30000
+
+# Terms of the poll / outcome tables, used to rank results pages when the
+# document runs past the prompt budget
+RANK_KEYWORDS = (
+    "poll results",
+    "resolution",
+    "ordinary resolution",
+    "special resolution",
+    "votes for",
+    "against",
+    "abstain",
+    "carried",
+    "approved",
+    "percentage",
+    "number of shares",
+    "scrutineer",
+)
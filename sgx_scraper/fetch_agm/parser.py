@@ -1,17 +1,19 @@
-from bs4 import BeautifulSoup
-
 from sgx_scraper.fetch_agm.constant import (
     DETAIL_SECTIONS,
     MAX_DOCUMENT_CHARS,
     MEETING_TAGS,
     OUTCOME_ATTACHMENT_PATTERNS,
+    RANK_KEYWORDS,
 )
 from sgx_scraper.fetch_agm.llm.prompts import AgmPrompt
+from sgx_scraper.fetch_sgx_filings.llm.accounting import llm_call_site
 from sgx_scraper.fetch_sgx_filings.llm.client import get_llm
 from sgx_scraper.utils.http_client import HTTPCLIENT
 from sgx_scraper.utils.json_helper import parse_json_reply
-from sgx_scraper.utils.pdf_helper import read_pdf, resolve_attachments
-from sgx_scraper.utils.sgx_announcement_html import extract_section_data
+from sgx_scraper.utils.page_ranker import SCAN_BUDGET_FACTOR, pack_relevant_pages
+from sgx_scraper.utils.pdf_helper import read_pdf_pages, resolve_attachments
+from sgx_scraper.utils.sgx_announcement_html import make_soup, parse_announcement_sections
+from sgx_scraper.utils.instrumentation import timed
 
 import logging
 import re
@@ -29,15 +31,16 @@ def flatten(value) -> str | None:
     return value.strip() if isinstance(value, str) else value
 
 
+@timed('agm.detail')
 def extract_detail_fields(detail_url: str) -> dict:
     response = HTTPCLIENT.get(detail_url)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    sections = parse_announcement_sections(make_soup(response.text))
     fields = {}
 
     for section in DETAIL_SECTIONS:
-        for key, value in (extract_section_data(soup, section) or {}).items():
+        for key, value in sections.get(section, {}).items():
             fields[key.strip()] = flatten(value)
 
     return fields
@@ -55,8 +58,12 @@ def resolve_results_document(detail_url: str) -> str | None:
     return None
 
 
+@llm_call_site('agm_summary')
 def summarise_results(results_url: str, model_name: str) -> tuple[str | None, list[str] | None]:
-    document_text = re.sub(r"\s+", " ", read_pdf(results_url, FLAG_LOG)).strip()
+    pages = read_pdf_pages(results_url, FLAG_LOG, max_chars=MAX_DOCUMENT_CHARS * SCAN_BUDGET_FACTOR)
+
+    # the poll table can sit behind pages of minutes, rank pages for it
+    document_text = pack_relevant_pages(pages, RANK_KEYWORDS, MAX_DOCUMENT_CHARS)
 
     if not document_text:
         LOGGER.warning(f"[{FLAG_LOG}] No readable text at {results_url}")
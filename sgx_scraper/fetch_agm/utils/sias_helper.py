@@ -8,11 +8,12 @@ from sgx_scraper.fetch_agm.constant import (
     SIAS_QUESTION_PATTERN,
 )
 from sgx_scraper.fetch_agm.llm.prompts import SiasAnswerPrompt
+from sgx_scraper.fetch_sgx_filings.llm.accounting import llm_call_site
 from sgx_scraper.fetch_sgx_filings.llm.client import get_llm
 from sgx_scraper.utils.date_helper import safe_convert_datetime
 from sgx_scraper.utils.http_client import HTTPCLIENT
 from sgx_scraper.utils.json_helper import parse_json_reply
-from sgx_scraper.utils.pdf_helper import read_pdf
+from sgx_scraper.utils.pdf_helper import read_pdf, read_pdfs
 
 import logging
 import re
@@ -202,6 +203,7 @@ def parse_answers(text: str, expect: int) -> dict[int, str] | None:
     return None
 
 
+@llm_call_site('sias_answers')
 def locate_answers_with_llm(text: str, expect: int, model_name: str) -> dict[int, str] | None:
     """The model reports where each answer starts, the cut is made here."""
     llm = get_llm(model_name, temperature=0)
@@ -271,24 +273,32 @@ def build_qa(entry: dict, model_name: str) -> list[dict]:
     if not questions_pdf:
         return []
 
-    questions = parse_questions(read_pdf(encode_url(questions_pdf), FLAG_LOG))
+    response_pdf = entry.get("response_pdf")
+
+    # both PDFs are fetched together, the response is simply unused when the
+    # questions do not parse
+    if response_pdf:
+        questions_text, response_text = read_pdfs(
+            [encode_url(questions_pdf), encode_url(response_pdf)], FLAG_LOG
+        )
+
+    else:
+        questions_text, response_text = read_pdf(encode_url(questions_pdf), FLAG_LOG), ""
+
+    questions = parse_questions(questions_text)
 
     if not questions:
         return []
 
     answers = {}
-    response_pdf = entry.get("response_pdf")
-
-    if response_pdf:
-        response_text = read_pdf(encode_url(response_pdf), FLAG_LOG)
 
-        if response_text:
-            answers = parse_answers(response_text, len(questions)) or {}
+    if response_text:
+        answers = parse_answers(response_text, len(questions)) or {}
 
-            if not answers:
-                answers = locate_answers_with_llm(
-                    response_text, len(questions), model_name
-                ) or {}
+        if not answers:
+            answers = locate_answers_with_llm(
+                response_text, len(questions), model_name
+            ) or {}
 
     return [
         {
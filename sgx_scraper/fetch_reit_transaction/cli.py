@@ -21,10 +21,11 @@ from sgx_scraper.fetch_reit_transaction.utils.plan_lookup import find_plan_prope
 from sgx_scraper.sgx_api.scraper_sgx_api import iter_sgx_announcements
 from sgx_scraper.utils.cli_helper import upsert_to_db
 from sgx_scraper.utils.json_helper import open_json, write_json
+from sgx_scraper.utils.history_store import HISTORY_STORE
+from sgx_scraper.utils.instrumentation import tracked_sleep
 
 import logging
 import random
-import time
 import typer
 
 
@@ -196,11 +197,12 @@ def run_reit_transaction_scraper(
             LOGGER.info(f"[REIT TRANSACTION] Reached limit of {limit} filings")
             break
 
-        time.sleep(random.uniform(1, 3))
+        tracked_sleep(random.uniform(1, 3), stage='reit.throttle')
 
     LOGGER.info(f"[REIT TRANSACTION] Scraping completed. Total records: {len(payload)}")
 
     write_json(REIT_TRANSACTION_PATH_TODAY, payload)
+    HISTORY_STORE.append('reit_transaction', payload)
     write_json(REIT_TRANSACTION_PATH_SEEN, sorted(seen_refs))
 
     if conflicts:
@@ -78,3 +78,21 @@ FINANCING_TITLE_PATTERN = (
 )
 
 PRICE_CONFLICT_TOLERANCE = 0.05
+
+# Terms the LLM needs to price a deal, used to rank attachment pages when the
+# documents run past the prompt budget
+RANK_KEYWORDS = (
+    "consideration",
+    "purchase consideration",
+    "sale consideration",
+    "agreed property value",
+    "valuation",
+    "independent valuer",
+    "market value",
+    "purchase price",
+    "sale price",
+    "completion",
+    "acquisition",
+    "divestment",
+    "interest",
+)
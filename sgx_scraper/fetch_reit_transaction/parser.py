@@ -1,10 +1,13 @@
+from sgx_scraper.fetch_sgx_filings.llm.accounting import llm_call_site
 from sgx_scraper.fetch_sgx_filings.llm.client import get_llm
 from sgx_scraper.fetch_reit_transaction.llm.prompts import ReitTransactionPrompt
 from sgx_scraper.utils.json_helper import parse_json_reply
-from sgx_scraper.utils.pdf_helper import read_pdf, resolve_attachments
+from sgx_scraper.fetch_reit_transaction.constant import RANK_KEYWORDS
+from sgx_scraper.utils.page_ranker import SCAN_BUDGET_FACTOR, pack_relevant_documents
+from sgx_scraper.utils.pdf_helper import read_pdfs_pages, resolve_attachments
+from sgx_scraper.utils.instrumentation import timed
 
 import logging
-import re
 
 
 LOGGER = logging.getLogger(__name__)
@@ -16,14 +19,19 @@ MAX_DOCUMENT_CHARS = 30000
 def get_announcement_text(detail_url: str) -> str:
     """A deal's price often sits in the press release while the dates sit in the
     announcement proper, so the attachments are read together."""
-    sections = []
+    links = [link for _, link in resolve_attachments(detail_url)[:MAX_ATTACHMENTS]]
+    documents = read_pdfs_pages(
+        links, "REIT TRANSACTION", max_chars=MAX_DOCUMENT_CHARS * SCAN_BUDGET_FACTOR
+    )
 
-    for _, link in resolve_attachments(detail_url)[:MAX_ATTACHMENTS]:
-        sections.append(read_pdf(link, "REIT TRANSACTION"))
-
-    return re.sub(r"\s+", " ", "\n".join(sections)).strip()
+    # the price table is often deep in a circular, rank pages rather than
+    # sending whatever the first budget's worth happens to be, the cover of
+    # every attachment is kept
+    return pack_relevant_documents(documents, RANK_KEYWORDS, MAX_DOCUMENT_CHARS)
 
 
+@timed('reit.extract_properties')
+@llm_call_site('reit_extraction')
 def extract_properties(detail_url: str, model_name: str) -> list[dict]:
     document_text = get_announcement_text(detail_url)
 
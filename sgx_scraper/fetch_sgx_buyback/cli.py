@@ -1,24 +1,39 @@
 from dataclasses import asdict
 
 from sgx_scraper.sgx_api.scraper_sgx_api import iter_sgx_announcements
-from sgx_scraper.utils.cli_helper import push_to_db, remove_duplicate, filter_top_n_companies
+from sgx_scraper.utils.cli_helper import (
+    push_to_db,
+    filter_top_n_companies,
+    is_outside_top_n,
+    build_listing_stub,
+)
+from sgx_scraper.utils.dedup_index import DedupIndex
+from sgx_scraper.utils.history_store import HISTORY_STORE
 from sgx_scraper.utils.json_helper import write_json, write_to_csv
 from sgx_scraper.utils.constant import (
     SGX_BUYBACKS_PATH_TODAY,
     SGX_BUYBACKS_PATH_YESTERDAY,
     SGX_BUYBACKS_PATH_NOT_TOP_200,
+    SGX_BUYBACKS_PATH_NOT_TOP_200_LISTING,
 )
 from sgx_scraper.fetch_sgx_buyback.parser import get_sgx_buybacks
 from sgx_scraper.fetch_sgx_buyback.utils.payload_helper import clean_payload_sgx_buyback
+from sgx_scraper.utils.instrumentation import tracked_sleep
 
 import typer
 import logging
-import time
 import random
 
 
 app = typer.Typer(help="SGX buyback scraper pipeline")
 
+# Dedup index namespace of announcement urls already fetched and parsed
+INGESTED_NAMESPACE = 'buybacks.announcements'
+# and of announcements already written as listing stubs by --early-tier-filter
+LISTING_STUB_NAMESPACE = 'buybacks.listing_stubs'
+
+TOP_TIER = 200
+
 
 @app.command(name='scraper_buybacks')
 def run_sgx_buyback_scraper(
@@ -27,10 +42,17 @@ def run_sgx_buyback_scraper(
     page_size: int = typer.Option(100, help="Number of records per listing page"),
     is_push_db: bool = typer.Option(True, help='Flag to push to db or not'),
     is_proxy: bool = typer.Option(None, help='Flag to use proxy or not'),
+    skip_ingested: bool = typer.Option(True, help="Skip announcements ingested by an earlier run before fetching"),
+    early_tier_filter: bool = typer.Option(False, help="Resolve top 200 membership from the listing, skip pages outside it"),
 ):
     logger = logging.getLogger(__name__)
 
     payload_sgx_buybacks = []
+    ingested = []
+    listing_stubs = []
+    skipped = 0
+
+    dedup_index = DedupIndex()
 
     announcements = iter_sgx_announcements(
         sub_category="ANNC13",
@@ -49,21 +71,45 @@ def run_sgx_buyback_scraper(
             logger.info(f'[SGX BUYBACK] Skipping {issuer_name}, no detail url.')
             continue
 
+        if skip_ingested and dedup_index.contains(INGESTED_NAMESPACE, detail_url):
+            skipped += 1
+            continue
+
+        if early_tier_filter and is_outside_top_n(sgx_announcement, TOP_TIER):
+            listing_stubs.append(build_listing_stub(sgx_announcement))
+            continue
+
         try:
             sgx_announcement_details = get_sgx_buybacks(detail_url)
 
             sgx_announcement_details = asdict(sgx_announcement_details)
             payload_sgx_buybacks.append(sgx_announcement_details)
+            ingested.append(detail_url)
 
         except Exception as error:
             logger.error(f'[SGX BUYBACK] Failed parsing {issuer_name} - {detail_url}: {error}', exc_info=True)
             continue
 
-        time.sleep(random.uniform(1, 3))
+        tracked_sleep(random.uniform(1, 3), stage='buybacks.throttle')
+
+    if skipped:
+        logger.info(f"[SGX_BUYBACK] Skipped {skipped} announcements already ingested")
+
+    # overlapping runs see the same announcements, each stub is written once
+    new_listing_stubs = dedup_index.take_new(LISTING_STUB_NAMESPACE, listing_stubs, key_field='url')
+
+    if new_listing_stubs:
+        logger.info(
+            f"[SGX_BUYBACK] {len(listing_stubs)} announcements outside top {TOP_TIER} not fetched, "
+            f"{len(new_listing_stubs)} new written to the listing CSV"
+        )
+        write_to_csv(SGX_BUYBACKS_PATH_NOT_TOP_200_LISTING, new_listing_stubs)
+        dedup_index.save()
 
     logger.info(f"[SGX_BUYBACK] Scraping completed. Total records: {len(payload_sgx_buybacks)}")
 
     payload_sgx_buybacks_clean = clean_payload_sgx_buyback(payload_sgx_buybacks)
+    HISTORY_STORE.append('sgx_buybacks', payload_sgx_buybacks_clean)
 
     payload_top_200, payload_not_top_200 = filter_top_n_companies(
         payload_sgx_buybacks_clean,
@@ -73,24 +119,26 @@ def run_sgx_buyback_scraper(
     write_to_csv(SGX_BUYBACKS_PATH_NOT_TOP_200, payload_not_top_200)
     write_json(SGX_BUYBACKS_PATH_TODAY, payload_top_200)
 
-    if SGX_BUYBACKS_PATH_YESTERDAY.exists():
-        logger.info('Processing remove duplicate data')
-        new_payload_sgx_buybacks = remove_duplicate(
-            SGX_BUYBACKS_PATH_TODAY, 
-            SGX_BUYBACKS_PATH_YESTERDAY
-        )
+    # buybacks already ingested by any earlier run, keyed on the announcement url
+    dedup_index.bootstrap('buybacks', SGX_BUYBACKS_PATH_YESTERDAY, key_field='url')
+    new_payload_sgx_buybacks = dedup_index.filter_new('buybacks', payload_top_200, key_field='url')
 
-    else:
-        logger.info('First run detected, all Top 200 filings are new')
-        new_payload_sgx_buybacks = payload_top_200
+    logger.info(f"[SGX_BUYBACK] {len(new_payload_sgx_buybacks)} new of {len(payload_top_200)} records")
 
-    write_json(SGX_BUYBACKS_PATH_YESTERDAY, payload_top_200)
+    if not is_push_db:
+        return
 
-    if is_push_db:
-        push_to_db(
-            new_payload_sgx_buybacks, 
-            'sgx_buybacks'
-        )
+    is_pushed = not new_payload_sgx_buybacks or push_to_db(
+        new_payload_sgx_buybacks, 
+        'sgx_buybacks'
+    )
+
+    # Records and announcements are marked only once they are in the DB, a
+    # failed or dry run fetches and pushes them again next time
+    if is_pushed:
+        dedup_index.add_many('buybacks', (record.get('url') for record in new_payload_sgx_buybacks))
+        dedup_index.add_many(INGESTED_NAMESPACE, ingested)
+        dedup_index.save()
 
 
 if __name__ == '__main__':
@@ -17,8 +17,9 @@ from sgx_scraper.utils.symbol_matching_helper import (
     matching_symbol,
 )
 from sgx_scraper.utils.date_helper import safe_convert_datetime
-from sgx_scraper.utils.sgx_announcement_html import extract_section_data
+from sgx_scraper.utils.sgx_announcement_html import make_soup, parse_announcement_sections
 from sgx_scraper.utils.http_client import HTTPCLIENT
+from sgx_scraper.utils.instrumentation import timed
 
 import requests
 import json
@@ -106,13 +107,15 @@ def parse_total_value(
 def extract_all_fields(soup: BeautifulSoup, url: str) -> dict[str, any] | None:
     try:
         # Extract sections
-        issuer_section = extract_section_data(soup, "Issuer & Securities")
-        additional_detail = extract_section_data(soup, "Additional Details")
+        sections = parse_announcement_sections(soup)
 
-        section_a = extract_section_data(soup, "Section A")
-        section_b = extract_section_data(soup, "Section B")
-        section_c = extract_section_data(soup, "Section C")
-        section_d = extract_section_data(soup, "Section D")
+        issuer_section = sections.get("Issuer & Securities", {})
+        additional_detail = sections.get("Additional Details", {})
+
+        section_a = sections.get("Section A", {})
+        section_b = sections.get("Section B", {})
+        section_c = sections.get("Section C", {})
+        section_d = sections.get("Section D", {})
 
         # Symbol extraction
         symbol = resolve_symbol(issuer_section)
@@ -165,13 +168,14 @@ def extract_all_fields(soup: BeautifulSoup, url: str) -> dict[str, any] | None:
         return None
 
 
+@timed('buybacks.detail')
 def get_sgx_buybacks(url: str) -> SGXBuyback: 
     try:
-        print(f"Extracting detail buyback for {url}")
+        LOGGER.info(f"Extracting detail buyback for {url}")
 
         response = HTTPCLIENT.get(url)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text)
 
         data_extracted = extract_all_fields(soup=soup, url=url)
         if not data_extracted:
@@ -179,7 +183,9 @@ def get_sgx_buybacks(url: str) -> SGXBuyback:
         
         sgx_buybacks = SGXBuyback(url=url, **data_extracted)
 
-        print(json.dumps(asdict(sgx_buybacks), indent=2))
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(json.dumps(asdict(sgx_buybacks), indent=2))
+
         return sgx_buybacks
     
     except requests.RequestException as error:
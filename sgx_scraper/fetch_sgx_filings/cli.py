@@ -1,25 +1,37 @@
 from sgx_scraper.sgx_api.scraper_sgx_api import iter_sgx_announcements
-from sgx_scraper.utils.cli_helper import push_to_db, remove_duplicate, filter_top_n_companies
+from sgx_scraper.utils.cli_helper import (
+    push_to_db,
+    split_by_rank,
+    is_outside_top_n,
+    build_listing_stub,
+)
+from sgx_scraper.utils.dedup_index import DedupIndex
+from sgx_scraper.utils.history_store import HISTORY_STORE
 from sgx_scraper.utils.json_helper import write_json, write_to_csv
+from sgx_scraper.utils.logging_config import init_worker_logging, worker_log_queue
 from sgx_scraper.utils.constant import (
     SGX_FILINGS_PATH_TODAY,
     SGX_FILINGS_PATH_YESTERDAY,
     SGX_FILINGS_PATH_NOT_TOP_200,
+    SGX_FILINGS_PATH_NOT_TOP_200_LISTING,
     SGX_FILINGS_PATH_TOP_100,
     SGX_FILINGS_PATH_INSERTABLE,
     SGX_FILINGS_PATH_NOT_INSERTABLE,
 )
-from sgx_scraper.fetch_sgx_filings.parser import get_sgx_filings
+from sgx_scraper.fetch_sgx_filings.parser import download_filing_pdf, enrich_filing
+from sgx_scraper.fetch_sgx_filings.parse_stage import parse_filing_pdf
 from sgx_scraper.fetch_sgx_filings.utils.payload_helper import filter_duplicate
 from sgx_scraper.fetch_sgx_filings.news.builder import generate_news
 from sgx_scraper.alerting.filter_data_alert import get_data_alert
 from sgx_scraper.alerting.mailer import send_sgx_filings_alert
 
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
 from itertools import islice
+from sgx_scraper.utils.instrumentation import tracked_sleep
 
 import typer
 import logging
-import time
 import random
 
 
@@ -28,6 +40,41 @@ LOGGER = logging.getLogger(__name__)
 
 app = typer.Typer(help="SGX filings scraper pipeline")
 
+# Dedup index namespace of announcement urls already downloaded and parsed
+INGESTED_NAMESPACE = 'filings.announcements'
+# and of announcements already written as listing stubs by --early-tier-filter
+LISTING_STUB_NAMESPACE = 'filings.listing_stubs'
+# Filings (PDF urls) already sent out as news / in an alert email, tracked
+# apart from the DB push so a dry or failed run does not send them twice
+NEWS_NAMESPACE = 'filings.news'
+ALERT_NAMESPACE = 'filings.alerts'
+
+TOP_TIER = 200
+
+
+def collect_parsed(
+    pending: deque,
+    payload: list[dict],
+    ingested: list[str],
+    wait: bool = False,
+) -> None:
+    # Enrich parsed filings in submission order, without blocking on the
+    # head of the queue unless the listing is exhausted
+    while pending and (wait or pending[0][2].done()):
+        issuer_name, detail_url, future = pending.popleft()
+
+        try:
+            parsed = future.result()
+
+            if parsed is not None:
+                payload.extend(enrich_filing(parsed))
+
+            # unsupported forms count too, they would be skipped again anyway
+            ingested.append(detail_url)
+
+        except Exception as error:
+            LOGGER.error(f'[SGX FILINGS] Failed parsing {issuer_name}: {error}', exc_info=True)
+
 
 def scrape_filings(
     period_start: str | None,
@@ -35,8 +82,22 @@ def scrape_filings(
     page_size: int,
     is_proxy: bool | None,
     limit: int | None = None,
-) -> list[dict]:
+    parse_workers: int = 0,
+    dedup_index: DedupIndex | None = None,
+    early_tier_filter: bool = False,
+) -> tuple[list[dict], list[str], list[dict]]:
+    """
+    Returns the enriched records, the announcement urls fully processed and
+    the listing stubs of announcements left unparsed. With a dedup index,
+    announcements it already holds are skipped before their PDF is
+    downloaded. With `early_tier_filter`, so are issuers outside the top
+    tier, which only get a stub from the listing record.
+    """
     payload = []
+    ingested = []
+    listing_stubs = []
+    skipped = 0
+    pending = deque()
 
     announcements = iter_sgx_announcements(
         sub_category="ANNC14",
@@ -50,30 +111,77 @@ def scrape_filings(
     if limit:
         announcements = islice(announcements, limit)
 
-    for index, sgx_announcement in enumerate(announcements, start=1):
-        detail_url = sgx_announcement.get('url')
-        issuer_name = sgx_announcement.get('issuer_name')
+    # PDF parsing is CPU-bound, with workers it runs in a process pool while
+    # the parent keeps downloading, LLM enrichment always stays in the parent
+    # workers log through a queue served in the parent, their forked copy of
+    # the parent's log queue is never drained
+    executor = ProcessPoolExecutor(
+        max_workers=parse_workers,
+        initializer=init_worker_logging,
+        initargs=(worker_log_queue(),),
+    ) if parse_workers > 0 else None
 
-        LOGGER.info(f'Processing {index} | url: {detail_url}')
+    try:
+        for index, sgx_announcement in enumerate(announcements, start=1):
+            detail_url = sgx_announcement.get('url')
+            issuer_name = sgx_announcement.get('issuer_name')
 
-        if not detail_url:
-            LOGGER.info(f'[SGX FILINGS] Skipping {issuer_name}, no detail url.')
-            continue
+            LOGGER.info(f'Processing {index} | url: {detail_url}')
 
-        try:
-            filings_details = get_sgx_filings(detail_url)
+            if not detail_url:
+                LOGGER.info(f'[SGX FILINGS] Skipping {issuer_name}, no detail url.')
+                continue
 
-            if filings_details:
-                payload.extend(filings_details)
+            if dedup_index is not None and dedup_index.contains(INGESTED_NAMESPACE, detail_url):
+                skipped += 1
+                continue
 
-        except Exception as error:
-            LOGGER.error(f'[SGX FILINGS] Failed parsing {issuer_name}: {error}', exc_info=True)
+            if early_tier_filter and is_outside_top_n(sgx_announcement, TOP_TIER):
+                listing_stubs.append(build_listing_stub(sgx_announcement))
+                continue
+
+            try:
+                downloaded = download_filing_pdf(detail_url)
+
+                if downloaded:
+                    if executor is not None:
+                        pending.append((issuer_name, detail_url, executor.submit(parse_filing_pdf, *downloaded)))
+                    else:
+                        future = Future()
+                        future.set_result(parse_filing_pdf(*downloaded))
+                        pending.append((issuer_name, detail_url, future))
+
+            except Exception as error:
+                LOGGER.error(f'[SGX FILINGS] Failed parsing {issuer_name}: {error}', exc_info=True)
+
+            collect_parsed(pending, payload, ingested)
+
+            tracked_sleep(random.uniform(1, 3), stage='filings.throttle')
+
+        collect_parsed(pending, payload, ingested, wait=True)
+
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
-        time.sleep(random.uniform(1, 3))
+    if skipped:
+        LOGGER.info(f"[SGX FILINGS] Skipped {skipped} announcements already ingested")
+
+    if listing_stubs:
+        LOGGER.info(f"[SGX FILINGS] {len(listing_stubs)} announcements outside top {TOP_TIER}, not downloaded")
 
     LOGGER.info(f"[SGX FILINGS] Scraping completed. Total records: {len(payload)}")
 
-    return payload
+    return payload, ingested, listing_stubs
+
+
+def write_listing_stubs(listing_stubs: list[dict], dedup_index: DedupIndex) -> None:
+    # overlapping runs see the same announcements, each stub is written once
+    new_stubs = dedup_index.take_new(LISTING_STUB_NAMESPACE, listing_stubs, key_field='url')
+
+    if new_stubs:
+        write_to_csv(SGX_FILINGS_PATH_NOT_TOP_200_LISTING, new_stubs)
+        dedup_index.save()
 
 
 def write_snapshots(
@@ -86,48 +194,86 @@ def write_snapshots(
     write_json(SGX_FILINGS_PATH_TOP_100, top_100)
 
 
-def resolve_new_records(top_200: list[dict]) -> list[dict]:
-    if SGX_FILINGS_PATH_YESTERDAY.exists():
-        LOGGER.info('Processing remove duplicate data')
-        new_records = remove_duplicate(SGX_FILINGS_PATH_TODAY, SGX_FILINGS_PATH_YESTERDAY)
-
-    else:
-        LOGGER.info('First run detected, all Top 200 filings are new')
-        new_records = top_200
+def resolve_new_records(top_200: list[dict], dedup_index: DedupIndex) -> list[dict]:
+    # filings already ingested by any earlier run, keyed on the PDF url, the
+    # new ones are only marked once they are pushed (see mark_ingested)
+    dedup_index.bootstrap('filings', SGX_FILINGS_PATH_YESTERDAY, key_field='source')
+    new_records = dedup_index.filter_new('filings', top_200, key_field='source')
 
-    write_json(SGX_FILINGS_PATH_YESTERDAY, top_200)
+    LOGGER.info(f"[SGX FILINGS] {len(new_records)} new of {len(top_200)} records")
 
     return new_records
 
 
+def mark_ingested(dedup_index: DedupIndex, new_records: list[dict], ingested: list[str]) -> None:
+    # records and their announcements together, a dry or failed run leaves
+    # both unmarked so the next run fetches and pushes them again
+    dedup_index.add_many('filings', (record.get('source') for record in new_records))
+    dedup_index.add_many(INGESTED_NAMESPACE, ingested)
+    dedup_index.save()
+
+
+def send_news(insertable: list[dict], dedup_index: DedupIndex) -> None:
+    unsent = dedup_index.filter_new(NEWS_NAMESPACE, insertable, key_field='source')
+
+    if not unsent:
+        return
+
+    if push_to_db(generate_news(unsent), 'sgx_news'):
+        dedup_index.add_many(NEWS_NAMESPACE, (record.get('source') for record in unsent))
+        dedup_index.save()
+
+
+def send_alert(not_insertable: list[dict], dedup_index: DedupIndex) -> None:
+    unsent = dedup_index.filter_new(ALERT_NAMESPACE, not_insertable, key_field='source')
+
+    if not unsent:
+        return
+
+    if send_sgx_filings_alert(unsent, [str(SGX_FILINGS_PATH_NOT_INSERTABLE)]):
+        dedup_index.add_many(ALERT_NAMESPACE, (record.get('source') for record in unsent))
+        dedup_index.save()
+
+
 def dispatch(
     insertable: list[dict],
     not_insertable: list[dict],
+    dedup_index: DedupIndex,
     is_send_news: bool,
     is_send_email: bool,
     is_push_db: bool,
-) -> None:
+) -> bool:
+    """
+    Sends the new filings out, True once they are in the DB. News and alerts
+    are tracked on their own, each filing is sent once whatever becomes of
+    the push.
+    """
     if is_send_news:
-        news_payload = generate_news(insertable)
-        push_to_db(news_payload, 'sgx_news')
+        send_news(insertable, dedup_index)
 
     write_json(SGX_FILINGS_PATH_NOT_INSERTABLE, not_insertable)
     write_json(SGX_FILINGS_PATH_INSERTABLE, insertable)
 
     if is_send_email:
-        send_sgx_filings_alert(not_insertable, [str(SGX_FILINGS_PATH_NOT_INSERTABLE)])
+        send_alert(not_insertable, dedup_index)
+
+    if not is_push_db:
+        return False
 
-    if is_push_db:
-        exclude_columns = {
-            "circumstances_desc", 
-            "company_name"
-        }
-        
-        push_to_db(
-            insertable, 
-            'sgx_filings',
-            exclude_columns=exclude_columns
-        )
+    # nothing insertable means nothing left to push
+    if not insertable:
+        return True
+
+    exclude_columns = {
+        "circumstances_desc", 
+        "company_name"
+    }
+
+    return bool(push_to_db(
+        insertable, 
+        'sgx_filings',
+        exclude_columns=exclude_columns
+    ))
 
 
 @app.command(name='scraper_filings')
@@ -140,33 +286,47 @@ def run_sgx_filings_scraper(
     is_proxy: bool = typer.Option(None, help='Flag to use proxy or not'),
     is_send_email: bool = typer.Option(True, help="Sending flagged records to email"),
     is_send_news: bool = typer.Option(True, help='Flag to send to idx_news or not'),
+    parse_workers: int = typer.Option(0, help="Processes for PDF parsing, 0 parses inline"),
+    skip_ingested: bool = typer.Option(True, help="Skip announcements ingested by an earlier run before downloading"),
+    early_tier_filter: bool = typer.Option(False, help="Resolve top 200 membership from the listing, skip PDFs outside it"),
 ):
-    payload = scrape_filings(
+    dedup_index = DedupIndex()
+
+    payload, ingested, listing_stubs = scrape_filings(
         period_start, 
         period_end, 
         page_size, 
         is_proxy, 
-        limit
+        limit,
+        parse_workers,
+        dedup_index if skip_ingested else None,
+        early_tier_filter,
     )
 
+    write_listing_stubs(listing_stubs, dedup_index)
+
     payload_clean = filter_duplicate(payload)
+    HISTORY_STORE.append('sgx_filings', payload_clean)
 
-    top_200, not_top_200 = filter_top_n_companies(payload_clean, top_n=200)
-    top_100, _ = filter_top_n_companies(payload_clean, top_n=100)
+    top_100, top_200, not_top_200 = split_by_rank(payload_clean, tiers=(100, 200))
 
     write_snapshots(top_200, not_top_200, top_100)
 
-    new_records = resolve_new_records(top_200)
+    new_records = resolve_new_records(top_200, dedup_index)
     insertable, not_insertable = get_data_alert(new_records)
 
-    dispatch(
+    is_pushed = dispatch(
         insertable, 
         not_insertable, 
+        dedup_index,
         is_send_news, 
         is_send_email, 
         is_push_db
     )
 
+    if is_pushed:
+        mark_ingested(dedup_index, new_records, ingested)
+
 
 if __name__ == '__main__':
     logging.basicConfig(
@@ -0,0 +1,227 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from threading import Lock
+
+from sgx_scraper.utils.constant import LLM_PRICES_PER_MILLION, LLM_USAGE_DIR
+from sgx_scraper.utils.instrumentation import percentile
+
+import json
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Where in the pipelines the call comes from ('fallback', 'transfer', 'news',
+# 'agm_summary', 'sias_answers', 'reit_extraction')
+_CALL_SITE: ContextVar[str | None] = ContextVar('llm_call_site', default=None)
+
+
+@dataclass
+class LlmCall:
+    pipeline: str
+    call_site: str
+    model: str
+    # key of the last attempt, None when no key was free
+    key_index: int | None
+    status: str
+    latency_s: float
+    attempts: int
+    rotations: int
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+    cost_usd: float | None = None
+
+
+def token_usage(result) -> dict[str, int]:
+    usage = (result.llm_output or {}).get('token_usage') or {}
+
+    if usage:
+        details = usage.get('completion_tokens_details') or {}
+
+        return {
+            'prompt_tokens': usage.get('prompt_tokens') or 0,
+            'completion_tokens': usage.get('completion_tokens') or 0,
+            'reasoning_tokens': details.get('reasoning_tokens') or 0,
+        }
+
+    if not result.generations:
+        return {}
+
+    # clients that only fill the message usage metadata
+    metadata = getattr(result.generations[0].message, 'usage_metadata', None) or {}
+
+    return {
+        'prompt_tokens': metadata.get('input_tokens') or 0,
+        'completion_tokens': metadata.get('output_tokens') or 0,
+        'reasoning_tokens': (metadata.get('output_token_details') or {}).get('reasoning') or 0,
+    }
+
+
+def call_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float | None:
+    prices = LLM_PRICES_PER_MILLION.get(model)
+
+    if prices is None:
+        return None
+
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+class LlmLedger:
+    """
+    Every KeyRotatingChatModel call of the run, tagged with the pipeline
+    (the cli command) and the call site. Calls finish on the LLM loop while
+    the report is read from the main thread, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.calls: list[LlmCall] = []
+        self.pipeline = 'unscoped'
+        self.started_at = datetime.now()
+
+    def start(self, pipeline: str | None) -> None:
+        with self._lock:
+            self.calls = []
+            self.pipeline = pipeline or 'unscoped'
+            self.started_at = datetime.now()
+
+    def record(
+        self,
+        model: str,
+        attempts: list[int],
+        latency: float,
+        status: str,
+        result=None,
+    ) -> None:
+        usage = token_usage(result) if result is not None else {}
+
+        call = LlmCall(
+            pipeline=self.pipeline,
+            call_site=_CALL_SITE.get() or 'unscoped',
+            model=model,
+            key_index=attempts[-1] if attempts else None,
+            status=status,
+            latency_s=round(latency, 4),
+            attempts=len(attempts),
+            rotations=len(set(attempts)) - 1 if attempts else 0,
+            **usage,
+        )
+        call.cost_usd = call_cost(model, call.prompt_tokens, call.completion_tokens)
+
+        with self._lock:
+            self.calls.append(call)
+
+    def records(self) -> list[LlmCall]:
+        with self._lock:
+            return list(self.calls)
+
+    def summary(self) -> list[dict[str, any]]:
+        calls = self.records()
+
+        groups: dict[tuple[str, str], list[LlmCall]] = {}
+
+        for call in calls:
+            groups.setdefault((call.call_site, call.model), []).append(call)
+
+        rows = []
+
+        for (call_site, model), group in sorted(groups.items()):
+            latencies = sorted(call.latency_s for call in group)
+            costs = [call.cost_usd for call in group if call.cost_usd is not None]
+
+            rows.append({
+                'call_site': call_site,
+                'model': model,
+                'calls': len(group),
+                'errors': sum(call.status == 'error' for call in group),
+                'cancelled': sum(call.status == 'cancelled' for call in group),
+                'attempts': sum(call.attempts for call in group),
+                'rotations': sum(call.rotations for call in group),
+                'prompt_tokens': sum(call.prompt_tokens for call in group),
+                'completion_tokens': sum(call.completion_tokens for call in group),
+                'reasoning_tokens': sum(call.reasoning_tokens for call in group),
+                'total_s': round(sum(latencies), 2),
+                'p50_s': round(percentile(latencies, 50), 3),
+                'p95_s': round(percentile(latencies, 95), 3),
+                'cost_usd': round(sum(costs), 6) if costs else None,
+            })
+
+        return rows
+
+
+LLM_LEDGER = LlmLedger()
+
+
+@contextmanager
+def llm_call_site(name: str):
+    # usable as a decorator too, like instrumentation.timed
+    token = _CALL_SITE.set(name)
+
+    try:
+        yield
+
+    finally:
+        _CALL_SITE.reset(token)
+
+
+def log_llm_report(command_name: str | None) -> None:
+    rows = LLM_LEDGER.summary()
+
+    if not rows:
+        return
+
+    LOGGER.info("[llm usage] %s calls per call site and model", command_name or 'run')
+    LOGGER.info(
+        "[llm usage] %-16s %-24s %6s %6s %6s %10s %10s %9s %9s %10s",
+        'call_site', 'model', 'calls', 'errors', 'rotate', 'prompt', 'completion', 'total_s', 'p95_s', 'cost_usd',
+    )
+
+    for row in rows:
+        LOGGER.info(
+            "[llm usage] %-16s %-24s %6d %6d %6d %10d %10d %9.2f %9.3f %10s",
+            row['call_site'],
+            row['model'],
+            row['calls'],
+            row['errors'],
+            row['rotations'],
+            row['prompt_tokens'],
+            row['completion_tokens'],
+            row['total_s'],
+            row['p95_s'],
+            '-' if row['cost_usd'] is None else f"{row['cost_usd']:.4f}",
+        )
+
+
+def write_llm_report(command_name: str | None) -> str | None:
+    rows = LLM_LEDGER.summary()
+
+    if not rows:
+        return None
+
+    LLM_USAGE_DIR.mkdir(parents=True, exist_ok=True)
+
+    finished_at = datetime.now()
+    path = LLM_USAGE_DIR / f"{command_name or 'run'}_{finished_at:%Y%m%d_%H%M%S}.json"
+
+    report = {
+        'command': command_name,
+        'started_at': LLM_LEDGER.started_at.isoformat(timespec='seconds'),
+        'finished_at': finished_at.isoformat(timespec='seconds'),
+        'summary': rows,
+        'calls': [asdict(call) for call in LLM_LEDGER.records()],
+    }
+
+    with path.open('w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+
+    LOGGER.info(f"[llm usage] Saved LLM usage to {path}")
+
+    return str(path)
+
+
+def emit_llm_report(command_name: str | None) -> None:
+    log_llm_report(command_name)
+    write_llm_report(command_name)
@@ -2,9 +2,8 @@ from langchain.chat_models import init_chat_model
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage
 from langchain_core.outputs import ChatResult
-from langchain_core.callbacks import BaseCallbackHandler
 
-from sgx_scraper.config.settings import GROQ_API_KEY, OPENROUTER_API_KEY
+from sgx_scraper.config.settings import GROQ_API_KEYS, OPENROUTER_API_KEYS
 from sgx_scraper.utils.constant import (
     MODEL_CONFIG, 
     ABORT_KEYWORDS, 
@@ -12,38 +11,25 @@ from sgx_scraper.utils.constant import (
     LLM_TIMEOUT_SECONDS,
     OPENROUTER_BASE_URL,
     ROTATE_400_KEYWORDS, 
-    ROTATE_BACKOFF_SECONDS,
     ROTATE_KEYWORDS, 
     ROTATE_MAX_SWEEPS,
     ROTATE_STATUS_CODES
 )
+from sgx_scraper.fetch_sgx_filings.llm.accounting import LLM_LEDGER
+from sgx_scraper.fetch_sgx_filings.llm.runtime import KEY_SCHEDULER, LLM_LATENCY, LLM_RUNNER
+from sgx_scraper.utils.instrumentation import span, atracked_sleep
+from sgx_scraper.utils.run_mode import skip_offline
 
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from time import perf_counter
 
 import asyncio
+import httpx
 import logging
-import time
 
 
 LOGGER = logging.getLogger(__name__)
 
 
-class TokenUsageLogger(BaseCallbackHandler):
-    def on_llm_end(self, response, **kwargs):
-        token_usage = response.llm_output.get("token_usage", {}) if response.llm_output else {}
-        completion_details = token_usage.get("completion_tokens_details") or {}
-
-        LOGGER.info(
-            "token usage: prompt=%d completion=%d reasoning=%d total=%d finish_reason=%s",
-            token_usage.get("prompt_tokens", 0),
-            token_usage.get("completion_tokens", 0),
-            completion_details.get("reasoning_tokens", 0),
-            token_usage.get("total_tokens", 0),
-            response.generations[0][0].generation_info.get("finish_reason", "unknown")
-            if response.generations else "unknown",
-        )
-
-
 def extract_status_code(error: Exception) -> int | None:
     status_code = getattr(error, "status_code", None)
     if status_code is not None:
@@ -56,6 +42,19 @@ def extract_status_code(error: Exception) -> int | None:
     return None
 
 
+def is_rate_limited(error: Exception) -> bool:
+    error_message = str(error).lower()
+
+    return extract_status_code(error) == 429 or any(
+        keyword in error_message for keyword in ("rate limit", "too many requests")
+    )
+
+
+def error_headers(error: Exception):
+    # the openai / groq SDK errors carry the http response
+    return getattr(getattr(error, "response", None), "headers", None)
+
+
 def classify_error(error: Exception) -> str:
     """
     Returns one of three actions:
@@ -87,9 +86,15 @@ def classify_error(error: Exception) -> str:
 class KeyRotatingChatModel(BaseChatModel):
     """
     Wraps a pool of LLM clients initialised with different API keys for the
-    same model. On a key-level failure (429, 401, 403) it transparently
-    rotates to the next available key. On request-level or server-level
-    failures it raises immediately without wasting the remaining keys.
+    same model. Each call takes the least loaded key that is not cooling
+    down (KEY_SCHEDULER, fed by rate-limit headers and 429s), so concurrent
+    calls run on all keys at once. On a key-level failure (429, 401, 403) it
+    transparently moves to another key, and only waits when every key is
+    cooling down. On request-level or server-level failures it raises
+    immediately without wasting the remaining keys.
+
+    Sync and async calls both run on the shared LLM_RUNNER loop, so a call
+    past LLM_TIMEOUT_SECONDS is cancelled rather than left on a thread.
     """
     llm_pool: list[BaseChatModel]
     model_name_identifier: str
@@ -117,16 +122,22 @@ class KeyRotatingChatModel(BaseChatModel):
         )
         return "raise"
 
-    def call_with_deadline(self, llm_client, messages, stop, **kwargs):
-        """The openrouter SDK exposes no timeout, so it is enforced here."""
-        executor = ThreadPoolExecutor(max_workers=1)
+    async def call_with_deadline(self, index: int, messages, stop, **kwargs):
+        """
+        The openrouter SDK exposes no timeout, so it is enforced here. The
+        call holds one of the LLM_RUNNER in-flight slots while it runs.
+        """
+        async with LLM_RUNNER.in_flight:
+            start = perf_counter()
 
-        try:
-            future = executor.submit(llm_client._generate, messages, stop=stop, **kwargs)
-            return future.result(timeout=LLM_TIMEOUT_SECONDS)
+            result = await asyncio.wait_for(
+                self.llm_pool[index]._agenerate(messages, stop=stop, **kwargs),
+                timeout=LLM_TIMEOUT_SECONDS,
+            )
+
+            LLM_LATENCY.observe(self.model_name_identifier, perf_counter() - start)
 
-        finally:
-            executor.shutdown(wait=False)
+            return result
 
     def _generate(
         self,
@@ -134,67 +145,113 @@ class KeyRotatingChatModel(BaseChatModel):
         stop: list[str] | None = None,
         **kwargs: any,
     ) -> ChatResult:
-        last_error: Exception | None = None
+        with span(f'llm.{self.model_name_identifier}'):
+            return LLM_RUNNER.run(self._agenerate_with_rotation(messages, stop, **kwargs))
 
-        for sweep in range(ROTATE_MAX_SWEEPS):
-            if sweep:
-                backoff = ROTATE_BACKOFF_SECONDS * sweep
-                LOGGER.warning(
-                    f"All keys rate-limited for '{self.model_name_identifier}', "
-                    f"retrying the pool in {backoff}s"
-                )
-                time.sleep(backoff)
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        **kwargs: any,
+    ) -> ChatResult:
+        with span(f'llm.{self.model_name_identifier}'):
+            return await LLM_RUNNER.arun(self._agenerate_with_rotation(messages, stop, **kwargs))
 
-            for index, llm_client in enumerate(self.llm_pool):
-                try:
-                    return self.call_with_deadline(llm_client, messages, stop, **kwargs)
+    async def _agenerate_with_rotation(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        **kwargs: any,
+    ) -> ChatResult:
+        # key index of every attempt, for the LLM_LEDGER record of the call
+        attempts: list[int] = []
+        start = perf_counter()
 
-                except FutureTimeout:
-                    LOGGER.warning(
-                        f"Key index {index} exceeded {LLM_TIMEOUT_SECONDS}s for "
-                        f"'{self.model_name_identifier}', abandoning the call"
-                    )
-                    last_error = RuntimeError(
-                        f"no reply within {LLM_TIMEOUT_SECONDS}s"
-                    )
+        try:
+            result = await self._rotate(messages, stop, attempts, **kwargs)
 
-                except Exception as error:
-                    if self.handle_error(error, index) == "raise":
-                        raise
+        except asyncio.CancelledError:
+            LLM_LEDGER.record(self.model_name_identifier, attempts, perf_counter() - start, 'cancelled')
+            raise
 
-                    last_error = error
+        except Exception:
+            LLM_LEDGER.record(self.model_name_identifier, attempts, perf_counter() - start, 'error')
+            raise
 
-        raise RuntimeError(
-            f"All {len(self.llm_pool)} API keys exhausted for model "
-            f"'{self.model_name_identifier}'. Last error: {last_error}"
-        )
+        LLM_LEDGER.record(self.model_name_identifier, attempts, perf_counter() - start, 'ok', result)
 
-    async def _agenerate(
+        return result
+
+    async def _rotate(
         self,
         messages: list[BaseMessage],
-        stop: list[str] | None = None,
+        stop: list[str] | None,
+        attempts: list[int],
         **kwargs: any,
     ) -> ChatResult:
+        model_name = self.model_name_identifier
+        pool_size = len(self.llm_pool)
+
         last_error: Exception | None = None
+        # keys rejected for this request (auth, too large), not worth retrying
+        excluded: set[int] = set()
+
+        for _ in range(pool_size * ROTATE_MAX_SWEEPS):
+            index = KEY_SCHEDULER.acquire(model_name, pool_size, excluded)
+
+            while index is None:
+                wait = KEY_SCHEDULER.ready_in(model_name, pool_size, excluded)
+
+                if wait is None:
+                    break
+
+                LOGGER.warning(
+                    f"All keys rate-limited for '{model_name}', "
+                    f"next key is free in {wait:.1f}s"
+                )
+                # runs on the runner loop, the caller's span is not visible here
+                await atracked_sleep(wait, stage=f'llm.{model_name}')
+
+                index = KEY_SCHEDULER.acquire(model_name, pool_size, excluded)
 
-        for sweep in range(ROTATE_MAX_SWEEPS):
-            if sweep:
-                backoff = ROTATE_BACKOFF_SECONDS * sweep
+            if index is None:
+                break
+
+            attempts.append(index)
+
+            try:
+                result = await self.call_with_deadline(index, messages, stop, **kwargs)
+
+            except asyncio.TimeoutError:
                 LOGGER.warning(
-                    f"All keys rate-limited for '{self.model_name_identifier}' "
-                    f"(async), retrying the pool in {backoff}s"
+                    f"Key index {index} exceeded {LLM_TIMEOUT_SECONDS}s for "
+                    f"'{model_name}', cancelled the call"
+                )
+                last_error = RuntimeError(
+                    f"no reply within {LLM_TIMEOUT_SECONDS}s"
                 )
-                await asyncio.sleep(backoff)
 
-            for index, llm_client in enumerate(self.llm_pool):
-                try:
-                    return await llm_client._agenerate(messages, stop=stop, **kwargs)
+            except Exception as error:
+                if self.handle_error(error, index) == "raise":
+                    raise
+
+                if is_rate_limited(error):
+                    cooldown = KEY_SCHEDULER.observe_rate_limit(
+                        model_name, index, error_headers(error)
+                    )
+                    LOGGER.info(f"Key index {index} for '{model_name}' cooling down {cooldown:.1f}s")
+
+                else:
+                    excluded.add(index)
+
+                last_error = error
 
-                except Exception as error:
-                    if self.handle_error(error, index) == "raise":
-                        raise
+            else:
+                KEY_SCHEDULER.observe_success(model_name, index)
+                return result
 
-                    last_error = error
+            finally:
+                KEY_SCHEDULER.release(model_name, index)
 
         raise RuntimeError(
             f"All {len(self.llm_pool)} API keys exhausted for model "
@@ -202,11 +259,25 @@ class KeyRotatingChatModel(BaseChatModel):
         )
     
 
+def build_http_client(model_name: str, index: int):
+    """
+    Async http client of one pooled key, every response's rate-limit headers
+    (groq and openrouter alike) are handed to KEY_SCHEDULER.
+    """
+    async def observe(response) -> None:
+        KEY_SCHEDULER.observe_headers(model_name, index, response.headers)
+
+    return httpx.AsyncClient(event_hooks={'response': [observe]})
+
+
 def get_llm(
     model_name: str,
     temperature: float = 0.5,
-    max_retries: int = 3,
 ):
+    # callers already treat a missing model as 'no result'
+    if skip_offline(f"LLM calls to '{model_name}'"):
+        return None
+
     config_model = MODEL_CONFIG.get(model_name)
 
     if config_model is None:
@@ -217,8 +288,8 @@ def get_llm(
     provider = config_model.get('provider')
 
     provider_keys = {
-        'groq': [GROQ_API_KEY],
-        'openrouter': [OPENROUTER_API_KEY]
+        'groq': GROQ_API_KEYS,
+        'openrouter': OPENROUTER_API_KEYS,
     }
 
     api_keys = [
@@ -242,10 +313,13 @@ def get_llm(
                 config_model.get('model'),
                 model_provider='openai' if is_openrouter else provider,
                 temperature=temperature,
-                max_retries=max_retries,
+                # no SDK retries, a 429 goes straight back to KeyRotatingChatModel
+                # which moves to another key instead of sleeping on this one
+                max_retries=0,
                 api_key=api_key,
                 max_tokens=10000,
                 timeout=LLM_TIMEOUT_SECONDS,
+                http_async_client=build_http_client(model_name, len(llm_pool)),
                 **({'base_url': OPENROUTER_BASE_URL} if is_openrouter else {}),
             ) 
 
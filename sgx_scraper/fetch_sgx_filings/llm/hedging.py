@@ -0,0 +1,105 @@
+from typing import Callable
+
+from sgx_scraper.config.settings import LLM_HEDGING
+from sgx_scraper.fetch_sgx_filings.llm.client import get_llm
+from sgx_scraper.fetch_sgx_filings.llm.runtime import LLM_LATENCY, LLM_RUNNER
+
+import asyncio
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+async def ainvoke_with_fallback(
+    prompt,
+    parser,
+    models: list[str],
+    input_data: dict,
+    accept: Callable[[any], any] | None = None,
+    flag_log: str = 'llm',
+    temperature: float = 0.2,
+    hedge: bool = LLM_HEDGING,
+) -> tuple[str | None, any]:
+    """
+    Runs `prompt | llm | parser` on `models` in order of preference and
+    returns `(model, result)` for the first result `accept` keeps (it returns
+    None to reject), or `(None, None)` when every model fails.
+
+    The next model is fired when the running one fails, or with `hedge` when
+    it has not answered within its p95 latency, in which case both race and
+    the first usable result wins. Calls still running when a result is taken
+    are cancelled.
+    """
+    accept = accept or (lambda result: result)
+    queue = list(models)
+    pending: dict[asyncio.Future, str] = {}
+
+    def launch() -> str | None:
+        while queue:
+            model = queue.pop(0)
+            llm = get_llm(model, temperature=temperature)
+
+            if llm is None:
+                continue
+
+            LOGGER.info('[%s] calling %s', flag_log, model)
+
+            pending[asyncio.ensure_future((prompt | llm | parser).ainvoke(input_data))] = model
+            return model
+
+        return None
+
+    latest = launch()
+
+    try:
+        while pending:
+            # hedge only while there is a model left in reserve
+            delay = LLM_LATENCY.hedge_delay(latest) if hedge and queue else None
+
+            done, _ = await asyncio.wait(
+                pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if not done:
+                LOGGER.info(
+                    '[%s] %s has not answered in %.1fs, hedging with the next model',
+                    flag_log,
+                    latest,
+                    delay,
+                )
+                latest = launch() or latest
+                continue
+
+            for task in done:
+                model = pending.pop(task)
+
+                try:
+                    result = accept(task.result())
+
+                except Exception as error:
+                    LOGGER.warning('[%s] model %s failed: %s', flag_log, model, error)
+                    continue
+
+                if result is None:
+                    LOGGER.warning('[%s] model %s returned an unusable result', flag_log, model)
+                    continue
+
+                return model, result
+
+            if not pending:
+                latest = launch()
+
+        return None, None
+
+    finally:
+        for task in pending:
+            task.cancel()
+
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def invoke_with_fallback(*args, **kwargs) -> tuple[str | None, any]:
+    """Blocking `ainvoke_with_fallback`, run on the shared LLM loop."""
+    return LLM_RUNNER.run(ainvoke_with_fallback(*args, **kwargs))
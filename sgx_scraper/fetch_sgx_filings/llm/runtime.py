@@ -0,0 +1,295 @@
+from collections import deque
+from contextvars import Context, copy_context
+from dataclasses import dataclass
+from threading import Lock, Thread
+from time import monotonic, time
+
+from sgx_scraper.utils.constant import (
+    HEDGE_DEFAULT_DELAY_SECONDS,
+    HEDGE_MIN_DELAY_SECONDS,
+    HEDGE_MIN_SAMPLES,
+    LLM_LATENCY_WINDOW,
+    LLM_MAX_IN_FLIGHT,
+    ROTATE_BACKOFF_SECONDS,
+    ROTATE_MAX_SWEEPS,
+)
+from sgx_scraper.utils.instrumentation import percentile
+
+import asyncio
+import logging
+import re
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+async def in_context(coroutine, context: Context):
+    # tasks on the runner loop start from its own context, carry the caller's
+    # (call site, stage) over
+    for variable, value in context.items():
+        variable.set(value)
+
+    return await coroutine
+
+
+class LlmRunner:
+    """
+    One background event loop every LLM call runs on.
+
+    Sync callers block on `run`, async callers on other loops await `arun`.
+    A call that runs past its deadline or loses a hedge is cancelled as a
+    task, which closes its connection, instead of being left behind on a
+    worker thread. `in_flight` bounds the calls running at once across all
+    models and keys.
+    """
+
+    def __init__(self, max_in_flight: int = LLM_MAX_IN_FLIGHT):
+        self.max_in_flight = max_in_flight
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._in_flight: asyncio.BoundedSemaphore | None = None
+        self._lock = Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        # Started on first use so commands that never call a model spawn no thread
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                Thread(target=loop.run_forever, name='llm-loop', daemon=True).start()
+
+                self._loop = loop
+
+            return self._loop
+
+    @property
+    def in_flight(self) -> asyncio.BoundedSemaphore:
+        # only touched from the runner loop
+        if self._in_flight is None:
+            self._in_flight = asyncio.BoundedSemaphore(self.max_in_flight)
+
+        return self._in_flight
+
+    def is_runner_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+
+        except RuntimeError:
+            return False
+
+    def run(self, coroutine):
+        future = asyncio.run_coroutine_threadsafe(
+            in_context(coroutine, copy_context()), self._get_loop()
+        )
+
+        try:
+            return future.result()
+
+        except BaseException:
+            # e.g. KeyboardInterrupt in the caller, do not leave the call running
+            future.cancel()
+            raise
+
+    async def arun(self, coroutine):
+        if self.is_runner_loop():
+            return await coroutine
+
+        # cancelling the awaiting task cancels the call on the runner loop
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(
+            in_context(coroutine, copy_context()), self._get_loop()
+        ))
+
+
+class LatencyTracker:
+    """Recent successful call latencies per model, the source of hedge delays."""
+
+    def __init__(self, window: int = LLM_LATENCY_WINDOW):
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = Lock()
+
+    def observe(self, model_name: str, elapsed: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model_name, deque(maxlen=self.window)).append(elapsed)
+
+    def p95(self, model_name: str) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(model_name, ()))
+
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+
+        return percentile(samples, 95)
+
+    def hedge_delay(self, model_name: str) -> float:
+        p95 = self.p95(model_name)
+
+        if p95 is None:
+            return HEDGE_DEFAULT_DELAY_SECONDS
+
+        return max(p95, HEDGE_MIN_DELAY_SECONDS)
+
+
+@dataclass
+class KeyState:
+    in_flight: int = 0
+    # monotonic time before which the key is not handed out
+    cooldown_until: float = 0.0
+    remaining_requests: int | None = None
+    # 429s since the last success, scales the cooldown when no header says
+    rate_limited: int = 0
+    last_used: float = 0.0
+
+
+def parse_reset_seconds(value: str | None) -> float | None:
+    """
+    Seconds until a rate limit resets from a header value: groq sends a
+    duration ('2m59.56s', '7.66s', '120ms'), openrouter an epoch in ms and
+    retry-after plain seconds.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+
+    try:
+        number = float(value)
+
+    except ValueError:
+        parts = re.findall(r'([\d.]+)(ms|h|m|s)', value)
+
+        if not parts:
+            return None
+
+        scale = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+        return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+    # epoch milliseconds rather than a delay
+    if number > 1e11:
+        return max(number / 1000 - time(), 0.0)
+
+    return number
+
+
+def header_value(headers, *names: str) -> str | None:
+    for name in names:
+        value = headers.get(name) or headers.get(name.lower())
+
+        if value:
+            return value
+
+    return None
+
+
+class KeyScheduler:
+    """
+    Rate-limit state per (model, key index), shared by every pool get_llm
+    builds for the model. Calls take the least loaded key that is not
+    cooling down, so concurrent calls spread over all keys instead of all
+    hitting the first one. Only touched from the LLM_RUNNER loop, so no
+    locking.
+    """
+
+    def __init__(self):
+        self._states: dict[tuple[str, int], KeyState] = {}
+
+    def state(self, model_name: str, index: int) -> KeyState:
+        return self._states.setdefault((model_name, index), KeyState())
+
+    def acquire(self, model_name: str, pool_size: int, exclude: set[int]) -> int | None:
+        now = monotonic()
+
+        ready = [
+            index
+            for index in range(pool_size)
+            if index not in exclude and self.state(model_name, index).cooldown_until <= now
+        ]
+
+        if not ready:
+            return None
+
+        def load(index: int):
+            state = self.state(model_name, index)
+            exhausted = state.remaining_requests == 0
+
+            return (exhausted, state.in_flight, state.rate_limited, state.last_used)
+
+        index = min(ready, key=load)
+
+        state = self.state(model_name, index)
+        state.in_flight += 1
+        state.last_used = now
+
+        return index
+
+    def release(self, model_name: str, index: int) -> None:
+        self.state(model_name, index).in_flight -= 1
+
+    def ready_in(self, model_name: str, pool_size: int, exclude: set[int]) -> float | None:
+        # seconds until the first usable key comes off cooldown
+        cooldowns = [
+            self.state(model_name, index).cooldown_until
+            for index in range(pool_size)
+            if index not in exclude
+        ]
+
+        if not cooldowns:
+            return None
+
+        return max(min(cooldowns) - monotonic(), 0.0)
+
+    def observe_success(self, model_name: str, index: int) -> None:
+        state = self.state(model_name, index)
+        state.rate_limited = 0
+
+        # the key answered, so it is not exhausted unless its headers put it
+        # on a cooldown that is still running
+        if state.cooldown_until <= monotonic():
+            state.remaining_requests = None
+
+    def observe_headers(self, model_name: str, index: int, headers) -> None:
+        # fed by the http client of every pooled key, on each response
+        state = self.state(model_name, index)
+
+        remaining = header_value(
+            headers, 'x-ratelimit-remaining-requests', 'x-ratelimit-remaining'
+        )
+
+        if remaining is None or not remaining.isdigit():
+            return
+
+        state.remaining_requests = int(remaining)
+
+        if state.remaining_requests == 0:
+            reset = parse_reset_seconds(
+                header_value(headers, 'x-ratelimit-reset-requests', 'x-ratelimit-reset')
+            )
+
+            if reset:
+                state.cooldown_until = monotonic() + reset
+
+    def observe_rate_limit(self, model_name: str, index: int, headers=None) -> float:
+        state = self.state(model_name, index)
+        state.rate_limited += 1
+        state.remaining_requests = 0
+
+        cooldown = None
+
+        if headers:
+            cooldown = parse_reset_seconds(header_value(
+                headers,
+                'retry-after',
+                'x-ratelimit-reset-requests',
+                'x-ratelimit-reset-tokens',
+                'x-ratelimit-reset',
+            ))
+
+        if not cooldown:
+            cooldown = ROTATE_BACKOFF_SECONDS * min(state.rate_limited, ROTATE_MAX_SWEEPS)
+
+        state.cooldown_until = monotonic() + cooldown
+
+        return cooldown
+
+
+LLM_RUNNER = LlmRunner()
+LLM_LATENCY = LatencyTracker()
+KEY_SCHEDULER = KeyScheduler()
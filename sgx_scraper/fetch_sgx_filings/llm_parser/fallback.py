@@ -1,7 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
-from sgx_scraper.fetch_sgx_filings.llm.client import get_llm
+from sgx_scraper.fetch_sgx_filings.llm.accounting import llm_call_site
+from sgx_scraper.fetch_sgx_filings.llm.hedging import invoke_with_fallback
 from sgx_scraper.fetch_sgx_filings.llm.prompts import RawTransactionExtraction, PromptCollections
 from sgx_scraper.fetch_sgx_filings.parser_forms.base_parser import BaseFormParser
 from sgx_scraper.fetch_sgx_filings.utils.payload_helper import (
@@ -34,6 +35,7 @@ def anchor_window(source: BaseFormParser) -> str:
     return part_iv if part_iv else region_text(blocks, 0)
 
 
+@llm_call_site('fallback')
 def run_extraction(
     source: BaseFormParser,
     window: str,
@@ -67,41 +69,34 @@ def run_extraction(
         'format_instructions': parser.get_format_instructions(),
     }
 
-    for model in [
-        "nvidia-nemotron-3-ultra",
-        "gpt-oss-120b",
-    ]:
-        try:
-            llm = get_llm(model, temperature=0.2)
-
-            if llm is None:
-                continue
-
-            LOGGER.info('extracting raw values with %s', model)
-
-            extraction = (prompt | llm | parser).invoke(input_data)
-            LOGGER.info("raw extraction fallback: %s", extraction)
+    model, extraction = invoke_with_fallback(
+        prompt,
+        parser,
+        [
+            "nvidia-nemotron-3-ultra",
+            "gpt-oss-120b",
+        ],
+        input_data,
+        accept=accept_extraction,
+        flag_log='fallback',
+    )
 
-            # the model sometimes wraps the object in a JSON array, unwrap to a dict
-            if isinstance(extraction, list):
-                extraction = next(
-                    (item for item in extraction if isinstance(item, dict)), 
-                    None
-                )
+    if model is not None:
+        LOGGER.info("raw extraction fallback (%s): %s", model, extraction)
 
-            if not isinstance(extraction, dict):
-                LOGGER.warning('[fallback] %s returned non-object extraction, skipping', model)
-                continue
+    cache[cache_key] = extraction
+    return extraction
 
-            cache[cache_key] = extraction
-            return extraction
 
-        except Exception as error:
-            LOGGER.warning('[fallback] model %s failed: %s', model, error)
-            continue
+def accept_extraction(extraction) -> dict | None:
+    # the model sometimes wraps the object in a JSON array, unwrap to a dict
+    if isinstance(extraction, list):
+        extraction = next(
+            (item for item in extraction if isinstance(item, dict)), 
+            None
+        )
 
-    cache[cache_key] = None
-    return None
+    return extraction if isinstance(extraction, dict) else None
 
 
 def normalise(text: str) -> str:
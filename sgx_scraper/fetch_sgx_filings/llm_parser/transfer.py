@@ -1,7 +1,9 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
+from sgx_scraper.fetch_sgx_filings.llm.accounting import llm_call_site
 from sgx_scraper.fetch_sgx_filings.llm.client import get_llm
+from sgx_scraper.fetch_sgx_filings.llm.hedging import invoke_with_fallback
 from sgx_scraper.fetch_sgx_filings.llm.prompts import TransferParties, PromptCollections
 
 import json
@@ -11,6 +13,7 @@ import logging
 LOGGER = logging.getLogger(__name__)
 
 
+@llm_call_site('transfer')
 def classify_transfer(holder_name: str | None, circumstances_desc: str) -> dict | None:
     parser = JsonOutputParser(pydantic_object=TransferParties)
 
@@ -27,28 +30,22 @@ def classify_transfer(holder_name: str | None, circumstances_desc: str) -> dict
         'format_instructions': parser.get_format_instructions(),
     }
 
-    for model in [
-        "nvidia-nemotron-3-ultra",
-        "gpt-oss-120b",
-    ]:
-        try:
-            llm = get_llm(model, temperature=0.2)
+    model, result = invoke_with_fallback(
+        prompt,
+        parser,
+        [
+            "nvidia-nemotron-3-ultra",
+            "gpt-oss-120b",
+        ],
+        input_data,
+        accept=lambda parties: parties if isinstance(parties, dict) else None,
+        flag_log='transfer',
+    )
 
-            if llm is None:
-                continue
+    if model is not None:
+        LOGGER.info('[transfer] parties (%s): %s', model, result)
 
-            LOGGER.info('[transfer] resolving parties with %s', model)
-
-            result = (prompt | llm | parser).invoke(input_data)
-            LOGGER.info('[transfer] parties: %s', result)
-
-            return result
-
-        except Exception as error:
-            LOGGER.warning('[transfer] model %s failed: %s', model, error)
-            continue
-
-    return None
+    return result
 
 
 def resolve_transfer_holder(holder_name: str | None, circumstances_desc: str) -> str | None:
@@ -76,6 +73,7 @@ def resolve_transfer_holder(holder_name: str | None, circumstances_desc: str) ->
     return f'{transferor} [->] {transferee}'
 
 
+@llm_call_site('transfer')
 def resolve_form_3_part_iii_iv_transfer_holder(records: list[dict]) -> str | None:
     direct_change_records = [
         record
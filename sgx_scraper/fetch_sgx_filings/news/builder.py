@@ -3,12 +3,13 @@ from langchain_core.output_parsers import JsonOutputParser
 
 from pathlib import Path
 
+from sgx_scraper.fetch_sgx_filings.llm.accounting import llm_call_site
 from sgx_scraper.fetch_sgx_filings.llm.client import get_llm 
 from sgx_scraper.fetch_sgx_filings.llm.prompts import PromptCollections, TitleBodyGeneration
 from sgx_scraper.utils.symbol_matching_helper import lookup_company_by_symbol
+from sgx_scraper.utils.instrumentation import timed, tracked_sleep
 
 import logging
-import time
 import random 
 import json 
 import re 
@@ -55,6 +56,7 @@ def format_filing_for_prompt(filing: dict) -> str:
     return '\n'.join(lines)
 
 
+@llm_call_site('news')
 def generate_news_title_body(record: dict) -> tuple[str, str] | None:
     generation_parser = JsonOutputParser(pydantic_object=TitleBodyGeneration)
     format_instructions = generation_parser.get_format_instructions()
@@ -134,6 +136,7 @@ def clean_news_payload(
     }
 
 
+@timed('news.generate')
 def generate_news(payload: list[dict]) -> list[dict]:
     if payload is None:
         return []
@@ -142,7 +145,7 @@ def generate_news(payload: list[dict]) -> list[dict]:
 
     for record in payload:
         result = generate_news_title_body(record)
-        time.sleep(random.randint(2, 5))
+        tracked_sleep(random.randint(2, 5), stage='news.throttle')
 
         if result is None:
             LOGGER.warning(f"Skipping news generation for {record.get('symbol')} — all LLMs failed")
@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from sgx_scraper.fetch_sgx_filings.parser_forms.router import RouterFormParser
+
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Structured values the LLM fallback recovers when the deterministic parse leaves them null
+FALLBACK_COLUMNS = [
+    "price_per_share",
+    "amount_transaction",
+    "transaction_type"
+]
+
+
+@dataclass
+class ParsedFiling:
+    """
+    Picklable result of parsing one filing PDF in a worker process.
+
+    Carries the parsed records plus what the parent needs for LLM enrichment
+    without reopening the PDF: the Form 3 Part III/IV transfer context and
+    the reading-order text blocks (only when a record has missing values).
+    Exposes `ordered_text_blocks` so it can stand in for the parser as the
+    LLM fallback source.
+    """
+    pdf_url: str
+    form: str
+    records: list[dict] = field(default_factory=list)
+    transfer_context_records: list[dict] | None = None
+    text_blocks: list[dict] = field(default_factory=list)
+    # measured where the parse ran, so pool workers still show up in run timings
+    parse_seconds: float = 0.0
+
+    def ordered_text_blocks(self) -> list[dict]:
+        return self.text_blocks
+
+
+def parse_filing_pdf(pdf_url: str, pdf_bytes: bytes) -> ParsedFiling | None:
+    # Top-level so it can be shipped to a ProcessPoolExecutor, all CPU-bound
+    # pdfplumber / pymupdf work for one filing happens here
+    start = perf_counter()
+    parser = RouterFormParser.get_parser(pdf_url, pdf_bytes)
+
+    if parser is None:
+        LOGGER.info("[sgx_filings] skipping unsupported form: %s", pdf_url)
+        return None
+
+    try:
+        # Voting-shares filtering now happens inside each parser: per-transaction in the
+        # builder-based forms, and once per shared Part IV in Form 3 Part III/IV.
+        records = parser.parse_records()
+
+        needs_fallback = any(
+            record.get(column) is None
+            for record in records
+            for column in FALLBACK_COLUMNS
+        )
+
+        return ParsedFiling(
+            pdf_url=pdf_url,
+            form=type(parser).__name__,
+            records=records,
+            transfer_context_records=getattr(parser, "transfer_context_records", None),
+            text_blocks=parser.ordered_text_blocks() if needs_fallback else [],
+            parse_seconds=perf_counter() - start,
+        )
+    finally:
+        parser.close()
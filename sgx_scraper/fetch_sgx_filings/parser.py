@@ -1,13 +1,14 @@
 from bs4 import BeautifulSoup
 
-from sgx_scraper.fetch_sgx_filings.parser_forms.router import RouterFormParser
+from sgx_scraper.fetch_sgx_filings.parser_forms.base_parser import BaseFormParser
+from sgx_scraper.fetch_sgx_filings.parse_stage import FALLBACK_COLUMNS, ParsedFiling, parse_filing_pdf
 from sgx_scraper.utils.http_client import HTTPCLIENT
 from .utils.payload_html_helper import extract_section_data
 from .llm_parser.fallback import parse_with_llm
 from .llm_parser.transfer import resolve_form_3_part_iii_iv_transfer_holder, resolve_transfer_holder
+from sgx_scraper.utils.instrumentation import record_span, timed, tracked_sleep
 
 import logging
-import time
 
 
 LOGGER = logging.getLogger(__name__)
@@ -30,44 +31,38 @@ def resolve_document_url(url: str) -> str | None:
     return attachments[-1]
 
 
-def get_sgx_filings(url: str) -> list[dict]:
+@timed('filings.download')
+def download_filing_pdf(url: str) -> tuple[str, bytes] | None:
     pdf_url = resolve_document_url(url)
 
     if not pdf_url:
-        return []
+        return None
+
+    response = HTTPCLIENT.get(pdf_url)
+    response.raise_for_status()
 
-    parser = RouterFormParser.get_parser(pdf_url)
+    return pdf_url, response.content
 
-    if parser is None:
-        LOGGER.info("[sgx_filings] skipping unsupported form: %s", pdf_url)
-        return []
 
-    # Voting-shares filtering now happens inside each parser: per-transaction in the
-    # builder-based forms, and once per shared Part IV in Form 3 Part III/IV.
-    result_parsed = parser.parse_records()
+@timed('filings.enrich')
+def enrich_filing(parsed: ParsedFiling) -> list[dict]:
+    # LLM fallback and transfer-holder resolution, runs in the parent process
+    # since it is network-bound and shares the LLM key rotation state
+    record_span('filings.parse', parsed.parse_seconds)
 
-    form_3_part_iii_iv_context_records = getattr(
-        parser,
-        "transfer_context_records",
-        None,
-    )
+    result_parsed = parsed.records
+    form_3_part_iii_iv_context_records = parsed.transfer_context_records
 
     form_3_part_iii_iv_transfer_holder = None
     form_3_part_iii_iv_transfer_checked = False
 
-    columns_to_check = [
-        "price_per_share",
-        "amount_transaction",
-        "transaction_type"
-    ]
-
     for record in result_parsed:
         circumstances_desc = record.get("circumstances_desc") or ""
 
         # Recover any null structured values (verbatim + verified)
         missing_columns = [
             column
-            for column in columns_to_check
+            for column in FALLBACK_COLUMNS
             if record.get(column) is None
         ]
 
@@ -78,7 +73,7 @@ def get_sgx_filings(url: str) -> list[dict]:
             )
 
             filled = parse_with_llm(
-                source=parser,
+                source=parsed,
                 holder_name=record.get("holder_name"),
                 missing_columns=missing_columns,
                 circumstances_desc=circumstances_desc,
@@ -87,7 +82,7 @@ def get_sgx_filings(url: str) -> list[dict]:
             for column, value in filled.items():
                 record[column] = value
 
-            time.sleep(2)
+            tracked_sleep(2)
 
         is_unresolved_transfer = (
             record.get("transaction_type") == "transfer"
@@ -104,7 +99,7 @@ def get_sgx_filings(url: str) -> list[dict]:
                     )
                     
                     form_3_part_iii_iv_transfer_checked = True
-                    time.sleep(2)
+                    tracked_sleep(2)
 
                 holder = form_3_part_iii_iv_transfer_holder
 
@@ -113,12 +108,25 @@ def get_sgx_filings(url: str) -> list[dict]:
                     holder_name=record.get("holder_name"),
                     circumstances_desc=circumstances_desc,
                 )
-                time.sleep(2)
+                tracked_sleep(2)
 
             if holder:
                 record["holder_name"] = holder
 
-        parser.generate_title_and_body(record=record)
+        BaseFormParser.generate_title_and_body(record=record)
 
     return result_parsed
 
+
+def get_sgx_filings(url: str) -> list[dict]:
+    downloaded = download_filing_pdf(url)
+
+    if not downloaded:
+        return []
+
+    parsed = parse_filing_pdf(*downloaded)
+
+    if parsed is None:
+        return []
+
+    return enrich_filing(parsed)
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 
+from sgx_scraper.config.settings import SHARE_TABLE_TARGETED
 from sgx_scraper.utils.http_client import HTTPCLIENT
 from sgx_scraper.utils.symbol_matching_helper import add_sgx_suffix, matching_symbol
 from sgx_scraper.fetch_sgx_filings.utils.payload_helper import (
@@ -11,6 +12,7 @@ from sgx_scraper.fetch_sgx_filings.utils.payload_helper import (
     build_transaction_type as build_transaction_type_helper,
 )
 from sgx_scraper.fetch_sgx_filings.utils.payload_pdf_helper import (
+    PageGeometry,
     contains_share_rule,
     extract_circumstance_interest_checkbox,
     extract_type_securities_checkbox,
@@ -58,14 +60,19 @@ class BaseFormParser(ABC):
         r'^\s*(?:\d+\.|\([a-z0-9]+\)|Attachments\b)(?:\s|$)'
     )
     _PAGE_HEADER_PATTERN = re.compile(r'^Page \d+ of \d+ FORM ', re.IGNORECASE)
+    # First row of every share table, the tables are only searched from here down
+    _SHARE_TABLE_ANCHOR_PATTERN = re.compile(r'immediately\s+(?:before|after)', re.IGNORECASE)
 
     def __init__(
         self,
-        pdf_url: str
+        pdf_url: str,
+        pdf_bytes: bytes | None = None,
+        doc: fitz.Document | None = None
     ):
         self.pdf_url = pdf_url
-        self.pdf_bytes = None
-        self._doc_fitz = None
+        self.pdf_bytes = pdf_bytes
+        self._doc_fitz = doc
+        self._page_geometry = None
         self._doc_parsed = None
         self._text_blocks = None
 
@@ -86,7 +93,93 @@ class BaseFormParser(ABC):
 
         return self._doc_fitz
 
+    def close(self) -> None:
+        if self._doc_fitz is not None:
+            self._doc_fitz.close()
+            self._doc_fitz = None
+
+    def get_page_geometry(self) -> PageGeometry:
+        if self._page_geometry is None:
+            self._page_geometry = PageGeometry(self.get_pdf_doc())
+
+        return self._page_geometry
+
+    @staticmethod
+    def _share_table_top(page_blocks: list[dict[str, any]], anchor: dict[str, any]) -> float:
+        # Crop line above the anchor's table, the bottom of the nearest text
+        # block ending above every cell of the anchor row. The table's top rule
+        # and header cells taller than the anchor text stay inside the crop
+        row_top = min(
+            block['y0']
+            for block in page_blocks
+            if block['y0'] < anchor['y1'] and block['y1'] > anchor['y0']
+        )
+
+        return max((block['y1'] for block in page_blocks if block['y1'] <= row_top), default=0.0)
+
+    def share_table_regions(self) -> dict[int, float]:
+        # Page index -> top of the region holding share tables, taken from the
+        # 'Immediately before/after' anchors in the fitz text blocks. The page
+        # after an anchor page is kept whole since tables continue across pages
+        blocks = self.ordered_text_blocks()
+        anchors = {}
+
+        for block in blocks:
+            if self._SHARE_TABLE_ANCHOR_PATTERN.search(block['text']):
+                anchors.setdefault(block['page'], block)
+
+        regions = {}
+
+        for page_index, anchor in anchors.items():
+            if page_index - 1 in anchors:
+                regions[page_index] = 0.0
+            else:
+                page_blocks = [block for block in blocks if block['page'] == page_index]
+                regions[page_index] = self._share_table_top(page_blocks, anchor)
+
+        for page_index in anchors:
+            regions.setdefault(page_index + 1, 0.0)
+
+        return regions
+
     def extract_share_tables(self) -> list[list[list[str]]]:
+        # the targeted search is opt-in until the share-tables benchmark
+        # matches the full scan on the stored corpus
+        if SHARE_TABLE_TARGETED:
+            return self.extract_share_tables_targeted()
+
+        return self.extract_share_tables_full_scan()
+
+    def extract_share_tables_targeted(self) -> list[list[list[str]]]:
+        regions = self.share_table_regions()
+
+        if not regions:
+            # No anchors in the text layer (e.g. unusual encodings), scan everything
+            return self.extract_share_tables_full_scan()
+
+        raw_tables = []
+
+        with pdfplumber.open(io.BytesIO(self.get_pdf_bytes())) as pdf:
+            for page_index in sorted(regions):
+                if page_index >= len(pdf.pages):
+                    continue
+
+                page = pdf.pages[page_index]
+                top = regions[page_index]
+
+                if top > 0:
+                    x0, page_top, x1, bottom = page.bbox
+                    page = page.crop((x0, page_top + top, x1, bottom))
+
+                for table in page.extract_tables():
+                    if table and contains_share_rule(table):
+                        raw_tables.append(table)
+
+        return self.group_share_tables(raw_tables)
+
+    def extract_share_tables_full_scan(self) -> list[list[list[str]]]:
+        # Every page through pdfplumber table finding, the reference output
+        # for extract_share_tables_targeted
         raw_tables = []
 
         with pdfplumber.open(io.BytesIO(self.get_pdf_bytes())) as pdf:
@@ -195,7 +288,7 @@ class BaseFormParser(ABC):
             full_page_bbox = (0, 0, page.rect.width, page.rect.height)
             
             circumstance = extract_circumstance_interest_checkbox(
-                doc_fitz, page_index, full_page_bbox
+                self.get_page_geometry(), page_index, full_page_bbox
             )
 
             if circumstance:
@@ -350,6 +443,7 @@ class BaseFormParser(ABC):
                     blocks.append({
                         'page': page_index,
                         'y0': block['y0'],
+                        'y1': block['y1'],
                         'x0': block['x0'],
                         'text': text,
                     })
@@ -411,7 +505,8 @@ class BaseFormParser(ABC):
 
         return add_sgx_suffix(matching_symbol(company_name))
 
-    def generate_title_and_body(self, record: dict) -> dict:
+    @staticmethod
+    def generate_title_and_body(record: dict) -> dict:
         title, body = generate_title_and_body_helper(
             holder_name=record.get('holder_name'),
             company_name=record.get('company_name'),
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from sgx_scraper.utils.http_client import HTTPCLIENT
 from .base_parser import BaseFormParser
 from .form_1 import Form1Parser
@@ -6,12 +8,24 @@ from .form_3.part_ii import Form3PartII
 from .form_3.part_iii_iv import Form3PartIIIandIV
 
 import re
+import hashlib
 import logging
 import fitz
 
 
 LOGGER = logging.getLogger(__name__)
 
+DIRECTOR_TITLE_PATTERN = re.compile(r'NOTIFICATION\s+FORM\s+FOR\s+DIRECTOR', re.IGNORECASE)
+# 'Part III' also appears in the explanatory notes of every Form 3,
+# so match the actual section heading 'Part III - Substantial ...'
+PART_III_HEADING_PATTERN = re.compile(r'Part\s+III\s*[-–]\s*Substantial', re.IGNORECASE)
+
+# Routing decision per PDF content hash, filings are re-fetched across runs
+# and the LLM fallback re-routes PDFs already seen by the main pipeline.
+# Least recently used hashes are dropped past ROUTE_CACHE_SIZE
+ROUTE_CACHE_SIZE = 4096
+_ROUTE_CACHE: OrderedDict[str, type[BaseFormParser] | None] = OrderedDict()
+
 
 class RouterFormParser:
     """
@@ -20,20 +34,22 @@ class RouterFormParser:
     Form type comes from the notification-form title, within Form 3, the
     presence of the 'Part III' section heading (multiple substantial holders)
     selects Part III+IV, otherwise Part II.
+
+    Detection extracts each page once and stops at the page completing a
+    director title, which outranks every other match. The opened document is
+    handed to the parser so it is not opened twice.
     """
 
     @staticmethod
     def _select_parser_class(text: str) -> type[BaseFormParser] | None:
-        if re.search(r'NOTIFICATION\s+FORM\s+FOR\s+DIRECTOR', text, re.IGNORECASE):
+        if DIRECTOR_TITLE_PATTERN.search(text):
             return Form1Parser
 
         if re.search(r'NOTIFICATION\s+FORM\s+FOR\s+TRUSTEE', text, re.IGNORECASE):
             return Form6Parser
 
         if re.search(r'NOTIFICATION\s+FORM\s+FOR\s+SUBSTANTIAL', text, re.IGNORECASE):
-            # 'Part III' also appears in the explanatory notes of every Form 3,
-            # so match the actual section heading 'Part III - Substantial ...'
-            if re.search(r'Part\s+III\s*[-–]\s*Substantial', text, re.IGNORECASE):
+            if PART_III_HEADING_PATTERN.search(text):
                 return Form3PartIIIandIV
 
             return Form3PartII
@@ -41,24 +57,55 @@ class RouterFormParser:
         return None
 
     @staticmethod
-    def get_parser(pdf_url: str) -> BaseFormParser | None:
-        response = HTTPCLIENT.get(pdf_url)
-        response.raise_for_status()
-        pdf_bytes = response.content
+    def select_parser_class_full_text(doc: fitz.Document) -> type[BaseFormParser] | None:
+        # Reference detection over the whole document text, kept to check
+        # detect_parser_class against a stored corpus
+        text = '\n'.join(page.get_text() for page in doc)
+
+        return RouterFormParser._select_parser_class(text)
+
+    @staticmethod
+    def detect_parser_class(doc: fitz.Document) -> type[BaseFormParser] | None:
+        # Same result as select_parser_class_full_text. A director title wins
+        # wherever it appears, so the remaining pages are skipped once it
+        # matches, the last two pages are joined for a title split across them
+        texts = []
+
+        for page in doc:
+            texts.append(page.get_text())
+
+            if DIRECTOR_TITLE_PATTERN.search('\n'.join(texts[-2:])):
+                return Form1Parser
 
-        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-            text = '\n'.join(page.get_text() for page in doc)
+        return RouterFormParser._select_parser_class('\n'.join(texts))
 
-        parser_class = RouterFormParser._select_parser_class(text)
+    @staticmethod
+    def get_parser(pdf_url: str, pdf_bytes: bytes | None = None) -> BaseFormParser | None:
+        if pdf_bytes is None:
+            response = HTTPCLIENT.get(pdf_url)
+            response.raise_for_status()
+            pdf_bytes = response.content
+
+        content_hash = hashlib.sha1(pdf_bytes).hexdigest()
+        doc = None
+
+        if content_hash in _ROUTE_CACHE:
+            parser_class = _ROUTE_CACHE[content_hash]
+            _ROUTE_CACHE.move_to_end(content_hash)
+        else:
+            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            parser_class = RouterFormParser.detect_parser_class(doc)
+            _ROUTE_CACHE[content_hash] = parser_class
+
+            if len(_ROUTE_CACHE) > ROUTE_CACHE_SIZE:
+                _ROUTE_CACHE.popitem(last=False)
 
         if parser_class is None:
+            if doc is not None:
+                doc.close()
             return None
 
         LOGGER.info("[RouterFormParser] -> %s", parser_class.__name__)
 
-        parser = parser_class(pdf_url)
-        # reuse the bytes already downloaded for detection
-        parser.pdf_bytes = pdf_bytes
-
-        return parser
-
+        # reuse the bytes and document already opened for detection
+        return parser_class(pdf_url, pdf_bytes=pdf_bytes, doc=doc)
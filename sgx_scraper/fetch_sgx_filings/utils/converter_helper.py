@@ -1,5 +1,6 @@
-import requests 
+from sgx_scraper.utils.http_client import HTTPCLIENT
 
+import requests 
 import logging
 
 
@@ -8,7 +9,7 @@ LOGGER = logging.getLogger(__name__)
 
 def get_latest_currency(currency_from: str) -> float | None:
     try:
-        response = requests.get(f"https://api.frankfurter.app/latest?from={currency_from.upper()}&to=SGD", timeout=10)
+        response = HTTPCLIENT.get(f"https://api.frankfurter.app/latest?from={currency_from.upper()}&to=SGD", timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -538,6 +538,7 @@ def filter_duplicate(payload: list[dict[str, any]]) -> list[dict]:
 
     cleaned_payload = []
     seen_keys = set()
+    dropped = 0
 
     for row in payload:
         unique_key = (
@@ -550,10 +551,17 @@ def filter_duplicate(payload: list[dict[str, any]]) -> list[dict]:
         )
 
         if unique_key in seen_keys:
-            LOGGER.info(f"Dropping duplicate record found in payload: \n{json.dumps(row, indent=2)}")
+            dropped += 1
+
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(f"Dropping duplicate record found in payload: \n{json.dumps(row, indent=2)}")
+
             continue
 
         seen_keys.add(unique_key)
         cleaned_payload.append(row)
 
+    if dropped:
+        LOGGER.info(f"Dropped {dropped} duplicate records from payload")
+
     return cleaned_payload
\ No newline at end of file
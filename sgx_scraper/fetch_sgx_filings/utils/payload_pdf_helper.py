@@ -1,3 +1,7 @@
+from dataclasses import dataclass, field
+from itertools import accumulate
+from array import array
+
 from sgx_scraper.fetch_sgx_filings.utils.constants import (
     ACQUISITION_OPTIONS, DISPOSAL_OPTIONS, 
     OTHER_OPTIONS, TYPE_SECURITIES_OPTIONS, 
@@ -10,6 +14,8 @@ import logging
 
 LOGGER = logging.getLogger(__name__)
 
+WHITE_FILL = (1.0, 1.0, 1.0)
+
 
 def get_all_text_blocks(text_dict: dict[str, any]) -> list[dict[str, any]]:
     all_text_blocks = []
@@ -34,9 +40,133 @@ def get_all_text_blocks(text_dict: dict[str, any]) -> list[dict[str, any]]:
     return all_text_blocks 
 
 
+def is_checked_drawing(drawing: dict[str, any]) -> bool:
+    # checked = dark fill, unchecked = white fill
+    fill_color = drawing.get('fill')
+
+    return (
+        drawing['type'] == 'f'
+        and bool(fill_color)
+        and fill_color != WHITE_FILL
+    )
+
+
+@dataclass
+class PageContent:
+    """
+    Text blocks and checked checkbox rects of one or more pages, stored
+    column-wise. Stacking pages only shifts the y columns by the page offset,
+    no per-block or per-drawing dict is copied.
+    """
+    texts: list[str] = field(default_factory=list)
+    x0: array = field(default_factory=lambda: array('d'))
+    y0: array = field(default_factory=lambda: array('d'))
+    y1: array = field(default_factory=lambda: array('d'))
+    # Only the filled (checked) boxes matter for checkbox reading, so the rest
+    # of the page drawings (table rules, unchecked boxes) are dropped up front
+    checked_x1: array = field(default_factory=lambda: array('d'))
+    checked_y0: array = field(default_factory=lambda: array('d'))
+
+    @classmethod
+    def from_page(cls, page: fitz.Page) -> 'PageContent':
+        content = cls()
+
+        for block in get_all_text_blocks(page.get_text("dict")):
+            content.texts.append(block["text"])
+            content.x0.append(block["x0"])
+            content.y0.append(block["y0"])
+            content.y1.append(block["y1"])
+
+        for drawing in page.get_drawings():
+            if is_checked_drawing(drawing):
+                content.checked_x1.append(drawing['rect'].x1)
+                content.checked_y0.append(drawing['rect'].y0)
+
+        return content
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def extend(self, other: 'PageContent', offset: float = 0.0) -> None:
+        self.texts.extend(other.texts)
+        self.x0.extend(other.x0)
+        self.checked_x1.extend(other.checked_x1)
+
+        if offset:
+            self.y0.extend(value + offset for value in other.y0)
+            self.y1.extend(value + offset for value in other.y1)
+            self.checked_y0.extend(value + offset for value in other.checked_y0)
+
+        else:
+            self.y0.extend(other.y0)
+            self.y1.extend(other.y1)
+            self.checked_y0.extend(other.checked_y0)
+
+    def block(self, index: int) -> dict[str, any]:
+        return {
+            "text": self.texts[index],
+            "x0": self.x0[index],
+            "y0": self.y0[index],
+            "y1": self.y1[index],
+        }
+
+    def find_block(self, pattern: str, y_start: float, y_end: float) -> int | None:
+        # First block (in extraction order) inside [y_start, y_end) matching pattern
+        for index, text in enumerate(self.texts):
+            if y_start <= self.y0[index] < y_end and re.search(pattern, text, re.IGNORECASE):
+                return index
+
+        return None
+
+    def is_checked(self, index: int, tolerance: float) -> bool:
+        # A checkbox is the filled rect on the same line, to the left of the label
+        block_x0 = self.x0[index]
+        block_y0 = self.y0[index]
+
+        return any(
+            abs(checked_y0 - block_y0) < tolerance and checked_x1 <= block_x0
+            for checked_x1, checked_y0 in zip(self.checked_x1, self.checked_y0)
+        )
+
+
+class PageGeometry:
+    """
+    Per-document page table. Page heights are read once and prefix-summed, so
+    the vertical offset between any two pages is a single subtraction instead
+    of reloading every page in between. Each page's content is parsed once and
+    shared by every circumstance section that spans it.
+    """
+
+    def __init__(self, doc: fitz.Document):
+        self.doc = doc
+        self.offsets = list(accumulate(
+            (page.rect.height for page in doc), 
+            initial=0.0
+        ))
+        self._page_contents = {}
+
+    @property
+    def page_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def height(self, page_index: int) -> float:
+        return self.offsets[page_index + 1] - self.offsets[page_index]
+
+    def offset_between(self, start_page_index: int, page_index: int) -> float:
+        return self.offsets[page_index] - self.offsets[start_page_index]
+
+    def page_content(self, page_index: int) -> PageContent:
+        content = self._page_contents.get(page_index)
+
+        if content is None:
+            content = PageContent.from_page(self.doc.load_page(page_index))
+            self._page_contents[page_index] = content
+
+        return content
+
+
 def find_options_in_range(
-    all_text_blocks: list[dict[str, any]],
-    drawings: list[dict[str, any]], 
+    content: PageContent,
     options_dict: dict[str, str],
     y_start: float,
     y_end: float
@@ -44,41 +174,19 @@ def find_options_in_range(
     subsection_results = {}
     
     for option_name, pattern in options_dict.items():
-        found = False
-        for block in all_text_blocks:
-            # Check if block is in the Y-range
-            if (y_start <= block["y0"] < y_end and
-                re.search(pattern, block["text"], re.IGNORECASE)):
-                
-                is_checked = False
-                
-                # Look for checkbox
-                for drawing in drawings:
-                    d_rect = drawing['rect']
-                    
-                    if (abs(d_rect.y0 - block['y0']) < 10 and
-                        d_rect.x1 <= block['x0'] and
-                        drawing['type'] == 'f'):
-                        
-                        fill_color = drawing.get('fill')
-                        
-                        if fill_color and fill_color != (1.0, 1.0, 1.0):
-                            is_checked = True
-                            break
-                
-                subsection_results[option_name] = is_checked
-                found = True
-                break
-        
-        if not found:
-            subsection_results[option_name] = None  
+        index = content.find_block(pattern, y_start, y_end)
+
+        if index is None:
+            subsection_results[option_name] = None
+            continue
+
+        subsection_results[option_name] = content.is_checked(index, tolerance=10)
     
     return subsection_results
 
 
 def extract_others_description(
-    all_text_blocks: list[dict[str, any]],
-    drawings: list[dict[str, any]],
+    content: PageContent,
     y_start: float,
     y_end: float,
     pattern: str
@@ -89,44 +197,29 @@ def extract_others_description(
     }
     
     # Find "pattern" text
-    others_block = None
-    for block in all_text_blocks:
-        if (y_start <= block["y0"] < y_end and
-            re.search(pattern, block["text"], re.IGNORECASE)):
-            others_block = block
-            break
+    others_index = content.find_block(pattern, y_start, y_end)
     
-    if not others_block:
+    if others_index is None:
         return result
     
     # Check if checkbox is checked
-    for drawing in drawings:
-        d_rect = drawing['rect']
-        
-        if (abs(d_rect.y0 - others_block['y0']) < 15 and
-            d_rect.x1 <= others_block['x0'] and
-            drawing['type'] == 'f'):
-            
-            fill_color = drawing.get('fill')
-            
-            if fill_color and fill_color != (1.0, 1.0, 1.0):
-                result['checked'] = True
-                break
+    result['checked'] = content.is_checked(others_index, tolerance=15)
     
     # Extract description text if checked True
     if result['checked'] == True:
-        description_y_start = others_block['y1']
+        description_y_start = content.y1[others_index]
         description_y_end = y_end
+        min_x0 = content.x0[others_index] - 20
         
         description_parts = []
-        for block in all_text_blocks:
+        for index, text in enumerate(content.texts):
             # Look for text below "pattern"
-            if (description_y_start <= block["y0"] < description_y_end and
+            if (description_y_start <= content.y0[index] < description_y_end and
                 # Same or slightly left indent
-                block['x0'] >= others_block['x0'] - 20): 
+                content.x0[index] >= min_x0): 
                 
                 # Skip if it's just empty or very short
-                text = block['text'].strip()
+                text = text.strip()
                 # Ignore very short text
                 if len(text) > 3:  
                     description_parts.append(text)
@@ -146,96 +239,44 @@ def convert_pdfplumber_bbox_to_fitz(bbox: tuple, page_height: float) -> fitz.Rec
 
 
 def find_section_header(
-    all_text_blocks: list[dict[str, any]], 
+    content: PageContent, 
     bbox_fitz: fitz.Rect
 ) -> dict[str, any] | None:
     try:
-        for block in all_text_blocks:
-            if re.search(r"Circumstance\s+giving\s+rise\s+to\s+the\s+interest", block["text"], re.IGNORECASE):
+        for index, text in enumerate(content.texts):
+            if re.search(r"Circumstance\s+giving\s+rise\s+to\s+the\s+interest", text, re.IGNORECASE):
                 # Allow 50pt tolerance
-                if block['y0'] >= bbox_fitz.y0 - 50:  
-                    return block
+                if content.y0[index] >= bbox_fitz.y0 - 50:  
+                    return content.block(index)
         return None
     except Exception as error:
         LOGGER.error(f"Error finding section header: {error}", exc_info=True)
         return None
-    
 
-def adjust_block_coordinates(
-    blocks: list[dict[str, any]], 
-    page_offset: float
-) -> list[dict[str, any]]:
-    try:
-        adjusted_blocks = []
-        
-        for block in blocks:
-            adjusted_block = block.copy()
-            adjusted_block['y0'] += page_offset
-            adjusted_block['y1'] += page_offset
-            adjusted_blocks.append(adjusted_block)
-        return adjusted_blocks
-    
-    except Exception as error:
-        LOGGER.error(f"[adjust_block_coordinates] Error: {error}")
-        return blocks
-
-
-def adjust_drawing_coordinates(
-    drawings: list[dict[str, any]], 
-    page_offset: float
-) -> list[dict[str, any]]:
-    try:
-        adjusted_drawings = []
-
-        for drawing in drawings:
-            adjusted_drawing = drawing.copy()
-            adjusted_drawing['rect'] = fitz.Rect(
-                drawing['rect'].x0,
-                drawing['rect'].y0 + page_offset,
-                drawing['rect'].x1,
-                drawing['rect'].y1 + page_offset
-            )
-            adjusted_drawings.append(adjusted_drawing)
-        return adjusted_drawings
-    
-    except Exception as error:
-        LOGGER.error(f"[adjust_drawing_coordinates] Error: {error}")
-        return drawings
-    
 
 def gather_page_content(
-    doc_fitz: fitz.Document,
+    geometry: PageGeometry,
     start_page_index: int,
     max_pages: int = 3
-) -> tuple[list[dict[str, any]], list[dict[str, any]]]:
+) -> PageContent:
     try:
-        combined_text_blocks = []
-        combined_drawings = []
+        combined = PageContent()
         
-        for page_idx in range(start_page_index, min(start_page_index + max_pages, len(doc_fitz))):
-            page = doc_fitz.load_page(page_idx)
-            text_dict = page.get_text("dict")
-            blocks = get_all_text_blocks(text_dict)
-            drawings = page.get_drawings()
-            
-            if page_idx > start_page_index:
-                page_offset = sum([doc_fitz.load_page(index).rect.height 
-                                 for index in range(start_page_index, page_idx)])
-                blocks = adjust_block_coordinates(blocks, page_offset)
-                drawings = adjust_drawing_coordinates(drawings, page_offset)
-            
-            combined_text_blocks.extend(blocks)
-            combined_drawings.extend(drawings)
+        for page_idx in range(start_page_index, min(start_page_index + max_pages, geometry.page_count)):
+            combined.extend(
+                geometry.page_content(page_idx),
+                geometry.offset_between(start_page_index, page_idx),
+            )
             
-        return combined_text_blocks, combined_drawings
+        return combined
     
     except Exception as error:
         LOGGER.error(f"Error gathering page content: {error}", exc_info=True)
-        return [], []
+        return PageContent()
     
 
 def find_subsection_blocks(
-    combined_text_blocks: list[dict[str, any]], 
+    content: PageContent, 
     search_start: float
 ) -> tuple[dict, dict, dict, dict]:
     try:
@@ -244,23 +285,23 @@ def find_subsection_blocks(
         other_circumstances_block = None
         others_specify_block = None
         
-        for block in combined_text_blocks:
-            if block["y0"] >= search_start:
+        for index, text in enumerate(content.texts):
+            if content.y0[index] >= search_start:
                 # Find Acquisition - only if not already found
-                if not acquisition_block and re.search(r"^Acquisition\s+of\s*:\s*$", block["text"], re.IGNORECASE):
-                    acquisition_block = block
+                if not acquisition_block and re.search(r"^Acquisition\s+of\s*:\s*$", text, re.IGNORECASE):
+                    acquisition_block = content.block(index)
                 
                 # Find Disposal - only if not already found
-                elif not disposal_block and re.search(r"^Disposal\s+of\s*:\s*$", block["text"], re.IGNORECASE):
-                    disposal_block = block
+                elif not disposal_block and re.search(r"^Disposal\s+of\s*:\s*$", text, re.IGNORECASE):
+                    disposal_block = content.block(index)
                 
                 # Find Other circumstances - only if not already found
-                elif not other_circumstances_block and re.search(r"^Other\s+circumstances\s*:\s*$", block["text"], re.IGNORECASE):
-                    other_circumstances_block = block
+                elif not other_circumstances_block and re.search(r"^Other\s+circumstances\s*:\s*$", text, re.IGNORECASE):
+                    other_circumstances_block = content.block(index)
                 
                 # Find Others specify - only if not already found
-                elif not others_specify_block and re.search(r"Others\s*\(\s*please\s+specify\s*\)", block["text"], re.IGNORECASE):
-                    others_specify_block = block
+                elif not others_specify_block and re.search(r"Others\s*\(\s*please\s+specify\s*\)", text, re.IGNORECASE):
+                    others_specify_block = content.block(index)
                 
                 # Break when found all blocks for this transaction
                 if (acquisition_block and disposal_block and 
@@ -311,31 +352,27 @@ def calculate_section_ranges(
 
 
 def extract_circumstance_interest_checkbox(
-    doc_fitz: fitz.Document, 
+    geometry: PageGeometry, 
     page_number: int, 
     bbox_pdfplumber: tuple
 ) -> dict[str, any] | None:
     try:
-        for page_index in range(page_number, min(page_number + 3, len(doc_fitz))):
-            page = doc_fitz.load_page(page_index)
-            page_height = page.rect.height
+        for page_index in range(page_number, min(page_number + 3, geometry.page_count)):
+            page_height = geometry.height(page_index)
             bbox_fitz = convert_pdfplumber_bbox_to_fitz(bbox_pdfplumber, page_height)
             
-            text_dict = page.get_text("dict")
-            all_text_blocks_unfiltered = get_all_text_blocks(text_dict)
-            
             # Find section header
-            section_block = find_section_header(all_text_blocks_unfiltered, bbox_fitz)
+            section_block = find_section_header(geometry.page_content(page_index), bbox_fitz)
             if not section_block:
                 continue
             
             # print(f'\nSection found on page {page_index}')
             
             # Collect text blocks from current page and next pages
-            combined_text_blocks, combined_drawings = gather_page_content(doc_fitz, page_index)
+            combined_content = gather_page_content(geometry, page_index)
             
             # Search for subsection headers in combined blocks
-            subsection_blocks = find_subsection_blocks(combined_text_blocks, section_block["y1"])
+            subsection_blocks = find_subsection_blocks(combined_content, section_block["y1"])
             if not subsection_blocks:
                 continue
             
@@ -353,31 +390,29 @@ def extract_circumstance_interest_checkbox(
             
             # Extract from combined blocks
             results["acquisition"] = find_options_in_range(
-                combined_text_blocks, combined_drawings, 
-                ACQUISITION_OPTIONS, *acquisition_range
+                combined_content, ACQUISITION_OPTIONS, *acquisition_range
             )
             
             if disposal_range[0]:
                 results["disposal"] = find_options_in_range(
-                    combined_text_blocks, combined_drawings,
-                    DISPOSAL_OPTIONS, *disposal_range
+                    combined_content, DISPOSAL_OPTIONS, *disposal_range
                 )
             
             if other_circumstances_range[0]:
                 results["other_circumstances"] = find_options_in_range(
-                    combined_text_blocks, combined_drawings, OTHER_OPTIONS, 
+                    combined_content, OTHER_OPTIONS, 
                     *other_circumstances_range
                 )
 
                 results["other_circumstances"]["Corporate action by Listed Issuer"] = extract_others_description(
-                    combined_text_blocks, combined_drawings,
+                    combined_content,
                     *other_circumstances_range,
                     r"Corporate action.*Listed Issuer.*please specify"
                 )
             
             if others_specify_range[0]:
                 results["others_specify"] = extract_others_description(
-                    combined_text_blocks, combined_drawings,
+                    combined_content,
                     *others_specify_range,
                     r"Others\s*\(\s*please specify\s*\)"
                 )
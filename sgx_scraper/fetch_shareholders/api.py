@@ -7,9 +7,9 @@ from .utils.helper import (
 )
 from sgx_scraper.utils.http_client import HTTPCLIENT
 from sgx_scraper.utils.symbol_matching_helper import add_sgx_suffix, strip_sgx_suffix
+from sgx_scraper.utils.instrumentation import timed, tracked_sleep
 
 import logging
-import time
 import random
 import json
 
@@ -31,6 +31,7 @@ def get_randomized_headers(base_headers: dict) -> dict:
     }
 
 
+@timed('shareholders.fetch')
 def fetch_api(symbol: str) -> dict | None:
     base_headers = {
         'accept': '*/*',
@@ -125,11 +126,11 @@ def get_screener_shareholders(symbols: list[str]) -> dict[str, list]:
             sleep_duration = random.randint(20, 30)
             LOGGER.info('long break at request %d, sleeping %ds', index, sleep_duration)
 
-            time.sleep(sleep_duration)
+            tracked_sleep(sleep_duration, stage='shareholders.throttle')
             next_long_break_at = index + random.randint(8, 15)
 
         else:
-            time.sleep(random.uniform(1.567, 4.5422))
+            tracked_sleep(random.uniform(1.567, 4.5422), stage='shareholders.throttle')
 
     return final 
 
@@ -184,8 +185,9 @@ def sync_with_db(
 
     final_result = enrich(result)
 
-    LOGGER.info(
-        'Check payload synced: %s', json.dumps(final_result, indent=2)
-    )
+    LOGGER.info('Synced shareholders payload for %d symbols', len(final_result))
+
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug('Check payload synced: %s', json.dumps(final_result, indent=2))
     
     return final_result 
@@ -44,9 +44,7 @@ def run_tracking_shareholders(
 def run_sync_screener_shareholders(
     is_push_db: Annotated[bool, typer.Option(help='Flag to upsert to db or not')] = True
 ):
-    top_200_companies = get_top_companies(
-        "data/sgx_top_200_mcap_companies.csv"
-    )
+    top_200_companies = get_top_companies(200)
 
     symbols = [
         record.get('symbol') 
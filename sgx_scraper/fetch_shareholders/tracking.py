@@ -81,10 +81,10 @@ def get_shareholders_update(
                 'share_percentage': filing_share_percentage,
             })
 
-    LOGGER.info(
-        'Check payload updated: %s',
-        json.dumps(result_by_symbol, indent=2)
-    )
+    LOGGER.info('Updated shareholders payload for %d symbols', len(result_by_symbol))
+
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug('Check payload updated: %s', json.dumps(result_by_symbol, indent=2))
 
     return [
         {'symbol': symbol, 'shareholders': shareholders}
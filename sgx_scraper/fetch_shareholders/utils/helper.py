@@ -1,6 +1,6 @@
 from rapidfuzz import fuzz, process
 
-from sgx_scraper.config.settings import SUPABASE_CLIENT
+from sgx_scraper.config.settings import get_supabase_client
 from sgx_scraper.utils.json_helper import open_json
 from sgx_scraper.utils.symbol_matching_helper import lookup_company_by_symbol
 
@@ -139,7 +139,7 @@ def get_current_shareholders(is_refresh: bool = False) -> dict[str, dict]:
     try: 
         if is_refresh:
             response = (
-                SUPABASE_CLIENT 
+                get_supabase_client()
                 .table('sgx_companies')
                 .select('symbol, shareholders, management')
                 .execute()
@@ -4,17 +4,51 @@ from sgx_scraper.sgx_api.scraper_sgx_api import iter_sgx_announcements
 from sgx_scraper.utils.cli_helper import upsert_to_db
 from sgx_scraper.utils.constant import UPCOMING_DIVIDEND
 from sgx_scraper.utils.json_helper import write_json
-from .parser import get_upcoming_dividend
+from sgx_scraper.utils.history_store import HISTORY_STORE
+from .parser import fetch_dividend_fields, finalise_dividend
 from .utils.db_helper import dedup_payload, delete_past_dividends
+from .utils.dividend_store import DividendStore
+from sgx_scraper.utils.instrumentation import tracked_sleep
 
 import typer
 import logging
-import time
 import random
 
 
 app = typer.Typer(help="Upcoming dividend scraper pipeline")
 
+LOGGER = logging.getLogger(__name__)
+
+
+def select_upcoming(records: list[dict]) -> list[dict]:
+    selected = []
+
+    for record in records:
+        # Required NOT NULL columns, SGX may broadcast a dividend before its
+        # pay date is declared, a later Replacement fills it in
+        missing = [
+            field
+            for field in (
+                "reference", 
+                "symbol", 
+                "ex_date", 
+                "payment_date"
+            )
+            if not record.get(field)
+        ]
+
+        if missing:
+            LOGGER.info(
+                '[Upcoming Dividend] Skipping %s, missing required fields: %s',
+                record.get('reference'),
+                missing,
+            )
+            continue
+
+        selected.append(record)
+
+    return selected
+
 
 @app.command(name="upcoming_dividend")
 def run_sgx_buyback_scraper(
@@ -25,10 +59,11 @@ def run_sgx_buyback_scraper(
     future_n_days: int = typer.Option(14, help="Only keep dividends with an ex-date within the next N days"),
     is_push_db: bool = typer.Option(True, help="Flag to push to db or not"),
     is_proxy: bool = typer.Option(None, help="Flag to use proxy or not"),
+    ignore_seen: bool = typer.Option(False, help="Re-fetch announcements already in the dividend store"),
 ):
     logger = logging.getLogger(__name__)
 
-    payload_upcoming_dividend = []
+    dividend_store = DividendStore()
 
     today = date.today()
     start_date = today.isoformat()
@@ -52,6 +87,8 @@ def run_sgx_buyback_scraper(
         is_proxy=is_proxy,
     )
 
+    fetched = skipped = 0
+
     for sgx_announcement in announcements:
         detail_url = sgx_announcement.get('url', None)
         issuer_name = sgx_announcement.get("issuer_name")
@@ -60,47 +97,20 @@ def run_sgx_buyback_scraper(
             logger.info('[Upcoming Dividend] Skipping %s, no detail url.', issuer_name)
             continue
 
+        # already parsed by an earlier run, its record is re-emitted from the store
+        if dividend_store.has_seen(sgx_announcement) and not ignore_seen:
+            skipped += 1
+            continue
+
         try:
-            payload = get_upcoming_dividend(detail_url)
+            # stored before the company check, a symbol missing from
+            # sgx_companies today is emitted once the snapshot has it
+            fields = fetch_dividend_fields(detail_url)
+            dividend_store.remember(sgx_announcement, fields)
+            fetched += 1
 
-            if not payload:
+            if not fields:
                 logger.info('[Upcoming Dividend] Skipping %s, no data extracted.', detail_url)
-                continue
-
-            ex_date = payload.get("ex_date")
-
-            if not ex_date or not (start_date <= ex_date <= end_date):
-                logger.info(
-                    '[Upcoming Dividend] Skipping %s, ex_date %s outside window %s to %s.',
-                    issuer_name,
-                    ex_date,
-                    start_date,
-                    end_date,
-                )
-                continue
-
-            # Required NOT NULL columns, SGX may broadcast a dividend before its
-            # pay date is declared, a later Replacement fills it in
-            missing = [
-                field
-                for field in (
-                    "reference", 
-                    "symbol", 
-                    "ex_date", 
-                    "payment_date"
-                )
-                if not payload.get(field)
-            ]
-
-            if missing:
-                logger.info(
-                    '[Upcoming Dividend] Skipping %s, missing required fields: %s',
-                    detail_url,
-                    missing,
-                )
-                continue
-
-            payload_upcoming_dividend.append(payload)
 
         except Exception as error:
             logger.error(
@@ -112,12 +122,28 @@ def run_sgx_buyback_scraper(
             )
             continue
 
-        time.sleep(random.uniform(1, 3))
+        tracked_sleep(random.uniform(1, 3), stage='dividend.throttle')
+
+    logger.info(
+        '[Upcoming Dividend] Fetched %d announcements, %d already in the store',
+        fetched,
+        skipped,
+    )
+
+    finalised = [
+        finalise_dividend(fields)
+        for fields in dividend_store.records_in_window(start_date, end_date)
+    ]
+    payload_upcoming_dividend = select_upcoming([record for record in finalised if record])
+
+    # seen fingerprints are only useful while their announcement can still be listed
+    dividend_store.save(seen_retention_days=lookback_days + 1)
 
     write_json(
         path=UPCOMING_DIVIDEND,
         payload=payload_upcoming_dividend
     )
+    HISTORY_STORE.append('upcoming_dividend', payload_upcoming_dividend)
 
     if is_push_db:
         deduped_payload = dedup_payload(payload_upcoming_dividend)
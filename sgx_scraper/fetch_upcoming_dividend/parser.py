@@ -1,17 +1,17 @@
 from bs4 import BeautifulSoup
 from datetime import datetime, timezone
 
-from sgx_scraper.utils.sgx_announcement_html import extract_section_data
+from sgx_scraper.utils.sgx_announcement_html import make_soup, parse_announcement_sections
 from sgx_scraper.utils.date_helper import safe_convert_datetime
 from sgx_scraper.utils.json_helper import open_json
 from sgx_scraper.utils.symbol_matching_helper import add_sgx_suffix, lookup_company_by_symbol
 from sgx_scraper.utils.http_client import HTTPCLIENT
 from sgx_scraper.fetch_upcoming_dividend.utils.fx_rates_client import fetch_compact_rates
+from sgx_scraper.utils.instrumentation import timed
 
 import json
 import re
 import logging
-import time 
 
 
 LOGGER = logging.getLogger(__name__)
@@ -113,10 +113,12 @@ def check_companies(record: dict[str, any]) -> dict[str, any] | None:
 
 def extract_all_fields(soup: BeautifulSoup, url: str) -> dict[str, any] | None:
     try:
-        issuer_section = extract_section_data(soup, "Issuer & Securities")
-        announcement_section = extract_section_data(soup, "Announcement Details")
-        event_dates_section = extract_section_data(soup, "Event Dates")
-        dividend_section = extract_section_data(soup, "Dividend Details")
+        sections = parse_announcement_sections(soup)
+
+        issuer_section = sections.get("Issuer & Securities", {})
+        announcement_section = sections.get("Announcement Details", {})
+        event_dates_section = sections.get("Event Dates", {})
+        dividend_section = sections.get("Dividend Details", {})
 
         security = issuer_section.get("Security")
         symbol = add_sgx_suffix(security.rsplit(" - ", 2)[-1])
@@ -135,17 +137,20 @@ def extract_all_fields(soup: BeautifulSoup, url: str) -> dict[str, any] | None:
         return None
 
 
-def get_upcoming_dividend(url: str) -> dict[str, any] | None:
+@timed('dividend.detail')
+def fetch_dividend_fields(url: str) -> dict[str, any] | None:
+    """The announcement fields as broadcast, before the company check and FX."""
     response = HTTPCLIENT.get(url)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = make_soup(response.text)
 
-    records = extract_all_fields(soup=soup, url=url)
+    return extract_all_fields(soup=soup, url=url)
 
-    if records is None:
-        return None
 
-    records = check_companies(record=records)
+def finalise_dividend(fields: dict[str, any]) -> dict[str, any] | None:
+    # Run on every emission rather than once at fetch, so a symbol added to
+    # sgx_companies later is picked up and the SGD amount uses today's rate
+    records = check_companies(record=dict(fields))
 
     if records is None:
         return None
@@ -153,10 +158,18 @@ def get_upcoming_dividend(url: str) -> dict[str, any] | None:
     records["dividend_amount"] = update_dividend_currency(records=records)
     records["updated_on"] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
-    time.sleep(1.5)
     return records
 
 
+def get_upcoming_dividend(url: str) -> dict[str, any] | None:
+    fields = fetch_dividend_fields(url)
+
+    if fields is None:
+        return None
+
+    return finalise_dividend(fields)
+
+
 if __name__ == '__main__':
     url = 'https://links.sgx.com/1.0.0/corporate-announcements/JYG9YK3K7DNB6CLZ/d4720c1aa336a298ec6bb95249aa3a97afbb4940ae571bc4e82fcd9f64e81066'
     url_repl = 'https://links.sgx.com/1.0.0/corporate-announcements/CLBLLDCB0QFV0KHF/2a69420374716d836bfa2d2517a1a3db47ba13cc4b7a6532faf373dffd9c96ee'
@@ -1,6 +1,7 @@
 from datetime import date, timedelta
 
-from sgx_scraper.config.settings import SUPABASE_CLIENT
+from sgx_scraper.config.settings import get_supabase_client
+from sgx_scraper.utils.run_mode import skip_offline
 
 import logging
 
@@ -28,11 +29,14 @@ def dedup_payload(payload: list[dict]):
 
 
 def delete_past_dividends(table_name: str, retention_days: int = 14) -> bool:
+    if skip_offline(f'deletion of past dividends from {table_name}'):
+        return False
+
     deletion_date = (date.today() - timedelta(days=retention_days)).isoformat()
 
     try:
         response = (
-            SUPABASE_CLIENT
+            get_supabase_client()
             .table(table_name)
             .delete()
             .lt('payment_date', deletion_date)
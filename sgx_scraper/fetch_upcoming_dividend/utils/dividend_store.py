@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+from hashlib import sha1
+from pathlib import Path
+
+from sgx_scraper.utils.constant import UPCOMING_DIVIDEND_STORE
+from sgx_scraper.utils.json_helper import open_json, write_json
+from sgx_scraper.utils.run_mode import skip_offline
+
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Bumped when the stored record shape changes, an older store is discarded
+# and the lookback window is fetched again once
+STORE_VERSION = 2
+
+
+class DividendStore:
+    """
+    Parsed dividends kept between runs, keyed by Corporate Action Reference.
+
+    Every listing record already fetched is remembered by a fingerprint of
+    its url, title and submission time, so only new announcements are
+    fetched. Replacement amendments are broadcast as new announcements and
+    overwrite the stored record of their reference when newer. Records are
+    stored as broadcast (before the company check and FX conversion) and
+    re-emitted once their ex-date falls in the window.
+    """
+
+    def __init__(self, path: str | Path = UPCOMING_DIVIDEND_STORE):
+        self.path = Path(path)
+
+        stored = open_json(self.path)
+        stored = stored if isinstance(stored, dict) else {}
+
+        if stored and stored.get('version') != STORE_VERSION:
+            LOGGER.info(f'[DividendStore] Discarding store version {stored.get("version")}, re-fetching')
+            stored = {}
+
+        self.records: dict[str, dict] = stored.get('records', {})
+        self.seen: dict[str, str] = stored.get('seen', {})
+
+    @staticmethod
+    def fingerprint(announcement: dict) -> str:
+        content = '|'.join(
+            str(announcement.get(field) or '')
+            for field in ('url', 'title', 'submission_date_time')
+        )
+
+        return sha1(content.encode('utf-8')).hexdigest()
+
+    def has_seen(self, announcement: dict) -> bool:
+        return self.fingerprint(announcement) in self.seen
+
+    def remember(self, announcement: dict, record: dict | None) -> None:
+        # `record` is the parsed announcement fields, None when the page is not
+        # a parseable dividend, which would not parse on a retry either
+        self.seen[self.fingerprint(announcement)] = date.today().isoformat()
+
+        reference = (record or {}).get('reference')
+
+        if not reference:
+            return
+
+        broadcast_at = announcement.get('submission_date_time') or 0
+        stored = self.records.get(reference)
+
+        if stored and stored.get('broadcast_at', 0) > broadcast_at:
+            LOGGER.info(f'[DividendStore] Keeping newer stored record for {reference}')
+            return
+
+        self.records[reference] = {'broadcast_at': broadcast_at, 'record': record}
+
+    def records_in_window(self, start_date: str, end_date: str) -> list[dict]:
+        return [
+            dict(entry['record'])
+            for entry in self.records.values()
+            if entry['record'].get('ex_date')
+            and start_date <= entry['record']['ex_date'] <= end_date
+        ]
+
+    def save(self, seen_retention_days: int) -> None:
+        if skip_offline('dividend store save'):
+            return
+
+        today = date.today().isoformat()
+        seen_cutoff = (date.today() - timedelta(days=seen_retention_days)).isoformat()
+
+        # past ex-dates can never re-enter the window, and listing records
+        # older than the lookback are never listed again
+        self.records = {
+            reference: entry
+            for reference, entry in self.records.items()
+            if (entry['record'].get('ex_date') or today) >= today
+        }
+        self.seen = {
+            fingerprint: seen_on
+            for fingerprint, seen_on in self.seen.items()
+            if seen_on >= seen_cutoff
+        }
+
+        write_json(self.path, {'version': STORE_VERSION, 'records': self.records, 'seen': self.seen})
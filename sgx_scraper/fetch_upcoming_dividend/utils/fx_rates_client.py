@@ -1,9 +1,13 @@
-import requests
+from functools import lru_cache
 
+from sgx_scraper.utils.http_client import HTTPCLIENT
 
+
+# once per run, every stored dividend is converted again when re-emitted
+@lru_cache(maxsize=1)
 def fetch_compact_rates() -> dict:
     url = "https://raw.githubusercontent.com/supertypeai/sectors_sg_my_data_updater/main/compact_rates.json"
-    resp = requests.get(url, timeout=10)
+    resp = HTTPCLIENT.get(url, timeout=10)
     resp.raise_for_status()
     return resp.json()
 
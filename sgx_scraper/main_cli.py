@@ -1,60 +1,128 @@
-from sgx_scraper.fetch_sgx_buyback.cli import app as buyback_app
-from sgx_scraper.fetch_sgx_filings.cli import app as filings_app
-from sgx_scraper.track_management.cli import app as management_app
-from sgx_scraper.fetch_shareholders.cli import app as shareholders_app
-from sgx_scraper.fetch_upcoming_dividend.cli import app as dividend_app
-from sgx_scraper.fetch_reit_transaction.cli import app as reit_transaction_app
-from sgx_scraper.fetch_agm.cli import app as agm_app
+from typer.core import TyperGroup
 
 import typer
-import logging
-import sys
-
-
-def setup_logging():
-    """Configures logging for the whole application"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s [%(levelname)s] %(name)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("scraper.log") 
-        ]
-    )
-
-    # suppress noisy third-party loggers
-    logging.getLogger('WDM').setLevel(logging.WARNING)
-    logging.getLogger('seleniumwire2').setLevel(logging.WARNING)
-    logging.getLogger('mitmproxy').setLevel(logging.WARNING)
-    logging.getLogger('urllib3').setLevel(logging.WARNING)
-    logging.getLogger('httpx').setLevel(logging.WARNING)
+import click
+import importlib
+
+
+# pipeline registration: one line per command, (module holding the pipeline's
+# typer app, short help). Modules are only imported when their command runs
+LAZY_COMMANDS = {
+    'scraper_buybacks': ('sgx_scraper.fetch_sgx_buyback.cli', 'SGX buyback scraper pipeline'),
+    'scraper_filings': ('sgx_scraper.fetch_sgx_filings.cli', 'SGX filings scraper pipeline'),
+    'track_management': ('sgx_scraper.track_management.cli', 'SGX management tracking pipeline'),
+    'track_shareholders': ('sgx_scraper.fetch_shareholders.cli', 'SGX shareholders tracking pipeline'),
+    'sync_screener_shareholders': ('sgx_scraper.fetch_shareholders.cli', 'Sync screener shareholders from SGX companies'),
+    'upcoming_dividend': ('sgx_scraper.fetch_upcoming_dividend.cli', 'Upcoming dividend scraper pipeline'),
+    'scraper_reit_transaction': ('sgx_scraper.fetch_reit_transaction.cli', 'SGX REIT property transaction scraper pipeline'),
+    'scraper_agm': ('sgx_scraper.fetch_agm.cli', 'SGX AGM and EGM meeting scraper pipeline'),
+}
+
+
+class LazyPipelineGroup(TyperGroup):
+    """
+    Root group that resolves pipeline commands from LAZY_COMMANDS on demand.
+
+    Each pipeline pulls in its own heavy stack (selenium-wire, langchain,
+    pdfplumber, pandas, ...), so only the invoked pipeline is imported and
+    `--help` is rendered from the static help without importing any of them.
+    """
+
+    _listing_only = False
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return [*super().list_commands(ctx), *LAZY_COMMANDS]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        command = super().get_command(ctx, cmd_name)
+
+        if command is not None or cmd_name not in LAZY_COMMANDS:
+            return command
+
+        module_path, short_help = LAZY_COMMANDS[cmd_name]
+
+        if self._listing_only:
+            return click.Command(cmd_name, short_help=short_help)
+
+        pipeline_app = importlib.import_module(module_path).app
+        pipeline_command = typer.main.get_command(pipeline_app)
+
+        if isinstance(pipeline_command, click.Group):
+            return pipeline_command.get_command(ctx, cmd_name)
+
+        return pipeline_command
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        self._listing_only = True
+
+        try:
+            return super().format_help(ctx, formatter)
+        finally:
+            self._listing_only = False
 
 
 app = typer.Typer(
+    cls=LazyPipelineGroup,
     help='A CLI for managing scraper sgx buybacks and filings',
     no_args_is_help=True
 )
 
 
 @app.callback()
-def main():
+def main(
+    profile: bool = typer.Option(
+        False, "--profile",
+        help="Profile the command, writes cProfile stats and folded stacks to data/scraper_output/profiles"
+    ),
+    offline: bool = typer.Option(
+        False, "--offline",
+        help=(
+            "Replay recorded HTTP responses instead of hitting SGX. Throttling sleeps, "
+            "LLM calls, DB writes, emails and saved run state (history, dedup index, CSV appends) are skipped"
+        )
+    ),
+    record_http: bool = typer.Option(
+        False, "--record-http",
+        help="Record HTTP responses for later --offline replays"
+    ),
+):
     """
     SGX Scraper CLI.
 
     This callback function treats this as a multi-command app
     """
+    from sgx_scraper.fetch_sgx_filings.llm.accounting import LLM_LEDGER, emit_llm_report
+    from sgx_scraper.utils.http_client import HTTPCLIENT
+    from sgx_scraper.utils.instrumentation import emit_run_report, set_sleep_enabled
+    from sgx_scraper.utils.logging_config import setup_logging
+    from sgx_scraper.utils.run_mode import set_offline
+
     setup_logging()
 
+    ctx = click.get_current_context()
+
+    if offline and record_http:
+        raise typer.BadParameter("--offline and --record-http are mutually exclusive")
+
+    if offline or record_http:
+        HTTPCLIENT.configure_replay(offline=offline, record=record_http)
+        set_sleep_enabled(not offline)
+        set_offline(offline)
+
+    if profile:
+        from sgx_scraper.utils.profiling import ProfileSession
+
+        session = ProfileSession(ctx.invoked_subcommand).start()
+        ctx.call_on_close(session.stop)
+
+    # per-host request metrics and the per-stage timing breakdown once the
+    # command finishes, the breakdown is also saved under run_timings/
+    ctx.call_on_close(HTTPCLIENT.log_metrics)
+    ctx.call_on_close(lambda: emit_run_report(ctx.invoked_subcommand))
 
-# pipeline registration: one line per pipeline
-app.add_typer(buyback_app)       # scraper_buybacks
-app.add_typer(filings_app)       # scraper_filings
-app.add_typer(management_app)    # track_management
-app.add_typer(shareholders_app)  # track_shareholders, sync_screener_shareholders
-app.add_typer(dividend_app)      # upcoming_dividend
-app.add_typer(reit_transaction_app)  # scraper_reit_transaction
-app.add_typer(agm_app)               # scraper_agm
+    # LLM calls per call site and model, saved under llm_usage/
+    LLM_LEDGER.start(ctx.invoked_subcommand)
+    ctx.call_on_close(lambda: emit_llm_report(ctx.invoked_subcommand))
 
 
 if __name__ == '__main__':
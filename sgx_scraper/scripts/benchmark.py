@@ -0,0 +1,571 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from unittest import mock
+
+from sgx_scraper.fetch_sgx_filings.parser_forms.form_3.part_iii_iv import Form3PartIIIandIV
+from sgx_scraper.fetch_sgx_filings.parser_forms.router import RouterFormParser
+from sgx_scraper.fetch_sgx_filings.parse_stage import parse_filing_pdf
+from sgx_scraper.utils.http_client import HTTPCLIENT
+from sgx_scraper.utils.constant import BENCHMARK_OUTPUT_DIR
+from sgx_scraper.utils.sgx_announcement_html import (
+    extract_section_data,
+    make_soup,
+    parse_announcement_sections,
+)
+
+import typer
+import json
+import subprocess
+import sys
+import tracemalloc
+
+
+app = typer.Typer(help="Benchmarks over locally stored SGX filing PDFs.")
+
+
+def load_pdfs(pdf_dir: Path, min_pages: int = 0, max_pages: int | None = None) -> list[tuple[Path, bytes]]:
+    import fitz
+
+    pdfs = []
+
+    for path in sorted(pdf_dir.glob('*.pdf')):
+        pdf_bytes = path.read_bytes()
+
+        with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+            page_count = len(doc)
+
+        if page_count < min_pages:
+            continue
+        if max_pages is not None and page_count > max_pages:
+            continue
+
+        pdfs.append((path, pdf_bytes))
+
+    return pdfs
+
+
+def time_call(func, repeat: int) -> tuple[float, object]:
+    timings = []
+    result = None
+
+    for _ in range(repeat):
+        start = perf_counter()
+        result = func()
+        timings.append(perf_counter() - start)
+
+    return median(timings), result
+
+
+@app.command('circumstances')
+def bench_circumstances(
+    pdf_dir: Path = typer.Option(..., '--pdf-dir', help="Directory of Form 3 PDFs"),
+    min_pages: int = typer.Option(10, '--min-pages'),
+    max_pages: int = typer.Option(20, '--max-pages'),
+    repeat: int = typer.Option(5, '--repeat'),
+):
+    pdfs = load_pdfs(pdf_dir, min_pages, max_pages)
+
+    if not pdfs:
+        print(f"No PDFs with {min_pages}-{max_pages} pages in {pdf_dir}")
+        raise typer.Exit(code=1)
+
+    total = 0.0
+
+    for path, pdf_bytes in pdfs:
+        def run():
+            # Fresh parser per run so the page geometry cache is rebuilt
+            parser = Form3PartIIIandIV(pdf_url=str(path))
+            parser.pdf_bytes = pdf_bytes
+            return parser.extract_circumstances()
+
+        elapsed, circumstances = time_call(run, repeat)
+        total += elapsed
+
+        print(f"{path.name}: {elapsed * 1000:.1f} ms, {len(circumstances)} circumstances")
+
+    print(f"Total (median per file): {total * 1000:.1f} ms over {len(pdfs)} PDFs")
+
+
+@app.command('routing')
+def bench_routing(
+    pdf_dir: Path = typer.Option(..., '--pdf-dir', help="Directory of stored filing PDFs"),
+    repeat: int = typer.Option(3, '--repeat'),
+):
+    import fitz
+
+    pdfs = load_pdfs(pdf_dir)
+
+    if not pdfs:
+        print(f"No PDFs in {pdf_dir}")
+        raise typer.Exit(code=1)
+
+    full_text_total = 0.0
+    detect_total = 0.0
+    mismatches = []
+
+    def route(pdf_bytes, select):
+        with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+            return select(doc)
+
+    for path, pdf_bytes in pdfs:
+        full_text_elapsed, expected = time_call(
+            lambda: route(pdf_bytes, RouterFormParser.select_parser_class_full_text), repeat
+        )
+        detect_elapsed, detected = time_call(
+            lambda: route(pdf_bytes, RouterFormParser.detect_parser_class), repeat
+        )
+
+        full_text_total += full_text_elapsed
+        detect_total += detect_elapsed
+
+        if expected is not detected:
+            mismatches.append((path.name, expected, detected))
+
+    print(f"Full text: {full_text_total * 1000:.1f} ms, detect: {detect_total * 1000:.1f} ms over {len(pdfs)} PDFs")
+
+    for name, expected, detected in mismatches:
+        print(
+            f"MISMATCH {name}: full text -> {getattr(expected, '__name__', None)}, "
+            f"detect -> {getattr(detected, '__name__', None)}"
+        )
+
+    if mismatches:
+        raise typer.Exit(code=1)
+
+    print("Routing matches full-text detection on all PDFs")
+
+
+@app.command('share-tables')
+def bench_share_tables(
+    pdf_dir: Path = typer.Option(..., '--pdf-dir', help="Directory of stored filing PDFs"),
+    repeat: int = typer.Option(3, '--repeat'),
+):
+    pdfs = load_pdfs(pdf_dir)
+
+    if not pdfs:
+        print(f"No PDFs in {pdf_dir}")
+        raise typer.Exit(code=1)
+
+    full_scan_total = 0.0
+    targeted_total = 0.0
+    compared = 0
+    mismatches = []
+
+    for path, pdf_bytes in pdfs:
+        parser = RouterFormParser.get_parser(str(path), pdf_bytes)
+
+        if parser is None:
+            continue
+
+        parser.close()
+
+        def run(method_name):
+            # Fresh parser so the targeted path pays for its text blocks too
+            parser = RouterFormParser.get_parser(str(path), pdf_bytes)
+
+            try:
+                return getattr(parser, method_name)()
+
+            finally:
+                parser.close()
+
+        full_scan_elapsed, expected = time_call(lambda: run('extract_share_tables_full_scan'), repeat)
+        targeted_elapsed, actual = time_call(lambda: run('extract_share_tables_targeted'), repeat)
+
+        compared += 1
+        full_scan_total += full_scan_elapsed
+        targeted_total += targeted_elapsed
+
+        print(f"{path.name}: full scan {full_scan_elapsed * 1000:.1f} ms, targeted {targeted_elapsed * 1000:.1f} ms")
+
+        if expected != actual:
+            mismatches.append(path.name)
+
+    print(f"Full scan: {full_scan_total * 1000:.1f} ms, targeted: {targeted_total * 1000:.1f} ms")
+    print(f"Parity: {compared - len(mismatches)}/{compared} PDFs match the full scan")
+
+    for name in mismatches:
+        print(f"MISMATCH {name}: targeted share tables differ from the full scan")
+
+    if mismatches:
+        raise typer.Exit(code=1)
+
+    print("Share tables match the full scan on all PDFs")
+
+
+def offline_http_get(url, *args, **kwargs):
+    raise RuntimeError(f"Network access during corpus benchmark: {url}")
+
+
+@contextmanager
+def count_pdf_calls(counter: Counter):
+    # Wrap the expensive pymupdf / pdfplumber entry points with call counters
+    import fitz
+    import pdfplumber
+    from pdfplumber.page import Page as PlumberPage
+
+    targets = [
+        (fitz, 'open', 'fitz.open'),
+        (fitz.Page, 'get_text', 'fitz.get_text'),
+        (fitz.Page, 'get_drawings', 'fitz.get_drawings'),
+        (fitz.Page, 'search_for', 'fitz.search_for'),
+        (pdfplumber, 'open', 'pdfplumber.open'),
+        (PlumberPage, 'extract_tables', 'pdfplumber.extract_tables'),
+    ]
+
+    def counted(name, func):
+        def wrapper(*args, **kwargs):
+            counter[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    patches = [
+        mock.patch.object(owner, attribute, counted(name, getattr(owner, attribute)))
+        for owner, attribute, name in targets
+    ]
+
+    for patch in patches:
+        patch.start()
+
+    try:
+        yield counter
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
+
+
+def normalise_records(records: list[dict]) -> list[dict]:
+    return json.loads(json.dumps(records, ensure_ascii=False, default=str))
+
+
+@app.command('corpus')
+def bench_corpus(
+    pdf_dir: Path = typer.Option(..., '--pdf-dir', help="Directory of stored filing PDFs"),
+    golden_dir: Path = typer.Option(None, '--golden-dir', help="Golden JSON directory, defaults to <pdf-dir>/golden"),
+    report_path: Path = typer.Option(None, '--report', help="Report JSON path"),
+    update_golden: bool = typer.Option(False, '--update-golden', help="Overwrite golden JSON with the current output"),
+):
+    """
+    Run the deterministic parse stage (no LLM fallback, no network) over a
+    stored corpus and diff the records against golden JSON.
+
+    Peak memory is the Python heap from tracemalloc, MuPDF's own allocations
+    are not included.
+    """
+    pdfs = load_pdfs(pdf_dir)
+
+    if not pdfs:
+        print(f"No PDFs in {pdf_dir}")
+        raise typer.Exit(code=1)
+
+    golden_dir = golden_dir or pdf_dir / 'golden'
+    golden_dir.mkdir(parents=True, exist_ok=True)
+
+    files = []
+    per_form = defaultdict(lambda: {
+        'files': 0,
+        'records': 0,
+        'wall_ms': [],
+        'peak_kib': 0.0,
+        'calls': Counter(),
+        'mismatches': 0,
+    })
+
+    with mock.patch.object(HTTPCLIENT, 'get', offline_http_get):
+        for path, pdf_bytes in pdfs:
+            counter = Counter()
+            error = None
+            parsed = None
+
+            tracemalloc.start()
+            start = perf_counter()
+
+            try:
+                with count_pdf_calls(counter):
+                    parsed = parse_filing_pdf(str(path), pdf_bytes)
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+
+            wall_ms = (perf_counter() - start) * 1000
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            output = {
+                'form': parsed.form if parsed else None,
+                'records': normalise_records(parsed.records) if parsed else [],
+                'error': error,
+            }
+
+            golden_path = golden_dir / f"{path.stem}.json"
+            status = 'match'
+
+            if update_golden or not golden_path.exists():
+                golden_path.write_text(json.dumps(output, ensure_ascii=False, indent=2), encoding='utf-8')
+                status = 'updated' if update_golden else 'created'
+            elif json.loads(golden_path.read_text(encoding='utf-8')) != output:
+                status = 'mismatch'
+
+            form = output['form'] or 'unsupported'
+            stats = per_form[form]
+            stats['files'] += 1
+            stats['records'] += len(output['records'])
+            stats['wall_ms'].append(wall_ms)
+            stats['peak_kib'] = max(stats['peak_kib'], peak / 1024)
+            stats['calls'].update(counter)
+            stats['mismatches'] += status == 'mismatch'
+
+            files.append({
+                'file': path.name,
+                'form': form,
+                'status': status,
+                'records': len(output['records']),
+                'wall_ms': round(wall_ms, 2),
+                'peak_kib': round(peak / 1024, 1),
+                'calls': dict(counter),
+                'error': error,
+            })
+
+            print(f"{path.name}: {form} {status} {wall_ms:.1f} ms, {len(output['records'])} records")
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'pdf_dir': str(pdf_dir),
+        'forms': {
+            form: {
+                'files': stats['files'],
+                'records': stats['records'],
+                'wall_ms_total': round(sum(stats['wall_ms']), 2),
+                'wall_ms_median': round(median(stats['wall_ms']), 2),
+                'peak_kib_max': round(stats['peak_kib'], 1),
+                'calls': dict(stats['calls']),
+                'mismatches': stats['mismatches'],
+            }
+            for form, stats in per_form.items()
+        },
+        'files': files,
+    }
+
+    if report_path is None:
+        BENCHMARK_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        report_path = BENCHMARK_OUTPUT_DIR / f"corpus_{datetime.now():%Y%m%d_%H%M%S}.json"
+
+    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    for form, summary in report['forms'].items():
+        print(
+            f"{form}: {summary['files']} files, {summary['wall_ms_total']:.1f} ms, "
+            f"peak {summary['peak_kib_max']:.0f} KiB, {summary['mismatches']} mismatches"
+        )
+
+    print(f"Report written to {report_path}")
+
+    if any(summary['mismatches'] for summary in report['forms'].values()):
+        raise typer.Exit(code=1)
+
+
+@app.command('html-sections')
+def bench_html_sections(
+    html_dir: Path = typer.Option(..., '--html-dir', help="Directory of saved links.sgx.com detail pages"),
+    repeat: int = typer.Option(5, '--repeat'),
+):
+    from bs4 import BeautifulSoup
+
+    pages = [
+        (path, path.read_text(encoding='utf-8'))
+        for path in sorted(html_dir.glob('*.htm*'))
+    ]
+
+    if not pages:
+        print(f"No HTML pages in {html_dir}")
+        raise typer.Exit(code=1)
+
+    legacy_total = 0.0
+    single_pass_total = 0.0
+    mismatches = []
+
+    for path, html in pages:
+        titles = [
+            h2.string.strip()
+            for h2 in BeautifulSoup(html, 'html.parser').find_all('h2', class_='announcement-group-header')
+            if h2.string
+        ]
+
+        def legacy():
+            # One full-document search per section title on html.parser
+            soup = BeautifulSoup(html, 'html.parser')
+            return {title: extract_section_data(soup, title) for title in titles}
+
+        def single_pass():
+            return parse_announcement_sections(make_soup(html))
+
+        legacy_elapsed, expected = time_call(legacy, repeat)
+        single_pass_elapsed, actual = time_call(single_pass, repeat)
+
+        legacy_total += legacy_elapsed
+        single_pass_total += single_pass_elapsed
+
+        if expected != actual:
+            mismatches.append(path.name)
+
+    print(
+        f"Legacy: {legacy_total * 1000:.1f} ms, single pass: {single_pass_total * 1000:.1f} ms "
+        f"over {len(pages)} pages"
+    )
+
+    for name in mismatches:
+        print(f"MISMATCH {name}: single-pass sections differ from extract_section_data")
+
+    if mismatches:
+        raise typer.Exit(code=1)
+
+
+def peak_memory(func) -> tuple[int, object]:
+    tracemalloc.start()
+
+    try:
+        result = func()
+        return tracemalloc.get_traced_memory()[1], result
+
+    finally:
+        tracemalloc.stop()
+
+
+@app.command('pdf-budget')
+def bench_pdf_budget(
+    pdf_dir: Path = typer.Option(..., '--pdf-dir', help="Directory of long circulars / minutes PDFs"),
+    min_pages: int = typer.Option(30, '--min-pages'),
+    max_chars: int = typer.Option(30000, '--max-chars', help="Budget, MAX_DOCUMENT_CHARS of the callers"),
+    repeat: int = typer.Option(3, '--repeat'),
+):
+    import re
+
+    from sgx_scraper.utils.pdf_helper import extract_pdf_text
+
+    pdfs = load_pdfs(pdf_dir, min_pages)
+
+    if not pdfs:
+        print(f"No PDFs with at least {min_pages} pages in {pdf_dir}")
+        raise typer.Exit(code=1)
+
+    def normalise(text: str) -> str:
+        return re.sub(r"\s+", " ", text).strip()[:max_chars]
+
+    full_total = budget_total = 0.0
+    full_peak = budget_peak = 0
+    mismatches = []
+
+    for path, pdf_bytes in pdfs:
+        full_elapsed, full_text = time_call(lambda: extract_pdf_text(pdf_bytes), repeat)
+        budget_elapsed, budget_text = time_call(lambda: extract_pdf_text(pdf_bytes, max_chars), repeat)
+
+        file_full_peak, _ = peak_memory(lambda: extract_pdf_text(pdf_bytes))
+        file_budget_peak, _ = peak_memory(lambda: extract_pdf_text(pdf_bytes, max_chars))
+
+        full_total += full_elapsed
+        budget_total += budget_elapsed
+        full_peak = max(full_peak, file_full_peak)
+        budget_peak = max(budget_peak, file_budget_peak)
+
+        # what the LLM prompt receives must not change
+        if normalise(full_text) != normalise(budget_text):
+            mismatches.append(path.name)
+
+        print(
+            f"{path.name}: full {full_elapsed * 1000:.1f} ms / {file_full_peak / 1024:.0f} KiB, "
+            f"budget {budget_elapsed * 1000:.1f} ms / {file_budget_peak / 1024:.0f} KiB"
+        )
+
+    print(
+        f"Full: {full_total * 1000:.1f} ms, peak {full_peak / 1024:.0f} KiB | "
+        f"budget {max_chars}: {budget_total * 1000:.1f} ms, peak {budget_peak / 1024:.0f} KiB "
+        f"over {len(pdfs)} PDFs"
+    )
+
+    for name in mismatches:
+        print(f"MISMATCH {name}: budgeted text differs within the first {max_chars} chars")
+
+    if mismatches:
+        raise typer.Exit(code=1)
+
+
+# Heavy stacks that must stay out of the CLI entry point, each pipeline
+# imports its own on demand
+CLI_FORBIDDEN_IMPORTS = [
+    'seleniumwire2',
+    'selenium',
+    'webdriver_manager',
+    'mitmproxy',
+    'langchain_core',
+    'pdfplumber',
+    'fitz',
+    'pandas',
+    'yfinance',
+    'boto3',
+    'supabase',
+]
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    # 'import time: self [us] | cumulative | imported package' -> cumulative us
+    cumulative = {}
+
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+
+        _, cumulative_us, module = line[len('import time:'):].split('|')
+        cumulative[module.strip()] = int(cumulative_us)
+
+    return cumulative
+
+
+@app.command('import-time')
+def bench_import_time(
+    module: str = typer.Option('sgx_scraper.main_cli', '--module', help="Module to import"),
+    max_ms: float = typer.Option(None, '--max-ms', help="Fail when the import takes longer"),
+    top: int = typer.Option(15, '--top', help="Slowest imports to print"),
+):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else f"Importing {module} failed")
+        raise typer.Exit(code=1)
+
+    cumulative = parse_importtime(result.stderr)
+    total_ms = cumulative.get(module, 0) / 1000
+
+    for name, elapsed_us in sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"{elapsed_us / 1000:9.1f} ms  {name}")
+
+    print(f"import {module}: {total_ms:.1f} ms")
+
+    failed = False
+
+    if module == 'sgx_scraper.main_cli':
+        leaked = [
+            name for name in CLI_FORBIDDEN_IMPORTS
+            if name in cumulative
+        ]
+
+        if leaked:
+            print(f"Heavy modules imported by the CLI entry point: {', '.join(leaked)}")
+            failed = True
+
+    if max_ms is not None and total_ms > max_ms:
+        print(f"Import took {total_ms:.1f} ms, budget is {max_ms:.1f} ms")
+        failed = True
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
+if __name__ == '__main__':
+    app()
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from sgx_scraper.config.settings import SUPABASE_CLIENT
+from sgx_scraper.config.settings import get_supabase_client
 
 import json 
 import re 
@@ -21,7 +21,7 @@ def convert_to_kebab(sub_sector: str):
 def get_sgx_companies():
     try:
         response = (
-            SUPABASE_CLIENT
+            get_supabase_client()
             .table('sgx_companies')
             .select(
                 'name,' 
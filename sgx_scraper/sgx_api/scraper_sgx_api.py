@@ -1,21 +1,17 @@
 from curl_cffi import requests as cffi_requests
-from seleniumwire2 import webdriver
-from seleniumwire2 import SeleniumWireOptions
-from seleniumwire2 import ProxyConfig
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from urllib.parse import quote, urlencode
 
 from datetime import datetime, timedelta
-from typing import Iterator
+from typing import AsyncIterator, Iterator
 
 from sgx_scraper.config.settings import PROXY
 from sgx_scraper.utils.date_helper import normalize_datetime
+from sgx_scraper.utils.http_client import HTTPCLIENT, resolve_proxies
+from sgx_scraper.utils.async_http_client import ASYNC_HTTPCLIENT, AsyncHttpClient
+from sgx_scraper.utils.instrumentation import span, tracked_sleep, atracked_sleep
 
 import requests
+import asyncio
 import json
 import time
 import random
@@ -25,7 +21,14 @@ import logging
 LOGGER = logging.getLogger(__name__)
 
 
-def get_wire_driver(is_headless: bool = True, proxy: str | None = None) -> webdriver.Chrome:
+def get_wire_driver(is_headless: bool = True, proxy: str | None = None) -> 'webdriver.Chrome':
+    # selenium-wire pulls in mitmproxy, only import it when a browser is needed
+    from seleniumwire2 import webdriver
+    from seleniumwire2 import SeleniumWireOptions
+    from seleniumwire2 import ProxyConfig
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
     options = webdriver.ChromeOptions()
 
     if is_headless:
@@ -99,6 +102,10 @@ def get_wire_driver(is_headless: bool = True, proxy: str | None = None) -> webdr
 
 
 def get_auth(proxy: str | None = PROXY) -> dict[str, str] | None:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     headers = {
         'accept': '*/*',
         'accept-language': 'en-US,en;q=0.9',
@@ -133,7 +140,7 @@ def get_auth(proxy: str | None = PROXY) -> dict[str, str] | None:
         LOGGER.info(f"Page loaded successfully. Title: {driver.title}")
 
         LOGGER.info("Waiting for JavaScript to execute...")
-        time.sleep(8)
+        tracked_sleep(8)
 
         # Interact with page
         try:
@@ -142,7 +149,7 @@ def get_auth(proxy: str | None = PROXY) -> dict[str, str] | None:
 
             # Scroll
             driver.execute_script("window.scrollTo(0, 500);")
-            time.sleep(2)
+            tracked_sleep(2)
 
         except Exception as error:
             LOGGER.warning(f"Interaction warning: {error}")
@@ -190,6 +197,11 @@ def get_auth(proxy: str | None = PROXY) -> dict[str, str] | None:
 
 
 def get_auth_with_retry(proxy=None, attempts=3):
+    if HTTPCLIENT.offline:
+        # recorded API responses are replayed by URL, no browser auth needed
+        LOGGER.info("[get_auth] offline replay, skipping browser auth")
+        return {'authorizationtoken': 'offline'}
+
     for attempt in range(1, attempts + 1):
         headers = get_auth(proxy=proxy)
 
@@ -197,12 +209,46 @@ def get_auth_with_retry(proxy=None, attempts=3):
             return headers
 
         LOGGER.warning("[get_auth] attempt %d/%d failed, retrying", attempt, attempts)
-        time.sleep(random.uniform(3, 8))
+        tracked_sleep(random.uniform(3, 8))
 
     LOGGER.error("[get_auth] all %d attempts failed", attempts)
     return None
 
 
+def fetch_api_response(api_url: str, headers: dict[str, str], proxies: dict[str, str] | None):
+    if HTTPCLIENT.offline:
+        return HTTPCLIENT.replay(api_url)
+
+    # curl_cffi stays for the chrome TLS fingerprint api.sgx.com expects,
+    # proxy, metrics and recording still go through the shared client layer
+    start = time.perf_counter()
+
+    try:
+        response = cffi_requests.get(
+            api_url,
+            headers=headers,
+            proxies=proxies,
+            impersonate="chrome131",
+            verify=False if proxies else True,
+            timeout=30,
+        )
+
+    except Exception:
+        HTTPCLIENT.observe(api_url, time.perf_counter() - start, is_error=True)
+        raise
+
+    HTTPCLIENT.observe(
+        api_url,
+        time.perf_counter() - start,
+        bytes_received=len(response.content),
+        is_error=response.status_code >= 400,
+    )
+
+    HTTPCLIENT.remember(api_url, response)
+
+    return response
+
+
 def run_scrape_api(
     api_url: str, 
     flag_log: str,
@@ -212,32 +258,12 @@ def run_scrape_api(
     if not headers:
         raise ValueError("Cannot fetch API, headers are missing.")
 
-    if is_proxy: 
-        proxy = PROXY 
-
-    else: 
-        proxy = None 
-
-    proxies = None
-
-    if proxy:
-        proxies = {
-            'http': proxy,
-            'https': proxy,
-        }
+    proxies = resolve_proxies(is_proxy)
     
     try:
         LOGGER.info(f"Fetching data from API {flag_log}...")
 
-        response = cffi_requests.get(
-            api_url,
-            headers=headers,
-            proxies=proxies,
-            impersonate="chrome131",
-            verify=False if proxy else True,
-            timeout=30,
-        )
-
+        response = fetch_api_response(api_url, headers, proxies)
         response.raise_for_status()
         
         LOGGER.info(f"Response status: {response.status_code}")
@@ -264,6 +290,52 @@ def run_scrape_api(
         return None
 
 
+API_URL = "https://api.sgx.com/announcements/v1.1/"
+
+
+def resolve_period(period_start: str | None, period_end: str | None) -> tuple[str, str]:
+    today = datetime.now()
+    yesterday = today - timedelta(days=2)
+
+    start_date_source = period_start if period_start is not None else yesterday
+    end_date_source = period_end if period_end is not None else today
+
+    return normalize_datetime(start_date_source), normalize_datetime(end_date_source)
+
+
+def build_announcements_url(
+    normalized_start: str,
+    normalized_end: str,
+    sub_category: str,
+    page_start: int,
+    page_size: int,
+    category: str = "ANNC",
+    company: str | None = None,
+) -> str:
+    if company:
+        query_parameters = {
+            "periodstart": f"{normalized_start}_160000",
+            "periodend": f"{normalized_end}_155959",
+            "cat": category,
+            "sub": sub_category,
+            "value": company,
+            "exactsearch": "true",
+            "pagestart": page_start,
+            "pagesize": page_size,
+        }
+
+        query_string = urlencode(query_parameters, quote_via=quote)
+        return f"{API_URL}company?{query_string}"
+
+    return (
+        f"{API_URL}?periodstart={normalized_start}_160000"
+        f"&periodend={normalized_end}_155959"
+        f"&cat={category}&sub={sub_category}"
+        f"&pagestart={page_start}"
+        f"&pagesize={page_size}"
+    )
+
+
 def iter_sgx_announcements(
     sub_category: str,
     flag_log: str,
@@ -283,17 +355,10 @@ def iter_sgx_announcements(
     """
     logger = logging.getLogger(__name__)
 
-    api_url = "https://api.sgx.com/announcements/v1.1/"
-    headers = get_auth_with_retry(proxy=None)
-
-    today = datetime.now()
-    yesterday = today - timedelta(days=2)
-
-    start_date_source = period_start if period_start is not None else yesterday
-    end_date_source = period_end if period_end is not None else today
+    with span('sgx_api.auth'):
+        headers = get_auth_with_retry(proxy=None)
 
-    normalized_start = normalize_datetime(start_date_source)
-    normalized_end = normalize_datetime(end_date_source)
+    normalized_start, normalized_end = resolve_period(period_start, period_end)
 
     logger.info(f"Start scraping from start date: {normalized_start} to {normalized_end}")
 
@@ -303,37 +368,24 @@ def iter_sgx_announcements(
         logger.info(f'page_start: {page_start}')
 
         try:
-            if company:
-                query_parameters = {
-                    "periodstart": f"{normalized_start}_160000",
-                    "periodend": f"{normalized_end}_155959",
-                    "cat": category,
-                    "sub": sub_category,
-                    "value": company,
-                    "exactsearch": "true",
-                    "pagestart": page_start,
-                    "pagesize": page_size,
-                }
-
-                query_string = urlencode(query_parameters, quote_via=quote)
-                url = f"{api_url}company?{query_string}"
+            url = build_announcements_url(
+                normalized_start,
+                normalized_end,
+                sub_category,
+                page_start,
+                page_size,
+                category=category,
+                company=company,
+            )
 
-            else:
-                url = (
-                    f"{api_url}?periodstart={normalized_start}_160000"
-                    f"&periodend={normalized_end}_155959"
-                    f"&cat={category}&sub={sub_category}"
-                    f"&pagestart={page_start}"
-                    f"&pagesize={page_size}"
+            with span('sgx_api.page'):
+                announcements = run_scrape_api(
+                    api_url=url,
+                    flag_log=flag_log,
+                    headers=headers,
+                    is_proxy=is_proxy
                 )
 
-            announcements = run_scrape_api(
-                api_url=url,
-                flag_log=flag_log,
-                headers=headers,
-                is_proxy=is_proxy
-            )
-
             if not announcements:
                 logger.info("No more announcements found, stopping pagination.")
                 break
@@ -345,7 +397,103 @@ def iter_sgx_announcements(
         yield from announcements
 
         page_start += 1
-        time.sleep(random.uniform(1.5, 8.9))
+        tracked_sleep(random.uniform(1.5, 8.9), stage='sgx_api.throttle')
+
+
+async def arun_scrape_api(
+    api_url: str,
+    flag_log: str,
+    headers: dict[str, str] | None,
+    is_proxy: bool,
+    client: AsyncHttpClient = ASYNC_HTTPCLIENT,
+) -> list[dict] | None:
+    if not headers:
+        raise ValueError("Cannot fetch API, headers are missing.")
+
+    LOGGER.info(f"Fetching data from API {flag_log}...")
+
+    response = await client.get(api_url, headers=headers, is_proxy=is_proxy, timeout=30)
+    response.raise_for_status()
+
+    try:
+        data = response.json()
+
+    except json.JSONDecodeError as error:
+        LOGGER.error(f"JSON decode error: {error}")
+        LOGGER.error(f"Response text: {response.text}")
+        return None
+
+    if data.get('data') is None:
+        LOGGER.warning("WARNING: API returned None")
+        return []
+
+    LOGGER.info(f"Fetched {len(data.get('data', []))} announcements")
+
+    return data.get('data', [])
+
+
+async def aiter_sgx_announcements(
+    sub_category: str,
+    flag_log: str,
+    period_start: str | None = None,
+    period_end: str | None = None,
+    page_size: int = 20,
+    is_proxy: bool | None = None,
+    category: str = "ANNC",
+    company: str | None = None,
+    client: AsyncHttpClient = ASYNC_HTTPCLIENT,
+) -> AsyncIterator[dict]:
+    """
+    Async generator counterpart of `iter_sgx_announcements`.
+
+    Auth still drives a browser, so it runs in a worker thread, pages are then
+    fetched on the event loop through the shared AsyncHttpClient.
+    """
+    with span('sgx_api.auth'):
+        headers = await asyncio.to_thread(get_auth_with_retry, proxy=None)
+
+    normalized_start, normalized_end = resolve_period(period_start, period_end)
+
+    LOGGER.info(f"Start scraping from start date: {normalized_start} to {normalized_end}")
+
+    page_start = 0
+
+    while True:
+        LOGGER.info(f'page_start: {page_start}')
+
+        try:
+            url = build_announcements_url(
+                normalized_start,
+                normalized_end,
+                sub_category,
+                page_start,
+                page_size,
+                category=category,
+                company=company,
+            )
+
+            with span('sgx_api.page'):
+                announcements = await arun_scrape_api(
+                    api_url=url,
+                    flag_log=flag_log,
+                    headers=headers,
+                    is_proxy=is_proxy,
+                    client=client,
+                )
+
+            if not announcements:
+                LOGGER.info("No more announcements found, stopping pagination.")
+                break
+
+        except Exception as error:
+            LOGGER.error(f'[{flag_log}] Fatal API error on page {page_start}: {error}', exc_info=True)
+            raise
+
+        for announcement in announcements:
+            yield announcement
+
+        page_start += 1
+        await atracked_sleep(random.uniform(1.5, 8.9), stage='sgx_api.throttle')
         
 
 if __name__ == '__main__':
@@ -6,9 +6,9 @@ from sgx_scraper.track_management.utils.helper import (
     parse_appointment_date,
 )
 from sgx_scraper.utils.constant import HEADERS
+from sgx_scraper.utils.http_client import HTTPCLIENT
 
 import logging
-import requests
 
 
 LOGGER = logging.getLogger(__name__)
@@ -17,7 +17,7 @@ LOGGER = logging.getLogger(__name__)
 def get_appointment(api_response: dict) -> dict | None:
     url = api_response.get("url", "")
 
-    response = requests.get(url, headers=HEADERS)
+    response = HTTPCLIENT.get(url, headers=HEADERS)
     response.raise_for_status()
 
     soup = BeautifulSoup(response.text, "html.parser")
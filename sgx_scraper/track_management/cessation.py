@@ -1,13 +1,13 @@
 from bs4 import BeautifulSoup 
 
 from sgx_scraper.utils.constant import HEADERS
+from sgx_scraper.utils.http_client import HTTPCLIENT
 from sgx_scraper.track_management.utils.helper import (
     extract_field, 
     extract_symbol, 
     parse_appointment_date
 )
 
-import requests
 import logging
 
 
@@ -16,7 +16,7 @@ LOGGER = logging.getLogger(__name__)
 
 def get_cessation(api_response: dict) -> dict | None:
     url = api_response.get('url', '')
-    response = requests.get(url, headers=HEADERS)
+    response = HTTPCLIENT.get(url, headers=HEADERS)
     response.raise_for_status()
 
     soup = BeautifulSoup(response.text, 'html.parser')
@@ -1,13 +1,15 @@
 from sgx_scraper.sgx_api.scraper_sgx_api import iter_sgx_announcements
 from sgx_scraper.utils.cli_helper import upsert_to_db, get_100_top_companies
 from sgx_scraper.track_management.tracking import (
+    build_management_index,
     consolidate_management_records,
     get_management_update,
+    is_tracked_announcement,
 )
+from sgx_scraper.utils.instrumentation import tracked_sleep
 
 import typer
 import logging
-import time
 import random
 
 
@@ -26,7 +28,7 @@ def run_tracking_management(
 
     payload_management = []
 
-    top_100_companies = get_100_top_companies()
+    management_index = build_management_index(get_100_top_companies())
 
     announcements = iter_sgx_announcements(
         sub_category="ANNC03%2CANNC04",
@@ -38,13 +40,16 @@ def run_tracking_management(
     )
 
     for announcement in announcements:
+        if not is_tracked_announcement(announcement, management_index):
+            continue
+
         try:
             updated_management_record = get_management_update(
                 api_response=announcement,
-                top_100_companies=top_100_companies
+                management_index=management_index
             )
 
-            time.sleep(random.uniform(1, 3))
+            tracked_sleep(random.uniform(1, 3), stage='management.throttle')
 
             if not updated_management_record:
                 continue
@@ -58,7 +63,9 @@ def run_tracking_management(
     payload_management = consolidate_management_records(payload_management)
 
     logger.info(f'total unique management payloads to upsert: {len(payload_management)}')
-    logger.info(f'payload management to upsert: {payload_management}')
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f'payload management to upsert: {payload_management}')
 
     if is_push_db:
         upsert_to_db(payload=payload_management, table_name='sgx_companies')
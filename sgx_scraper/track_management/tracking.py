@@ -1,14 +1,19 @@
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
 from sgx_scraper.track_management.appointment import get_appointment 
 from sgx_scraper.track_management.cessation import get_cessation
+from sgx_scraper.track_management.utils.helper import extract_symbol
 from sgx_scraper.utils.symbol_matching_helper import add_sgx_suffix
+from sgx_scraper.utils.instrumentation import timed
 
 import logging 
 
 
 LOGGER = logging.getLogger(__name__)
 
+# token_sort_ratio a departing officer's name must reach against the roster
+CESSATION_MATCH_CUTOFF = 88
+
 
 def consolidate_management_records(records: list[dict]) -> list[dict]:
     records_by_symbol = {}
@@ -28,7 +33,29 @@ def consolidate_management_records(records: list[dict]) -> list[dict]:
     return list(records_by_symbol.values())
 
 
-def get_management_update(api_response: dict, top_100_companies: list[dict]):
+def build_management_index(top_100_companies: list[dict]) -> dict[str, dict]:
+    # the ranking holds bare symbols, sgx_companies is keyed on '.SI'
+    return {
+        add_sgx_suffix(record.get('symbol')): record
+        for record in top_100_companies
+        if record.get('symbol')
+    }
+
+
+def is_tracked_announcement(api_response: dict, management_index: dict[str, dict]) -> bool:
+    # same symbol resolution the handlers do, but from the listing alone so
+    # announcements outside the top 100 are dropped before any page is fetched
+    symbol = extract_symbol(api_response.get('issuers') or [])
+
+    if symbol not in management_index:
+        LOGGER.info(f'announcement for symbol: {symbol} not in the top 100 companies')
+        return False
+
+    return True
+
+
+@timed('management.update')
+def get_management_update(api_response: dict, management_index: dict[str, dict]):
     registry = {
         'announcement of appointment': get_appointment, 
         'announcement of cessation': get_cessation
@@ -49,19 +76,13 @@ def get_management_update(api_response: dict, top_100_companies: list[dict]):
         )
         return None
 
-    # the top-100 CSV holds bare symbols, sgx_companies is keyed on '.SI'
-    db_symbols = {
-        add_sgx_suffix(record.get('symbol')): record 
-        for record in top_100_companies
-    }
-
     symbol = announcement.get('symbol')
 
-    if symbol not in db_symbols:
+    if symbol not in management_index:
         LOGGER.info(f'announcement {category} for symbol: {symbol} not in the top 100 companies')
         return None  
 
-    db_management = db_symbols[symbol].get('management', [])
+    db_management = management_index[symbol].setdefault('management', [])
 
     if category == 'announcement of appointment':
         db_management.append({
@@ -74,18 +95,20 @@ def get_management_update(api_response: dict, top_100_companies: list[dict]):
         LOGGER.info(f'[appointment] added {announcement.get("name")} as {announcement.get("position")} for {symbol}')
 
     elif category == 'announcement of cessation':
-        matched = False
-
-        for record in db_management:
-            score = fuzz.token_sort_ratio(record.get('name', ''), announcement.get('name', ''))
+        match = process.extractOne(
+            announcement.get('name') or '',
+            [record.get('name') or '' for record in db_management],
+            scorer=fuzz.token_sort_ratio,
+            score_cutoff=CESSATION_MATCH_CUTOFF,
+        )
 
-            if score >= 88:
-                record['end_date'] = announcement.get('end_date')
-                LOGGER.info(f'[cessation] matched {announcement.get("name")} -> {record.get("name")} (score: {score}) for {symbol}')
-                matched = True
-                break
+        if match:
+            _, score, index = match
+            record = db_management[index]
+            record['end_date'] = announcement.get('end_date')
+            LOGGER.info(f'[cessation] matched {announcement.get("name")} -> {record.get("name")} (score: {score}) for {symbol}')
 
-        if not matched:
+        else:
             LOGGER.warning(f'[cessation] no match found for {announcement.get("name")} in {symbol} management')
 
     updated_record = [{
@@ -152,7 +175,7 @@ if __name__ == '__main__':
 
     ]
 
-    updated_management_record = get_management_update(api, db_management)
+    updated_management_record = get_management_update(api, build_management_index(db_management))
     print(updated_management_record)
 
 
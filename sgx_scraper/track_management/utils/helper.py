@@ -1,4 +1,5 @@
 from bs4 import BeautifulSoup
+from functools import lru_cache
 
 from sgx_scraper.utils.json_helper import open_json
 from sgx_scraper.utils.symbol_matching_helper import (
@@ -38,8 +39,14 @@ def parse_appointment_date(raw_date: str | None) -> str | None:
     return f'{year}-{month}-{day}'
 
 
+@lru_cache(maxsize=1)
+def load_sgx_companies():
+    # read once per run, every announcement resolves its symbol against it
+    return open_json('data/sgx_companies.json')
+
+
 def extract_symbol(issuers: list) -> str | None:
-    sgx_companies = open_json('data/sgx_companies.json')
+    sgx_companies = load_sgx_companies()
 
     for issuer in issuers:
         stock_code = issuer.get('stock_code')
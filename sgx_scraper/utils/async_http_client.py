@@ -0,0 +1,134 @@
+from curl_cffi.requests import AsyncSession
+from curl_cffi.requests.exceptions import RequestException
+from time import perf_counter
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary
+
+from sgx_scraper.utils.http_client import (
+    HTTPCLIENT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+    HOST_POOL_SIZES,
+    RETRY_STATUS_FORCELIST,
+    RETRY_TOTAL,
+    resolve_proxies,
+    retry_delay,
+)
+
+import asyncio
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Chrome fingerprint shared with run_scrape_api, api.sgx.com rejects plain clients
+IMPERSONATE = "chrome131"
+
+
+class AsyncHttpClient:
+    """
+    asyncio counterpart of HttpClient on curl_cffi's AsyncSession.
+
+    In-flight requests are capped per host with one semaphore each, sized from
+    HOST_POOL_SIZES, so hundreds of fetches can be scheduled on one thread
+    without flooding a host. Retry policy, timeout, proxy resolution and
+    per-host metrics, and offline replay / recording are shared with the sync
+    HTTPCLIENT.
+
+    The session and semaphores are bound to the loop they were created on, so
+    each running loop gets its own, `aclose` closes the current loop's.
+    """
+
+    def __init__(self, timeout: int = DEFAULT_TIMEOUT, impersonate: str = IMPERSONATE):
+        self.timeout = timeout
+        self.impersonate = impersonate
+        self._sessions: WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncSession] = WeakKeyDictionary()
+        self._semaphores: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+        ] = WeakKeyDictionary()
+
+    async def __aenter__(self) -> 'AsyncHttpClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _get_session(self) -> AsyncSession:
+        loop = asyncio.get_running_loop()
+
+        if loop not in self._sessions:
+            self._sessions[loop] = AsyncSession(
+                impersonate=self.impersonate,
+                max_clients=sum(HOST_POOL_SIZES.values()) + DEFAULT_POOL_SIZE,
+            )
+
+        return self._sessions[loop]
+
+    def _get_semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(HOST_POOL_SIZES.get(host, DEFAULT_POOL_SIZE))
+
+        return semaphores[host]
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        self._semaphores.pop(loop, None)
+
+        if session is not None:
+            await session.close()
+
+    async def get(self, url: str, is_proxy: bool | None = None, **kwargs):
+        if HTTPCLIENT.offline:
+            return HTTPCLIENT.replay(url, kwargs.get("params"))
+
+        timeout = kwargs.pop("timeout", self.timeout)
+        proxies = kwargs.pop("proxies", None) or resolve_proxies(is_proxy)
+
+        if proxies:
+            kwargs.setdefault("verify", False)
+
+        session = self._get_session()
+        semaphore = self._get_semaphore(urlsplit(url).hostname or 'unknown')
+
+        start = perf_counter()
+        retries = 0
+
+        while True:
+            response = None
+
+            try:
+                async with semaphore:
+                    response = await session.get(url, timeout=timeout, proxies=proxies, **kwargs)
+
+            # only transport errors (connect, reset, timeout) are retried,
+            # anything else is a bug or a caller error and surfaces at once
+            except RequestException:
+                if retries >= RETRY_TOTAL:
+                    HTTPCLIENT.observe(url, perf_counter() - start, retries=retries, is_error=True)
+                    raise
+
+            else:
+                if response.status_code not in RETRY_STATUS_FORCELIST or retries >= RETRY_TOTAL:
+                    break
+
+            retries += 1
+            # Back off outside the semaphore so other requests to the host proceed
+            await asyncio.sleep(retry_delay(retries, response.headers if response else None))
+
+        HTTPCLIENT.observe(
+            url,
+            perf_counter() - start,
+            bytes_received=len(response.content),
+            retries=retries,
+            is_error=response.status_code >= 400,
+        )
+
+        HTTPCLIENT.remember(url, response, kwargs.get("params"))
+
+        return response
+
+
+ASYNC_HTTPCLIENT = AsyncHttpClient()
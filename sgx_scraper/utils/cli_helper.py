@@ -1,20 +1,18 @@
-from pathlib import Path
-
-from sgx_scraper.config.settings import SUPABASE_CLIENT
+from sgx_scraper.config.settings import get_supabase_client
+from sgx_scraper.utils.company_ranking import load_company_ranking
+from sgx_scraper.utils.constant import COMPANY_RANKING_SIZE
 from sgx_scraper.utils.json_helper import open_json
-from sgx_scraper.utils.symbol_matching_helper import (
-    lookup_company_by_symbol,
-    strip_sgx_suffix,
-)
+from sgx_scraper.utils.instrumentation import timed
+from sgx_scraper.utils.run_mode import skip_offline
+from sgx_scraper.utils.symbol_matching_helper import lookup_company_by_symbol
 
-import csv
-import pandas as pd
 import logging
 
 
 LOGGER = logging.getLogger(__name__)
 
 
+@timed('db.push')
 def push_to_db(
     payload: list[dict[str]],
     table_name: str,
@@ -24,6 +22,9 @@ def push_to_db(
         LOGGER.info(f'[payload] is empty, skipping push to DB')
         return
 
+    if skip_offline(f'push of {len(payload)} records to {table_name}'):
+        return False
+
     try:
         is_succes = False
 
@@ -39,7 +40,7 @@ def push_to_db(
         ]
 
         response = (
-            SUPABASE_CLIENT
+            get_supabase_client()
             .table(table_name)
             .insert(payload)
             .execute()
@@ -60,104 +61,74 @@ def push_to_db(
         raise
 
 
-def remove_duplicate(path_today: str, path_yesterday: str) -> list[dict]:
-    sgx_today_datas = open_json(path_today)
-    sgx_yesterday_datas = open_json(path_yesterday) 
+def split_by_rank(clean_payload: list[dict[str]], tiers: tuple[int, ...]) -> tuple:
+    """
+    Splits the payload into cumulative top-N tiers in one pass over the
+    shared company ranking, e.g. tiers (100, 200) -> (top_100, top_200, rest).
+    """
+    # tiers past COMPANY_RANKING_SIZE widen the ranking rather than cut it short
+    ranking = load_company_ranking(size=max(tiers))
+    in_tiers, outside = ranking.split_tiers(clean_payload, tiers)
 
-    if sgx_yesterday_datas is None or len(sgx_yesterday_datas) == 0:
-        LOGGER.info('Skip removing duplicate, sgx yesterday data is empty, returning sgx today')
-        return sgx_today_datas
-    
-    urls_yesterday = {
-        item.get("source") 
-        for item in sgx_yesterday_datas
-    }
+    for top_n, records in zip(tiers, in_tiers):
+        LOGGER.info("Length data top_%d: %d", top_n, len(records))
 
-    unique_data_today = [
-        item 
-        for item in sgx_today_datas
-        if item.get('source') not in urls_yesterday
-    ]
+    LOGGER.info("Length data not top_%d: %d", max(tiers), len(outside))
 
-    LOGGER.info(f'Length data after duplicate removing: {len(unique_data_today)}')
-    return unique_data_today
+    return (*in_tiers, outside)
 
 
 def filter_top_n_companies(clean_payload: list[dict[str]], top_n: int = 70) -> tuple:
-    try:
-        response = (
-            SUPABASE_CLIENT
-            .table('sgx_company_report')
-            .select('symbol, name, market_cap')
-            .not_.is_('market_cap', 'null')
-            .order('market_cap', desc=True)
-            .limit(top_n)
-            .execute()
-        )
-
-        if not response.data:
-            LOGGER.warning('Data sgx_companies not found')
-            return [], clean_payload
+    return split_by_rank(clean_payload, (top_n,))
 
-        top_companies = response.data
 
-        csv_path = Path(f"data/sgx_top_{top_n}_mcap_companies.csv")
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with csv_path.open('w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(
-                file, fieldnames=['symbol', 'name', 'market_cap']
-            )
-            writer.writeheader()
-            writer.writerows(top_companies)
+def listing_symbols(announcement: dict) -> list[str]:
+    return [
+        issuer.get('stock_code')
+        for issuer in announcement.get('issuers') or []
+        if issuer.get('stock_code')
+    ]
 
-        top_n_symbols = {
-            company['symbol'] 
-            for company in top_companies
-        }
 
-        top_n_payload = []
-        not_top_n_payload = []
+def is_outside_top_n(announcement: dict, top_n: int) -> bool:
+    """
+    Tier check from the listing record alone, before anything is downloaded.
+    Announcements without a stock code, or runs without a ranking, are never
+    treated as outside so they still go through the full parse.
+    """
+    symbols = listing_symbols(announcement)
+    ranking = load_company_ranking(size=top_n)
 
-        for payload in clean_payload:
-            # payload symbols may carry the '.SI' suffix, DB symbols never do
-            symbol = strip_sgx_suffix(payload.get('symbol'))
+    if not symbols or not ranking.companies:
+        return False
 
-            if symbol in top_n_symbols:
-                top_n_payload.append(payload)
+    ranks = [ranking.rank_of(symbol) for symbol in symbols]
 
-            else:
-                not_top_n_payload.append(payload)
+    return not any(rank is not None and rank <= top_n for rank in ranks)
 
-        LOGGER.info(
-            "Length data top_%d: %d | Length data not top_%d: %d",
-            top_n, len(top_n_payload), top_n, len(not_top_n_payload)
-        )
 
-        return top_n_payload, not_top_n_payload
-
-    except Exception as error:
-        LOGGER.error("[filter_top_n_companies] Error: %s", error, exc_info=True)
-        return [], []
+def build_listing_stub(announcement: dict) -> dict:
+    # what the not-top CSV gets for announcements whose PDF is never fetched
+    symbols = listing_symbols(announcement)
 
+    return {
+        'symbol': symbols[0] if symbols else None,
+        'issuer_name': announcement.get('issuer_name'),
+        'title': announcement.get('title'),
+        'submission_date': announcement.get('submission_date'),
+        'ref_id': announcement.get('ref_id'),
+        'url': announcement.get('url'),
+    }
 
-def get_top_companies(csv_path: str | Path) -> list[dict]:
-    csv_path = Path(csv_path)
-    
-    if not csv_path.exists():
-        LOGGER.warning("CSV not found: %s", csv_path)
-        return []
 
-    df_top_n = pd.read_csv(csv_path)
-    return df_top_n.to_dict(orient="records")
+def get_top_companies(top_n: int = COMPANY_RANKING_SIZE) -> list[dict]:
+    return load_company_ranking(size=top_n).top(top_n)
 
 
 def get_100_top_companies():
-    top_companies = get_top_companies(
-        "data/sgx_top_100_mcap_companies.csv"
-    )
+    top_companies = get_top_companies(100)
 
-    # The top-100 CSV intentionally contains only ranking data.  Management
+    # The ranking intentionally contains only ranking data.  Management
     # tracking needs the existing management list, so need to open from local list
     companies = open_json('data/sgx_companies.json')
     
@@ -172,6 +143,7 @@ def get_100_top_companies():
     return top_companies
 
 
+@timed('db.upsert')
 def upsert_to_db(
     payload: list[dict[str]],
     table_name: str,
@@ -182,6 +154,9 @@ def upsert_to_db(
         LOGGER.info('[payload] is empty, skipping upsert to DB')
         return False
 
+    if skip_offline(f'upsert of {len(payload)} records to {table_name}'):
+        return False
+
     exclude_columns = exclude_columns or set()
 
     payload = [
@@ -195,7 +170,7 @@ def upsert_to_db(
 
     try:
         response = (
-            SUPABASE_CLIENT
+            get_supabase_client()
             .table(table_name)
             .upsert(payload, **({'on_conflict': on_conflict} if on_conflict else {}))
             .execute()
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sgx_scraper.config.settings import get_supabase_client
+from sgx_scraper.utils.constant import (
+    COMPANY_RANKING_CSV_TIERS,
+    COMPANY_RANKING_PATH,
+    COMPANY_RANKING_SIZE,
+    COMPANY_RANKING_TTL_HOURS,
+)
+from sgx_scraper.utils.json_helper import open_json
+from sgx_scraper.utils.symbol_matching_helper import strip_sgx_suffix
+
+import csv
+import json
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Loaded once per process, every pipeline step shares the same ranking
+_RANKING: 'CompanyRanking | None' = None
+# widest size asked for so far, a ranking that could not be widened is not
+# re-queried on every lookup
+_REQUESTED_SIZE = 0
+
+
+class CompanyRanking:
+    """
+    Companies ordered by market cap, with a symbol -> rank map so a payload
+    can be split into any number of top-N tiers in one pass. `size` is the
+    number of companies the ranking was queried for, tiers wider than it
+    cannot be told apart from companies outside them.
+    """
+
+    def __init__(
+        self,
+        companies: list[dict],
+        fetched_at: datetime | None = None,
+        size: int = COMPANY_RANKING_SIZE,
+    ):
+        self.companies = companies
+        self.fetched_at = fetched_at
+        self.size = size
+        self._ranks = {
+            company['symbol']: rank
+            for rank, company in enumerate(companies, start=1)
+            if company.get('symbol')
+        }
+
+    def rank_of(self, symbol: str | None) -> int | None:
+        # payload symbols may carry the '.SI' suffix, DB symbols never do
+        return self._ranks.get(strip_sgx_suffix(symbol))
+
+    def top(self, top_n: int) -> list[dict]:
+        return [dict(company) for company in self.companies[:top_n]]
+
+    def split_tiers(
+        self,
+        payload: list[dict],
+        tiers: tuple[int, ...],
+    ) -> tuple[list[list[dict]], list[dict]]:
+        """
+        Returns one list per tier (cumulative, a top-100 record is also in the
+        top-200 list) and the records outside the widest tier.
+        """
+        in_tiers = [[] for _ in tiers]
+        outside = []
+        widest = max(tiers)
+
+        for record in payload:
+            rank = self.rank_of(record.get('symbol'))
+
+            if rank is None or rank > widest:
+                outside.append(record)
+                continue
+
+            for index, tier in enumerate(tiers):
+                if rank <= tier:
+                    in_tiers[index].append(record)
+
+        return in_tiers, outside
+
+
+def fetch_ranked_companies(size: int) -> list[dict]:
+    response = (
+        get_supabase_client()
+        .table('sgx_company_report')
+        .select('symbol, name, market_cap')
+        .not_.is_('market_cap', 'null')
+        .order('market_cap', desc=True)
+        .limit(size)
+        .execute()
+    )
+
+    return response.data or []
+
+
+def write_tier_csvs(companies: list[dict]) -> None:
+    # data/sgx_top_<n>_mcap_companies.csv are kept for the tools reading them
+    for top_n in COMPANY_RANKING_CSV_TIERS:
+        csv_path = Path(f"data/sgx_top_{top_n}_mcap_companies.csv")
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with csv_path.open('w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=['symbol', 'name', 'market_cap'])
+            writer.writeheader()
+            writer.writerows(companies[:top_n])
+
+
+def read_snapshot() -> tuple[list[dict], datetime | None, int]:
+    snapshot = open_json(COMPANY_RANKING_PATH)
+
+    if not isinstance(snapshot, dict):
+        # before the first snapshot, the widest tier CSV is the best stale copy
+        widest = max(COMPANY_RANKING_CSV_TIERS)
+        csv_path = Path(f"data/sgx_top_{widest}_mcap_companies.csv")
+
+        if not csv_path.exists():
+            return [], None, 0
+
+        with csv_path.open('r', newline='', encoding='utf-8') as file:
+            return list(csv.DictReader(file)), None, widest
+
+    return (
+        snapshot.get('companies') or [],
+        datetime.fromisoformat(snapshot['fetched_at']),
+        # snapshots written before the size was recorded
+        snapshot.get('size') or COMPANY_RANKING_SIZE,
+    )
+
+
+def write_snapshot(companies: list[dict], fetched_at: datetime, size: int) -> None:
+    COMPANY_RANKING_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    with COMPANY_RANKING_PATH.open('w', encoding='utf-8') as file:
+        json.dump(
+            {
+                'fetched_at': fetched_at.isoformat(timespec='seconds'),
+                'size': size,
+                'companies': companies,
+            },
+            file,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def load_company_ranking(is_refresh: bool = False, size: int = COMPANY_RANKING_SIZE) -> CompanyRanking:
+    """
+    Ranking of the top `size` companies by market cap, at least
+    COMPANY_RANKING_SIZE.
+
+    Served from the on-disk snapshot while it is younger than the TTL and
+    covers `size`, otherwise re-queried from Supabase. A stale or narrower
+    snapshot is still used when the query fails.
+    """
+    global _RANKING, _REQUESTED_SIZE
+
+    size = max(size, COMPANY_RANKING_SIZE)
+
+    if _RANKING is not None and max(_RANKING.size, _REQUESTED_SIZE) >= size and not is_refresh:
+        return _RANKING
+
+    _REQUESTED_SIZE = max(_REQUESTED_SIZE, size)
+
+    companies, fetched_at, snapshot_size = read_snapshot()
+    is_fresh = (
+        fetched_at is not None
+        and datetime.now() - fetched_at < timedelta(hours=COMPANY_RANKING_TTL_HOURS)
+    )
+
+    if companies and is_fresh and snapshot_size >= size and not is_refresh:
+        LOGGER.info(f"[company_ranking] Using snapshot from {fetched_at:%Y-%m-%d %H:%M}")
+        _RANKING = CompanyRanking(companies, fetched_at, snapshot_size)
+        return _RANKING
+
+    try:
+        fetched = fetch_ranked_companies(size)
+
+    except Exception as error:
+        LOGGER.error(f"[company_ranking] Failed fetching ranking: {error}", exc_info=True)
+        fetched = []
+
+    if fetched:
+        fetched_at = datetime.now()
+        companies = fetched
+        snapshot_size = size
+
+        write_snapshot(companies, fetched_at, size)
+        write_tier_csvs(companies)
+
+    elif companies:
+        LOGGER.warning(f"[company_ranking] Falling back to stale snapshot ({len(companies)} companies)")
+
+    else:
+        LOGGER.warning('Data sgx_companies not found')
+
+    if companies and snapshot_size < size:
+        LOGGER.warning(
+            f"[company_ranking] Only the top {snapshot_size} companies are ranked, "
+            f"top {size} tiers are cut short"
+        )
+
+    _RANKING = CompanyRanking(companies, fetched_at, snapshot_size)
+    return _RANKING
@@ -11,6 +11,7 @@ SGX_FILINGS_PATH_INSERTABLE = SGX_FILINGS_BASE_DIR / "sgx_filings_insertable.jso
 SGX_FILINGS_PATH_NOT_INSERTABLE = SGX_FILINGS_BASE_DIR / "sgx_filings_not_insertable.json"
 SGX_FILINGS_PATH_NOT_TOP_70 = SGX_FILINGS_BASE_DIR / "sgx_filings_not_top_70.csv"
 SGX_FILINGS_PATH_NOT_TOP_200 = SGX_FILINGS_BASE_DIR / "sgx_filings_not_top_200.csv"
+SGX_FILINGS_PATH_NOT_TOP_200_LISTING = SGX_FILINGS_BASE_DIR / "sgx_filings_not_top_200_listing.csv"
 SGX_FILINGS_PATH_TOP_100 = SGX_FILINGS_BASE_DIR / "sgx_filings_top_100.json"
 
 # SGX BUYBACKS
@@ -21,6 +22,7 @@ SGX_BUYBACKS_PATH_TODAY = SGX_BUYBACKS_BASE_DIR / "sgx_buybacks_today.json"
 SGX_BUYBACKS_PATH_YESTERDAY = SGX_BUYBACKS_BASE_DIR / "sgx_buybacks_yesterday.json"
 SGX_BUYBACKS_PATH_NOT_TOP_70 = SGX_BUYBACKS_BASE_DIR / "sgx_buybacks_not_top_70.csv"
 SGX_BUYBACKS_PATH_NOT_TOP_200 = SGX_BUYBACKS_BASE_DIR / "sgx_buybacks_not_top_200.csv"
+SGX_BUYBACKS_PATH_NOT_TOP_200_LISTING = SGX_BUYBACKS_BASE_DIR / "sgx_buybacks_not_top_200_listing.csv"
 
 # UPCOMING DIVIDEND
 SGX_UPCOMING_DIVIDEND_BASE_DIR = Path("data/scraper_output/sgx_upcoming_dividend")
@@ -29,9 +31,36 @@ SGX_UPCOMING_DIVIDEND_BASE_DIR.mkdir(parents=True, exist_ok=True)
 UPCOMING_DIVIDEND_NOT_TOP_200 = SGX_UPCOMING_DIVIDEND_BASE_DIR / "upcoming_dividend_not_top_200.csv"  
 UPCOMING_DIVIDEND_TOP_200 = SGX_UPCOMING_DIVIDEND_BASE_DIR / "upcoming_dividend_top_200.json"
 UPCOMING_DIVIDEND = SGX_UPCOMING_DIVIDEND_BASE_DIR / "upcoming_dividend.json"
+UPCOMING_DIVIDEND_STORE = SGX_UPCOMING_DIVIDEND_BASE_DIR / "upcoming_dividend_store.json"
 
 OUTPUT_DIR_SHAREHOLDERS = Path('data/scraper_output/shareholders')
 
+# COMPANY RANKING (market cap snapshot shared by the top-N filters)
+COMPANY_RANKING_PATH = Path("data/sgx_company_ranking.json")
+COMPANY_RANKING_SIZE = 200
+COMPANY_RANKING_TTL_HOURS = 12
+COMPANY_RANKING_CSV_TIERS = (100, 200)
+
+# DEDUP INDEX (ingested keys shared by the filings / buyback pipelines)
+DEDUP_INDEX_PATH = Path("data/scraper_output/dedup_index.json")
+DEDUP_TTL_DAYS = 30
+
+# HISTORY (append-only parquet of every pipeline's records)
+HISTORY_DIR = Path("data/scraper_output/history")
+
+# BENCHMARKS
+BENCHMARK_OUTPUT_DIR = Path("data/scraper_output/benchmarks")
+
+# RUN TIMINGS
+RUN_TIMINGS_DIR = Path("data/scraper_output/run_timings")
+
+# PROFILING / OFFLINE REPLAY
+PROFILES_DIR = Path("data/scraper_output/profiles")
+HTTP_REPLAY_DIR = Path("data/scraper_output/http_replay")
+
+# LLM ACCOUNTING
+LLM_USAGE_DIR = Path("data/scraper_output/llm_usage")
+
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 HEADERS = {
     "User-Agent": USER_AGENT,
@@ -73,13 +102,32 @@ MODEL_CONFIG = {
 
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
+# USD per million (prompt, completion) tokens, models missing here (the
+# openrouter :free ones included) are accounted at no cost
+LLM_PRICES_PER_MILLION = {
+    'gpt-oss-120b': (0.15, 0.75),
+    'gpt-oss-20b': (0.10, 0.50),
+}
+
 ROTATE_STATUS_CODES = {401, 403, 429, 413}
 
-# A pool of one key is exhausted by a single burst 429, so the pool is swept again.
+# A pool of one key is exhausted by a single burst 429, so each key gets this
+# many attempts per call. A 429 without reset headers cools the key down for
+# ROTATE_BACKOFF_SECONDS times its consecutive 429s (capped at the sweeps).
 ROTATE_MAX_SWEEPS = 3
 ROTATE_BACKOFF_SECONDS = 20
 
 LLM_TIMEOUT_SECONDS = 60
+
+# Calls in flight across every model and key, the rest wait on the LLM loop
+LLM_MAX_IN_FLIGHT = 8
+
+# Hedged calls fire the secondary model once the primary runs past its p95
+# latency, the default delay covers models with too few samples yet
+HEDGE_MIN_SAMPLES = 5
+HEDGE_DEFAULT_DELAY_SECONDS = 20
+HEDGE_MIN_DELAY_SECONDS = 2
+LLM_LATENCY_WINDOW = 200
 ABORT_STATUS_CODES = {400, 422, 500, 502, 503, 504}
 
 ROTATE_KEYWORDS = (
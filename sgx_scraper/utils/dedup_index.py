@@ -0,0 +1,114 @@
+from hashlib import sha1
+from pathlib import Path
+from time import time
+
+from sgx_scraper.utils.constant import DEDUP_INDEX_PATH, DEDUP_TTL_DAYS
+from sgx_scraper.utils.json_helper import open_json, write_json
+from sgx_scraper.utils.run_mode import skip_offline
+
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class DedupIndex:
+    """
+    Persistent record of already-ingested keys, shared by the pipelines.
+
+    Keys are fingerprinted and grouped per namespace ('filings', 'buybacks',
+    ...) with their insertion time, entries older than the TTL are dropped on
+    save. Kept as JSON next to the other pipeline state, so it is carried from
+    run to run by the same data commit as the AGM / REIT seen lists, and
+    loaded into dicts for O(1) membership checks however much history it holds.
+    """
+
+    def __init__(self, path: str | Path = DEDUP_INDEX_PATH, ttl_days: int = DEDUP_TTL_DAYS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 24 * 60 * 60
+        self._entries: dict[str, dict[str, int]] | None = None
+
+    @staticmethod
+    def fingerprint(key: str) -> str:
+        return sha1(str(key).encode('utf-8')).hexdigest()
+
+    def _namespace(self, namespace: str) -> dict[str, int]:
+        if self._entries is None:
+            stored = open_json(self.path)
+            self._entries = stored if isinstance(stored, dict) else {}
+
+        return self._entries.setdefault(namespace, {})
+
+    def is_empty(self, namespace: str) -> bool:
+        return not self._namespace(namespace)
+
+    def contains(self, namespace: str, key: str) -> bool:
+        return self.fingerprint(key) in self._namespace(namespace)
+
+    def add_many(self, namespace: str, keys) -> int:
+        entries = self._namespace(namespace)
+        now = int(time())
+        added = 0
+
+        for key in keys:
+            if key is None:
+                continue
+
+            fingerprint = self.fingerprint(key)
+
+            if fingerprint not in entries:
+                added += 1
+
+            entries[fingerprint] = now
+
+        return added
+
+    def filter_new(self, namespace: str, records: list[dict], key_field: str) -> list[dict]:
+        # Checked against the index as it was before this batch, so several
+        # records sharing one key (e.g. holders of one filing) are all kept
+        entries = self._namespace(namespace)
+
+        return [
+            record
+            for record in records
+            if self.fingerprint(record.get(key_field)) not in entries
+        ]
+
+    def bootstrap(self, namespace: str, path: str | Path, key_field: str) -> None:
+        # One-off seeding from the previous run's snapshot, so switching to the
+        # index does not re-push everything already in the DB
+        if not self.is_empty(namespace) or not Path(path).exists():
+            return
+
+        records = open_json(path) or []
+        added = self.add_many(namespace, (record.get(key_field) for record in records))
+
+        LOGGER.info(f"[DedupIndex] Seeded {namespace} with {added} keys from {path}")
+
+    def take_new(self, namespace: str, records: list[dict], key_field: str) -> list[dict]:
+        new_records = self.filter_new(namespace, records, key_field)
+        self.add_many(namespace, (record.get(key_field) for record in records))
+
+        LOGGER.info(
+            f"[DedupIndex] {namespace}: {len(new_records)} new of {len(records)} records"
+        )
+
+        return new_records
+
+    def save(self) -> None:
+        if self._entries is None or skip_offline('dedup index save'):
+            return
+
+        cutoff = int(time()) - self.ttl_seconds
+
+        self._entries = {
+            namespace: {
+                fingerprint: inserted_at
+                for fingerprint, inserted_at in entries.items()
+                if inserted_at >= cutoff
+            }
+            for namespace, entries in self._entries.items()
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(self.path, self._entries)
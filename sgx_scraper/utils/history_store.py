@@ -0,0 +1,169 @@
+from datetime import date, datetime
+from pathlib import Path
+from uuid import uuid4
+
+from sgx_scraper.utils.constant import HISTORY_DIR
+from sgx_scraper.utils.run_mode import skip_offline
+
+import json
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _to_column_value(value):
+    # nested payload fields (price ranges, mandates, ...) are kept as JSON
+    # text so every batch maps onto flat, evolvable columns
+    if isinstance(value, (dict, list, tuple, set)):
+        return json.dumps(list(value) if isinstance(value, set) else value, ensure_ascii=False, default=str)
+
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+
+    return value
+
+
+def _build_table(rows: list[dict], dataset: str):
+    import pyarrow as pa
+
+    # union of the keys of every row, from_pylist alone only takes the
+    # first row's keys and drops the rest
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    arrays = []
+
+    for column in columns:
+        values = [row.get(column) for row in rows]
+
+        try:
+            arrays.append(pa.array(values))
+
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # mixed types in one batch, kept as text rather than losing the batch
+            LOGGER.warning(f"[HistoryStore] {dataset}.{column} has mixed types, stored as string")
+            arrays.append(pa.array([None if value is None else str(value) for value in values], pa.string()))
+
+    return pa.Table.from_arrays(arrays, names=columns)
+
+
+class HistoryStore:
+    """
+    Append-only Parquet history of every record a pipeline produced.
+
+    Laid out as `<dataset>/date=YYYY-MM-DD/part-<time>-<id>.parquet`, one file
+    per appended batch. Each batch keeps its own schema, readers unify the
+    schemas so new or retyped columns never rewrite old files, and filter on
+    the date partition and `symbol` with predicate pushdown.
+
+    Needs pyarrow, without it appends and reads are skipped with a warning.
+    """
+
+    def __init__(self, root: str | Path = HISTORY_DIR):
+        self.root = Path(root)
+        self._warned = False
+
+    def _pyarrow(self):
+        try:
+            import pyarrow  # noqa: F401
+
+            return True
+
+        except ImportError:
+            if not self._warned:
+                LOGGER.warning("[HistoryStore] pyarrow is not installed, history is not recorded")
+                self._warned = True
+
+            return False
+
+    def append(
+        self,
+        dataset: str,
+        records: list[dict],
+        partition_date: date | None = None,
+    ) -> Path | None:
+        if not records or skip_offline(f'{dataset} history append') or not self._pyarrow():
+            return None
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        ingested_at = datetime.now()
+        partition_date = partition_date or ingested_at.date()
+
+        rows = [
+            {key: _to_column_value(value) for key, value in record.items()}
+            for record in records
+        ]
+
+        for row in rows:
+            row['ingested_at'] = ingested_at.isoformat(timespec='seconds')
+
+        partition_dir = self.root / dataset / f"date={partition_date.isoformat()}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+
+        path = partition_dir / f"part-{ingested_at:%H%M%S}-{uuid4().hex[:8]}.parquet"
+
+        try:
+            pq.write_table(_build_table(rows, dataset), path, compression='zstd')
+
+        except (pa.ArrowException, OSError) as error:
+            LOGGER.error(f"[HistoryStore] Failed writing {len(rows)} {dataset} records: {error}", exc_info=True)
+            return None
+
+        LOGGER.info(f"[HistoryStore] Appended {len(rows)} {dataset} records to {path}")
+
+        return path
+
+    def read(
+        self,
+        dataset: str,
+        symbols: list[str] | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        columns: list[str] | None = None,
+    ) -> list[dict]:
+        dataset_dir = self.root / dataset
+
+        if not dataset_dir.exists() or not self._pyarrow():
+            return []
+
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        files = sorted(str(path) for path in dataset_dir.rglob('*.parquet'))
+
+        if not files:
+            return []
+
+        schema = pa.unify_schemas(
+            [pq.read_schema(file) for file in files],
+            promote_options='permissive',
+        ).append(pa.field('date', pa.string()))
+
+        history = ds.dataset(
+            files,
+            schema=schema,
+            format='parquet',
+            partitioning=ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive'),
+            partition_base_dir=str(dataset_dir),
+        )
+
+        predicate = None
+
+        # ISO dates compare correctly as strings
+        if start is not None:
+            predicate = ds.field('date') >= start.isoformat()
+
+        if end is not None:
+            condition = ds.field('date') <= end.isoformat()
+            predicate = condition if predicate is None else predicate & condition
+
+        if symbols:
+            condition = ds.field('symbol').isin(list(symbols))
+            predicate = condition if predicate is None else predicate & condition
+
+        return history.to_table(columns=columns, filter=predicate).to_pylist()
+
+
+HISTORY_STORE = HistoryStore()
@@ -1,31 +1,309 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter, sleep
+from urllib.parse import urlsplit
+
 from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
 from urllib3.util.retry import Retry
 
+from sgx_scraper.config.settings import PROXY, HTTP2_ENABLED
+from sgx_scraper.utils.http_replay import ResponseStore, build_response, replay_url
+
 import requests
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Shared retry/backoff policy, used by the requests adapters and mirrored by
+# the HTTP/2 path which has no urllib3 Retry
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.8
+RETRY_STATUS_FORCELIST = frozenset([429, 500, 502, 503, 504])
+
+DEFAULT_TIMEOUT = 15
+
+# Connections kept per host, sized for the concurrent PDF / detail page fetches
+DEFAULT_POOL_SIZE = 10
+HOST_POOL_SIZES = {
+    'links.sgx.com': 32,
+    'api.sgx.com': 8,
+}
+
+# Upper bounds (seconds) of the per-host latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def build_retry() -> Retry:
+    return Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=RETRY_TOTAL,
+        status=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=list(RETRY_STATUS_FORCELIST),
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+
+
+def retry_delay(retries: int, headers=None) -> float:
+    """
+    Sleep before retry number `retries` for the transports without urllib3
+    Retry, a Retry-After header wins over the backoff as in `build_retry`.
+    """
+    backoff = RETRY_BACKOFF_FACTOR * (2 ** (retries - 1))
+    retry_after = headers.get('Retry-After') if headers else None
+
+    if not retry_after:
+        return backoff
+
+    try:
+        return build_retry().parse_retry_after(retry_after)
+
+    except InvalidHeader:
+        return backoff
+
+
+def resolve_proxies(is_proxy: bool | None) -> dict[str, str] | None:
+    # The one place the configured proxy is turned into request proxies
+    if not is_proxy or not PROXY:
+        return None
+
+    return {
+        'http': PROXY,
+        'https': PROXY,
+    }
+
+
+@dataclass
+class HostMetrics:
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes_received: int = 0
+    latency_total: float = 0.0
+    # one count per LATENCY_BUCKETS bound plus an overflow bucket
+    latency_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    def observe(self, elapsed: float, bytes_received: int, retries: int, is_error: bool) -> None:
+        self.requests += 1
+        self.errors += is_error
+        self.retries += retries
+        self.bytes_received += bytes_received
+        self.latency_total += elapsed
+        self.latency_histogram[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def as_dict(self) -> dict[str, any]:
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes_received': self.bytes_received,
+            'latency_avg': round(self.latency_total / self.requests, 4) if self.requests else None,
+            'latency_histogram': dict(zip(labels, self.latency_histogram)),
+        }
 
 
 class HttpClient:
-    def __init__(self, timeout: int = 15):
+    """
+    Shared HTTP client for every pipeline.
+
+    One session with a connection pool per host (HOST_POOL_SIZES), the shared
+    retry policy and default timeout, proxy resolution through
+    `resolve_proxies`, and per-host request metrics. With `http2=True` and
+    httpx (with h2) installed, requests go over HTTP/2 instead, returning
+    requests responses and raising requests exceptions all the same.
+
+    `configure_replay` switches on recording of responses to a ResponseStore
+    (`record=True`) or serving every request from it (`offline=True`).
+    """
+
+    def __init__(self, timeout: int = DEFAULT_TIMEOUT, http2: bool = False):
         self.timeout = timeout
         self.session = requests.Session()
-        retry = Retry(
-            total=3,
-            connect=3,
-            read=3,
-            status=3,
-            backoff_factor=0.8,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=frozenset(["GET"]),
-            raise_on_status=False,
-            respect_retry_after_header=True,
-        )
-        adapter = HTTPAdapter(max_retries=retry)
+        self.metrics: dict[str, HostMetrics] = {}
+        self._metrics_lock = Lock()
+
+        self.offline = False
+        self.record = False
+        self.replay_store: ResponseStore | None = None
+
+        for host, pool_size in HOST_POOL_SIZES.items():
+            adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=build_retry())
+            self.session.mount(f"https://{host}", adapter)
+
+        adapter = HTTPAdapter(pool_maxsize=DEFAULT_POOL_SIZE, max_retries=build_retry())
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
 
-    def get(self, url: str, **kwargs):
+        self._http2_client = self._build_http2_client() if http2 else None
+
+    def _build_http2_client(self):
+        try:
+            import httpx
+            import h2  # noqa: F401
+
+        except ImportError:
+            LOGGER.warning("[HttpClient] httpx[http2] is not installed, staying on HTTP/1.1")
+            return None
+
+        return httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=max(HOST_POOL_SIZES.values())),
+            transport=httpx.HTTPTransport(http2=True, retries=RETRY_TOTAL),
+            follow_redirects=True,
+        )
+
+    def observe(
+        self,
+        url: str,
+        elapsed: float,
+        bytes_received: int = 0,
+        retries: int = 0,
+        is_error: bool = False,
+    ) -> None:
+        host = urlsplit(url).hostname or 'unknown'
+
+        with self._metrics_lock:
+            self.metrics.setdefault(host, HostMetrics()).observe(
+                elapsed, bytes_received, retries, is_error
+            )
+
+    def metrics_summary(self) -> dict[str, dict[str, any]]:
+        with self._metrics_lock:
+            return {
+                host: metrics.as_dict()
+                for host, metrics in sorted(self.metrics.items())
+            }
+
+    def log_metrics(self) -> None:
+        for host, summary in self.metrics_summary().items():
+            LOGGER.info(
+                "[HttpClient] %s: %d requests, %d errors, %d retries, %d bytes, avg %ss, histogram %s",
+                host,
+                summary['requests'],
+                summary['errors'],
+                summary['retries'],
+                summary['bytes_received'],
+                summary['latency_avg'],
+                summary['latency_histogram'],
+            )
+
+    def configure_replay(
+        self,
+        offline: bool = False,
+        record: bool = False,
+        store: ResponseStore | None = None,
+    ) -> None:
+        self.offline = offline
+        self.record = record
+        self.replay_store = (store or ResponseStore()) if offline or record else None
+
+    def replay(self, url: str, params=None):
+        response = self.replay_store.load(replay_url(url, params))
+
+        if response is None:
+            self.observe(url, 0.0, is_error=True)
+            raise requests.ConnectionError(f"[HttpClient] offline, no recorded response for {url}")
+
+        self.observe(
+            url,
+            0.0,
+            bytes_received=len(response.content),
+            is_error=response.status_code >= 400,
+        )
+
+        return response
+
+    def remember(self, url: str, response, params=None) -> None:
+        # error responses are not recorded, a replay should see the good run
+        if not self.record or response.status_code >= 400:
+            return
+
+        self.replay_store.save(
+            replay_url(url, params), response.status_code, response.headers, response.content
+        )
+
+    def get(self, url: str, is_proxy: bool | None = None, **kwargs):
+        if self.offline:
+            return self.replay(url, kwargs.get("params"))
+
         timeout = kwargs.pop("timeout", self.timeout)
-        return self.session.get(url, timeout=timeout, **kwargs)
+        proxies = kwargs.pop("proxies", None) or resolve_proxies(is_proxy)
+
+        if self._http2_client is not None and proxies is None:
+            return self._get_http2(url, timeout=timeout, **kwargs)
+
+        start = perf_counter()
+
+        try:
+            response = self.session.get(url, timeout=timeout, proxies=proxies, **kwargs)
+
+        except requests.RequestException:
+            self.observe(url, perf_counter() - start, is_error=True)
+            raise
+
+        retry_state = getattr(response.raw, 'retries', None)
+        retries = len(retry_state.history) if retry_state is not None else 0
+
+        self.observe(
+            url,
+            perf_counter() - start,
+            bytes_received=len(response.content),
+            retries=retries,
+            is_error=response.status_code >= 400,
+        )
+
+        self.remember(url, response, kwargs.get("params"))
+
+        return response
+
+    def _get_http2(self, url: str, timeout: int, **kwargs):
+        import httpx
+
+        start = perf_counter()
+        retries = 0
+
+        while True:
+            try:
+                response = self._http2_client.get(url, timeout=timeout, **kwargs)
+
+            except httpx.HTTPError as error:
+                self.observe(url, perf_counter() - start, retries=retries, is_error=True)
+
+                # callers handle requests.RequestException, keep the transport a drop-in
+                if isinstance(error, httpx.TimeoutException):
+                    raise requests.Timeout(str(error)) from error
+
+                raise requests.ConnectionError(str(error)) from error
+
+            if response.status_code not in RETRY_STATUS_FORCELIST or retries >= RETRY_TOTAL:
+                break
+
+            retries += 1
+            sleep(retry_delay(retries, response.headers))
+
+        self.observe(
+            url,
+            perf_counter() - start,
+            bytes_received=len(response.content),
+            retries=retries,
+            is_error=response.status_code >= 400,
+        )
+
+        response = build_response(str(response.url), response.status_code, response.headers, response.content)
+
+        self.remember(url, response, kwargs.get("params"))
+
+        return response
 
 
-HTTPCLIENT = HttpClient()
+HTTPCLIENT = HttpClient(http2=HTTP2_ENABLED)
@@ -0,0 +1,83 @@
+from hashlib import sha1
+from http import HTTPStatus
+from pathlib import Path
+
+from sgx_scraper.utils.constant import HTTP_REPLAY_DIR
+
+import requests
+import json
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ResponseStore:
+    """
+    On-disk store of raw HTTP responses keyed by URL, query params included
+    (see `replay_url`).
+
+    Filled by `--record-http` runs and read back by `--offline` runs, so a
+    pipeline can be replayed (and profiled) without touching SGX. Each response
+    is kept as `<sha1(url)>.json` (url, status, headers) next to
+    `<sha1(url)>.body` (raw bytes).
+    """
+
+    def __init__(self, directory: Path = HTTP_REPLAY_DIR):
+        self.directory = Path(directory)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = sha1(url.encode('utf-8')).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def save(self, url: str, status_code: int, headers: dict[str, str], content: bytes) -> None:
+        meta_path, body_path = self._paths(url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        body_path.write_bytes(content)
+
+        with meta_path.open('w', encoding='utf-8') as file:
+            json.dump(
+                {'url': url, 'status_code': status_code, 'headers': dict(headers)},
+                file,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+    def load(self, url: str) -> requests.Response | None:
+        meta_path, body_path = self._paths(url)
+
+        if not meta_path.exists() or not body_path.exists():
+            return None
+
+        with meta_path.open('r', encoding='utf-8') as file:
+            meta = json.load(file)
+
+        return build_response(meta['url'], meta['status_code'], meta['headers'], body_path.read_bytes())
+
+
+def replay_url(url: str, params=None) -> str:
+    # requests differing only in `params` must not share one recording
+    if not params:
+        return url
+
+    return requests.Request('GET', url, params=params).prepare().url
+
+
+def build_response(url: str, status_code: int, headers, content: bytes) -> requests.Response:
+    # a plain requests.Response so .json()/.text/.raise_for_status() behave
+    # the same for callers of the requests, HTTP/2 and curl_cffi paths
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.headers.update(headers)
+    response._content = content
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+
+    try:
+        response.reason = HTTPStatus(status_code).phrase
+
+    except ValueError:
+        response.reason = None
+
+    return response
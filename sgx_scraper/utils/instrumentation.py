@@ -0,0 +1,196 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+
+from sgx_scraper.utils.constant import RUN_TIMINGS_DIR
+
+import json
+import logging
+import math
+import time
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Innermost open span, deliberate sleeps are charged to it
+_CURRENT_STAGE: ContextVar[str | None] = ContextVar('current_stage', default=None)
+
+# Off for offline replays, throttling cached responses only hides the hot paths
+_SLEEP_ENABLED = True
+
+
+@dataclass
+class StageStats:
+    durations: list[float] = field(default_factory=list)
+    sleep_seconds: float = 0.0
+
+    def summary(self) -> dict[str, any]:
+        durations = sorted(self.durations)
+
+        return {
+            'count': len(durations),
+            'total_s': round(sum(durations), 4),
+            'p50_s': round(percentile(durations, 50), 4),
+            'p95_s': round(percentile(durations, 95), 4),
+            'sleep_s': round(self.sleep_seconds, 4),
+        }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+
+    # nearest-rank on the sorted durations
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+class RunRecorder:
+    """
+    Per-run timings keyed by stage name ('sgx_api.page', 'filings.parse',
+    'llm.gpt-oss-120b', ...). Spans may be opened from worker threads, the
+    recorder is shared process-wide.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.stages: dict[str, StageStats] = {}
+        self.started_at = datetime.now()
+
+    def record(self, stage: str, elapsed: float) -> None:
+        with self._lock:
+            self.stages.setdefault(stage, StageStats()).durations.append(elapsed)
+
+    def record_sleep(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages.setdefault(stage, StageStats()).sleep_seconds += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages = {}
+            self.started_at = datetime.now()
+
+    def summary(self) -> dict[str, dict[str, any]]:
+        with self._lock:
+            return {
+                stage: stats.summary()
+                for stage, stats in sorted(self.stages.items())
+            }
+
+
+RECORDER = RunRecorder()
+
+
+@contextmanager
+def span(stage: str):
+    token = _CURRENT_STAGE.set(stage)
+    start = perf_counter()
+
+    try:
+        yield
+
+    finally:
+        RECORDER.record(stage, perf_counter() - start)
+        _CURRENT_STAGE.reset(token)
+
+
+def timed(stage: str):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_span(stage: str, elapsed: float) -> None:
+    # For work timed elsewhere, e.g. parses that ran in a worker process
+    RECORDER.record(stage, elapsed)
+
+
+def current_stage() -> str | None:
+    return _CURRENT_STAGE.get()
+
+
+def set_sleep_enabled(enabled: bool) -> None:
+    global _SLEEP_ENABLED
+    _SLEEP_ENABLED = enabled
+
+
+def tracked_sleep(seconds: float, stage: str | None = None) -> None:
+    # time.sleep reported as sleep time of `stage`, or of the enclosing span
+    if not _SLEEP_ENABLED:
+        return
+
+    RECORDER.record_sleep(stage or _CURRENT_STAGE.get() or 'unscoped', seconds)
+    time.sleep(seconds)
+
+
+async def atracked_sleep(seconds: float, stage: str | None = None) -> None:
+    import asyncio
+
+    if not _SLEEP_ENABLED:
+        return
+
+    RECORDER.record_sleep(stage or _CURRENT_STAGE.get() or 'unscoped', seconds)
+    await asyncio.sleep(seconds)
+
+
+def log_run_report(command_name: str | None) -> None:
+    summary = RECORDER.summary()
+
+    if not summary:
+        return
+
+    LOGGER.info("[timings] %s stage breakdown", command_name or 'run')
+    LOGGER.info("[timings] %-40s %6s %10s %9s %9s %9s", 'stage', 'count', 'total_s', 'p50_s', 'p95_s', 'sleep_s')
+
+    for stage, stats in summary.items():
+        LOGGER.info(
+            "[timings] %-40s %6d %10.2f %9.3f %9.3f %9.2f",
+            stage,
+            stats['count'],
+            stats['total_s'],
+            stats['p50_s'],
+            stats['p95_s'],
+            stats['sleep_s'],
+        )
+
+
+def write_run_report(command_name: str | None) -> str | None:
+    summary = RECORDER.summary()
+
+    if not summary:
+        return None
+
+    RUN_TIMINGS_DIR.mkdir(parents=True, exist_ok=True)
+
+    finished_at = datetime.now()
+    path = RUN_TIMINGS_DIR / f"{command_name or 'run'}_{finished_at:%Y%m%d_%H%M%S}.json"
+
+    report = {
+        'command': command_name,
+        'started_at': RECORDER.started_at.isoformat(timespec='seconds'),
+        'finished_at': finished_at.isoformat(timespec='seconds'),
+        'wall_s': round((finished_at - RECORDER.started_at).total_seconds(), 2),
+        'stages': summary,
+    }
+
+    with path.open('w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+
+    LOGGER.info(f"[timings] Saved run timings to {path}")
+
+    return str(path)
+
+
+def emit_run_report(command_name: str | None) -> None:
+    log_run_report(command_name)
+    write_run_report(command_name)
@@ -1,6 +1,7 @@
 from pathlib import Path
 
-import pandas as pd
+from sgx_scraper.utils.run_mode import skip_offline
+
 import logging
 import json
 import re
@@ -34,9 +35,12 @@ def write_json(path: str, payload: list[dict[str, any]]):
 
 
 def write_to_csv(path: str, payload: list[dict[str]]):
+    import pandas as pd
+
     df = pd.DataFrame(payload)
 
-    if df.empty:
+    # the CSVs are appended to across runs, a replay must not add to them
+    if df.empty or skip_offline(f'append of {len(df)} rows to {path}'):
         return
 
     path = Path(path)
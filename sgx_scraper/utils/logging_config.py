@@ -0,0 +1,183 @@
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
+
+from sgx_scraper.config.settings import LOG_LEVEL
+from sgx_scraper.utils.instrumentation import current_stage
+
+import atexit
+import copy
+import json
+import logging
+import multiprocessing
+import sys
+
+
+LOG_FILE = "scraper.log"
+LOG_FILE_MAX_BYTES = 20 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
+CONSOLE_FORMAT = '%(asctime)s [%(levelname)s] %(name)s - %(message)s'
+CONSOLE_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# suppress noisy third-party loggers
+NOISY_LOGGERS = ('WDM', 'seleniumwire2', 'mitmproxy', 'urllib3', 'httpx')
+
+_LISTENER: QueueListener | None = None
+
+# Records of process pool workers, drained into the same handlers
+_WORKER_QUEUE = None
+_WORKER_LISTENER: QueueListener | None = None
+
+
+class StageFilter(logging.Filter):
+    """Tags each record with the open instrumentation span, if any."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Runs in the emitting thread, the span contextvar is gone by the
+        # time the listener thread formats the record
+        record.stage = current_stage()
+        return True
+
+
+class ExcTextQueueHandler(QueueHandler):
+    """QueueHandler keeping the traceback in `exc_text` instead of the message."""
+
+    _EXC_FORMATTER = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare formats the traceback into the message and drops
+        # exc_info, the file handler then cannot log it as its own field.
+        # exc_info holds the traceback object and cannot cross a process queue,
+        # the formatted text can
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._EXC_FORMATTER.formatException(record.exc_info)
+
+        record.exc_info = None
+
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for the rotating log file."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'stage': getattr(record, 'stage', None),
+            'message': record.getMessage(),
+        }
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+
+        if record.stack_info:
+            entry['stack_info'] = self.formatStack(record.stack_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(level: str = LOG_LEVEL) -> None:
+    """
+    Configures logging for the whole application.
+
+    Loggers only put records on a queue, a QueueListener thread does the
+    console and file I/O: plain text on stdout, JSON lines in a rotating
+    scraper.log. The listener is flushed and stopped at exit.
+    """
+    global _LISTENER
+
+    if _LISTENER is not None:
+        return
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT, datefmt=CONSOLE_DATE_FORMAT))
+
+    file_handler = RotatingFileHandler(
+        LOG_FILE,
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+        encoding='utf-8',
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = SimpleQueue()
+    queue_handler = ExcTextQueueHandler(log_queue)
+    queue_handler.addFilter(StageFilter())
+
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+    root.addHandler(queue_handler)
+
+    _LISTENER = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _LISTENER.start()
+    atexit.register(stop_logging)
+
+    for name in NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def worker_log_queue():
+    """
+    multiprocessing queue for the records of pool workers, served by a
+    listener on the console and file handlers of `setup_logging`. Pass it to
+    the pool initializer `init_worker_logging`.
+    """
+    global _WORKER_QUEUE, _WORKER_LISTENER
+
+    if _WORKER_QUEUE is None:
+        handlers = _LISTENER.handlers if _LISTENER is not None else (logging.StreamHandler(sys.stdout),)
+
+        _WORKER_QUEUE = multiprocessing.Queue()
+        _WORKER_LISTENER = QueueListener(_WORKER_QUEUE, *handlers, respect_handler_level=True)
+        _WORKER_LISTENER.start()
+
+    return _WORKER_QUEUE
+
+
+def init_worker_logging(log_queue, level: str = LOG_LEVEL) -> None:
+    # A forked worker inherits a QueueHandler on the parent's in-process
+    # queue that nothing drains, re-point the root logger at the shared queue
+    queue_handler = ExcTextQueueHandler(log_queue)
+    queue_handler.addFilter(StageFilter())
+
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+    root.addHandler(queue_handler)
+
+    for name in NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def stop_logging() -> None:
+    global _LISTENER, _WORKER_QUEUE, _WORKER_LISTENER
+
+    if _WORKER_LISTENER is not None:
+        _WORKER_LISTENER.stop()
+        _WORKER_LISTENER = None
+        _WORKER_QUEUE = None
+
+    if _LISTENER is None:
+        return
+
+    _LISTENER.stop()
+    _LISTENER = None
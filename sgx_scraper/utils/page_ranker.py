@@ -0,0 +1,107 @@
+from collections import Counter
+
+import math
+import re
+
+
+# BM25 defaults, pages of one document are short and similar in length
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# How much more than the prompt budget is read before ranking, so pages past
+# the first budget's worth can still be picked
+SCAN_BUDGET_FACTOR = 4
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9$%]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def bm25_scores(pages: list[str], keywords: tuple[str, ...]) -> list[float]:
+    """BM25 score of every page against the keyword terms, pages as documents."""
+    page_terms = [Counter(tokenize(page)) for page in pages]
+    query_terms = {term for keyword in keywords for term in tokenize(keyword)}
+
+    page_lengths = [sum(terms.values()) for terms in page_terms]
+    average_length = (sum(page_lengths) / len(page_lengths)) or 1.0
+
+    idf = {}
+
+    for term in query_terms:
+        frequency = sum(1 for terms in page_terms if term in terms)
+        idf[term] = math.log((len(pages) - frequency + 0.5) / (frequency + 0.5) + 1)
+
+    scores = []
+
+    for terms, length in zip(page_terms, page_lengths):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+
+        scores.append(sum(
+            idf[term] * terms[term] * (BM25_K1 + 1) / (terms[term] + norm)
+            for term in query_terms
+            if terms[term]
+        ))
+
+    return scores
+
+
+def pack_relevant_documents(
+    documents: list[list[str]],
+    keywords: tuple[str, ...],
+    max_chars: int,
+    lead_pages: int = 1,
+) -> str:
+    """
+    Whitespace-collapsed text of the pages that best match `keywords` across
+    `documents` (one page list per attachment), packed into `max_chars` and
+    put back in document order. The first `lead_pages` of every document
+    (cover, parties, dates) are always kept. Documents that fit are returned
+    whole.
+    """
+    texts = []
+    leads = set()
+
+    for pages in documents:
+        document_texts = [" ".join(page.split()) for page in pages]
+        document_texts = [text for text in document_texts if text]
+
+        leads.update(range(len(texts), len(texts) + min(lead_pages, len(document_texts))))
+        texts.extend(document_texts)
+
+    if sum(len(text) + 1 for text in texts) <= max_chars:
+        return " ".join(texts)
+
+    scores = bm25_scores(texts, keywords)
+
+    # lead pages first, then by score, ties keep document order
+    ranked = sorted(
+        range(len(texts)),
+        key=lambda index: (index not in leads, -scores[index], index),
+    )
+
+    selected = []
+    remaining = max_chars
+
+    for index in ranked:
+        if len(texts[index]) + 1 > remaining:
+            continue
+
+        selected.append(index)
+        remaining -= len(texts[index]) + 1
+
+    if not selected:
+        return texts[ranked[0]][:max_chars]
+
+    return " ".join(texts[index] for index in sorted(selected))
+
+
+def pack_relevant_pages(
+    pages: list[str],
+    keywords: tuple[str, ...],
+    max_chars: int,
+    lead_pages: int = 1,
+) -> str:
+    """`pack_relevant_documents` over the pages of a single document."""
+    return pack_relevant_documents([pages], keywords, max_chars, lead_pages)
@@ -1,7 +1,9 @@
 from bs4 import BeautifulSoup
+from typing import Iterator
 
 from sgx_scraper.utils.http_client import HTTPCLIENT
 
+import asyncio
 import fitz
 import logging
 
@@ -11,11 +13,8 @@ LOGGER = logging.getLogger(__name__)
 SGX_BASE = "https://links.sgx.com"
 
 
-def resolve_attachments(detail_url: str) -> list[tuple[str, str]]:
-    response = HTTPCLIENT.get(detail_url)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.text, "html.parser")
+def parse_attachments(html: str) -> list[tuple[str, str]]:
+    soup = BeautifulSoup(html, "html.parser")
 
     return [
         (anchor.get_text(strip=True), SGX_BASE + anchor["href"])
@@ -24,20 +23,148 @@ def resolve_attachments(detail_url: str) -> list[tuple[str, str]]:
     ]
 
 
-def extract_pdf_text(pdf_bytes: bytes) -> str:
+def resolve_attachments(detail_url: str) -> list[tuple[str, str]]:
+    response = HTTPCLIENT.get(detail_url)
+    response.raise_for_status()
+
+    return parse_attachments(response.text)
+
+
+def default_async_client(client: 'AsyncHttpClient | None') -> 'AsyncHttpClient':
+    # curl_cffi's async session is only loaded by async callers, sync callers
+    # of this module never import it
+    if client is not None:
+        return client
+
+    from sgx_scraper.utils.async_http_client import ASYNC_HTTPCLIENT
+
+    return ASYNC_HTTPCLIENT
+
+
+async def aresolve_attachments(
+    detail_url: str,
+    client: 'AsyncHttpClient | None' = None,
+) -> list[tuple[str, str]]:
+    response = await default_async_client(client).get(detail_url)
+    response.raise_for_status()
+
+    return parse_attachments(response.text)
+
+
+def iter_pdf_pages(pdf_bytes: bytes, max_chars: int | None = None) -> Iterator[str]:
+    """
+    Yields page texts lazily, pages past the point where `max_chars` are
+    collected are never loaded. The budget counts whitespace-collapsed text,
+    as callers normalise before truncating.
+    """
+    collected = 0
+
     with fitz.open(stream=pdf_bytes, filetype="pdf") as document:
-        return "\n".join(page.get_text() for page in document)
+        for page in document:
+            text = page.get_text()
+            yield text
+
+            if max_chars is None:
+                continue
+
+            collected += len(" ".join(text.split())) + 1
+
+            if collected >= max_chars:
+                return
 
 
-def read_pdf(url: str, flag_log: str, **kwargs) -> str:
+def extract_pdf_text(pdf_bytes: bytes, max_chars: int | None = None) -> str:
+    return "\n".join(iter_pdf_pages(pdf_bytes, max_chars))
+
+
+def read_pdf_pages(url: str, flag_log: str, max_chars: int | None = None, **kwargs) -> list[str]:
     try:
         content = HTTPCLIENT.get(url, timeout=90, **kwargs).content
 
         if content[:4] != b"%PDF":
-            return ""
+            return []
+
+        return list(iter_pdf_pages(content, max_chars))
+
+    except Exception as error:
+        LOGGER.warning(f"[{flag_log}] Failed reading {url}: {error}")
+        return []
+
+
+def read_pdf(url: str, flag_log: str, max_chars: int | None = None, **kwargs) -> str:
+    return "\n".join(read_pdf_pages(url, flag_log, max_chars, **kwargs))
+
+
+async def aread_pdf_pages(
+    url: str,
+    flag_log: str,
+    client: 'AsyncHttpClient | None' = None,
+    max_chars: int | None = None,
+    **kwargs,
+) -> list[str]:
+    try:
+        response = await default_async_client(client).get(url, timeout=90, **kwargs)
+        content = response.content
+
+        if content[:4] != b"%PDF":
+            return []
 
-        return extract_pdf_text(content)
+        # Text extraction is CPU-bound, keep it off the event loop
+        return await asyncio.to_thread(lambda: list(iter_pdf_pages(content, max_chars)))
 
     except Exception as error:
         LOGGER.warning(f"[{flag_log}] Failed reading {url}: {error}")
-        return ""
+        return []
+
+
+async def aread_pdf(
+    url: str,
+    flag_log: str,
+    client: 'AsyncHttpClient | None' = None,
+    max_chars: int | None = None,
+    **kwargs,
+) -> str:
+    return "\n".join(await aread_pdf_pages(url, flag_log, client, max_chars, **kwargs))
+
+
+async def aread_pdfs_pages(
+    urls: list[str],
+    flag_log: str,
+    client: 'AsyncHttpClient | None' = None,
+    **kwargs,
+) -> list[list[str]]:
+    """`read_pdfs_pages` for callers already on an event loop."""
+    return list(await asyncio.gather(
+        *(aread_pdf_pages(url, flag_log, client, **kwargs) for url in urls)
+    ))
+
+
+def read_pdfs_pages(urls: list[str], flag_log: str, **kwargs) -> list[list[str]]:
+    """
+    `read_pdf_pages` over several attachments concurrently, returned in the
+    order of `urls` so callers can join them as if read one by one. The
+    downloads overlap on one event loop, capped per host by AsyncHttpClient.
+    """
+    if len(urls) <= 1:
+        return [read_pdf_pages(url, flag_log, **kwargs) for url in urls]
+
+    try:
+        asyncio.get_running_loop()
+
+    except RuntimeError:
+        pass
+
+    else:
+        raise RuntimeError("read_pdfs_pages blocks, await aread_pdfs_pages on a running loop")
+
+    from sgx_scraper.utils.async_http_client import AsyncHttpClient
+
+    async def read_all() -> list[list[str]]:
+        async with AsyncHttpClient() as client:
+            return await aread_pdfs_pages(urls, flag_log, client, **kwargs)
+
+    return asyncio.run(read_all())
+
+
+def read_pdfs(urls: list[str], flag_log: str, **kwargs) -> list[str]:
+    return ["\n".join(pages) for pages in read_pdfs_pages(urls, flag_log, **kwargs)]
@@ -0,0 +1,97 @@
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from threading import Event, Thread
+
+from sgx_scraper.utils.constant import PROFILES_DIR
+
+import cProfile
+import logging
+import sys
+import threading
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Interval of the stack sampler, 10ms keeps overhead low on multi-minute runs
+SAMPLE_INTERVAL = 0.01
+
+
+class StackSampler:
+    """
+    Samples the stack of one thread at a fixed interval and aggregates the
+    samples into folded stacks ("outer;inner;leaf count" per line), the input
+    format of flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+
+            if frame is None:
+                continue
+
+            frames = []
+
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+
+            self.stacks[';'.join(reversed(frames))] += 1
+
+    def write_folded(self, path: Path) -> None:
+        with path.open('w', encoding='utf-8') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+class ProfileSession:
+    """
+    Profiles one CLI run: cProfile (deterministic, per-function totals) plus
+    a StackSampler on the same thread for the flamegraph. Both outputs land in
+    PROFILES_DIR as `<command>_<timestamp>.prof` and `.folded`.
+    """
+
+    def __init__(self, command_name: str | None, output_dir: Path = PROFILES_DIR):
+        self.command_name = command_name or 'run'
+        self.output_dir = Path(output_dir)
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident())
+
+    def start(self) -> 'ProfileSession':
+        self.sampler.start()
+        self.profiler.enable()
+        return self
+
+    def stop(self) -> tuple[Path, Path]:
+        self.profiler.disable()
+        self.sampler.stop()
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.command_name}_{datetime.now():%Y%m%d_%H%M%S}"
+
+        prof_path = self.output_dir / f"{stem}.prof"
+        folded_path = self.output_dir / f"{stem}.folded"
+
+        self.profiler.dump_stats(prof_path)
+        self.sampler.write_folded(folded_path)
+
+        LOGGER.info(f"[profile] Saved cProfile stats to {prof_path} (snakeviz / pstats)")
+        LOGGER.info(f"[profile] Saved folded stacks to {folded_path} (flamegraph.pl / speedscope)")
+
+        return prof_path, folded_path
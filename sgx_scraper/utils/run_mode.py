@@ -0,0 +1,25 @@
+import logging
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Set by `--offline`: a replay reads recorded responses only, it must not
+# call models, push to the DB, send email or persist run state
+_OFFLINE = False
+
+
+def set_offline(enabled: bool) -> None:
+    global _OFFLINE
+    _OFFLINE = enabled
+
+
+def is_offline() -> bool:
+    return _OFFLINE
+
+
+def skip_offline(action: str) -> bool:
+    # True (and logged) when `action` is a side effect an offline replay skips
+    if _OFFLINE:
+        LOGGER.info(f"[offline] Skipping {action}")
+
+    return _OFFLINE
@@ -42,9 +42,68 @@ def extract_table_data(table_element: Tag) -> dict[str, str | list[str]]:
         return None
 
 
-def extract_section_data(soup: BeautifulSoup, section_title: str) -> dict[str, str | list[str]]:
+def make_soup(html: str) -> BeautifulSoup:
+    # lxml builds the tree several times faster than html.parser
+    return BeautifulSoup(html, 'lxml')
+
+
+def read_section_div(section_div: Tag) -> dict[str, str | list[str]]:
     section_data = {}
 
+    # Extract simple key-value pairs where the <dd> does not contain a table
+    dt_tags = section_div.find_all('dt')
+
+    for dt in dt_tags:
+        dd = dt.find_next_sibling('dd')
+
+        if dd and not dd.find('table'):
+            key = dt.get_text(strip=True)
+            value = dd.get_text(strip=True)
+
+            if key:
+                section_data[key] = value
+
+    # Find all tables within the section
+    all_tables = section_div.find_all('table')
+
+    for table in all_tables:
+        table_data = extract_table_data(table)
+        section_data.update(table_data)
+
+    for key in list(section_data.keys()):
+        if 'total consideration' in key.lower().strip():
+            section_data['Total Consideration'] = section_data.pop(key)
+
+    return section_data
+
+
+def parse_announcement_sections(soup: BeautifulSoup) -> dict[str, dict[str, str | list[str]]]:
+    """
+    Every 'announcement-group' section of a links.sgx.com detail page keyed
+    by its header title, read in one walk over the headers instead of one
+    full-document search per section title.
+    """
+    sections = {}
+
+    for h2 in soup.find_all('h2', class_='announcement-group-header'):
+        title = h2.string.strip() if h2.string else None
+
+        # First header wins, as with extract_section_data
+        if not title or title in sections:
+            continue
+
+        try:
+            section_div = h2.find_next_sibling('div', class_='announcement-group')
+            sections[title] = read_section_div(section_div) if section_div else {}
+
+        except Exception as error:
+            LOGGER.error(f'[parse_announcement_sections] Error extracting section {title}: {error}')
+            sections[title] = {}
+
+    return sections
+
+
+def extract_section_data(soup: BeautifulSoup, section_title: str) -> dict[str, str | list[str]]:
     try:
         h2 = soup.find(
             'h2',
@@ -53,38 +112,14 @@ def extract_section_data(soup: BeautifulSoup, section_title: str) -> dict[str, s
         )
 
         if not h2:
-            return section_data
+            return {}
 
         section_div = h2.find_next_sibling('div', class_='announcement-group')
 
         if not section_div:
-            return section_data
-
-        # Extract simple key-value pairs where the <dd> does not contain a table
-        dt_tags = section_div.find_all('dt')
-
-        for dt in dt_tags:
-            dd = dt.find_next_sibling('dd')
-
-            if dd and not dd.find('table'):
-                key = dt.get_text(strip=True)
-                value = dd.get_text(strip=True)
-
-                if key:
-                    section_data[key] = value
-
-        # Find all tables within the section
-        all_tables = section_div.find_all('table')
-
-        for table in all_tables:
-            table_data = extract_table_data(table)
-            section_data.update(table_data)
-
-        for key in list(section_data.keys()):
-            if 'total consideration' in key.lower().strip():
-                section_data['Total Consideration'] = section_data.pop(key)
+            return {}
 
-        return section_data
+        return read_section_div(section_div)
 
     except Exception as error:
         LOGGER.error(f'[extract_section_data] Error extracting section {section_title}: {error}')